@@ -29,14 +29,20 @@ class Settings(BaseSettings):
     s3_multipart_threshold: int = 100 * 1024 * 1024  # 100MB threshold
     s3_multipart_chunk_size: int = 10 * 1024 * 1024  # 10MB chunks
     s3_multipart_max_concurrency: int = 4  # Max parallel chunk uploads
+    s3_max_pool_connections: int = 64  # Shared by request handlers and transfer threads
 
     # Redis
     redis_url: str = "redis://localhost:6379"
+    redis_max_connections: int = 64  # Shared by API handlers and Celery threads
+
+    # Rendering
+    render_fused_pipeline: bool = False  # Zooms, crossfades, overlays and music in one ffmpeg pass
 
     # Shopify
     shopify_api_key: str = ""
     shopify_api_secret: str = ""
     shopify_api_version: str = "2024-01"
+    shopify_bulk_sync_threshold: int = 2500  # Active products above which syncs use a bulk operation
 
     # Encryption
     encryption_key: str = ""
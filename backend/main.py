@@ -5,6 +5,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from config import get_settings
 from routers import events, videos, shopify, reels
+from services.redis_client import close_redis_async
+from services.s3_client import get_s3_client
 
 
 @asynccontextmanager
@@ -13,9 +15,13 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     print(f"Starting Anchor Backend...")
     print(f"Base URL: {settings.base_url}")
+    # Build the shared S3 client (credential resolution, endpoint setup) now
+    # rather than inside the first request that needs it
+    get_s3_client()
     yield
     # Shutdown
     print("Shutting down...")
+    await close_redis_async()
 
 
 app = FastAPI(
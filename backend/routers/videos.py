@@ -7,9 +7,10 @@ from pydantic import BaseModel
 from config import get_settings
 from services.s3_client import (
     abort_multipart_upload,
-    complete_multipart_upload,
-    create_multipart_upload,
+    complete_multipart_upload_async,
+    create_multipart_upload_async,
     generate_presigned_chunk_url,
+    generate_presigned_chunk_urls_async,
     generate_presigned_upload_url,
     parse_s3_uri,
 )
@@ -62,6 +63,7 @@ class MultipartUploadInitResponse(BaseModel):
     total_chunks: int
     use_multipart: bool
     upload_url: str | None  # For simple uploads
+    chunk_urls: list[str] | None = None  # Pre-signed part URLs, index i = part i + 1
 
 
 class ChunkUrlRequest(BaseModel):
@@ -173,7 +175,7 @@ async def init_multipart_upload(
 
     if use_multipart:
         # Initiate multipart upload
-        upload_id = create_multipart_upload(
+        upload_id = await create_multipart_upload_async(
             bucket=settings.s3_bucket,
             key=s3_key,
             content_type=request.content_type,
@@ -191,6 +193,12 @@ async def init_multipart_upload(
             total_chunks=total_chunks,
             use_multipart=True,
             upload_url=None,
+            chunk_urls=await generate_presigned_chunk_urls_async(
+                bucket=settings.s3_bucket,
+                key=s3_key,
+                upload_id=upload_id,
+                part_count=total_chunks,
+            ),
         )
     else:
         # Use simple presigned URL upload
@@ -286,7 +294,7 @@ async def complete_multipart(
     _, s3_key = parse_s3_uri(original_url)
 
     # Complete multipart upload
-    complete_multipart_upload(
+    await complete_multipart_upload_async(
         bucket=settings.s3_bucket,
         key=s3_key,
         upload_id=request.upload_id,
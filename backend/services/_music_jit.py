@@ -0,0 +1,68 @@
+"""Single-pass energy scans for intro/outro detection.
+
+Compiled with numba when it is installed; otherwise the same loops run as
+plain Python, which is still O(n) thanks to the running-sum window.
+"""
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def scan_intro(rms, window, threshold, hop, sr):
+    """Return the time of the first window whose mean energy exceeds threshold.
+
+    Equivalent to scanning mean(rms[i:i + window]) for increasing i, but keeps
+    a running sum instead of re-averaging each window.
+
+    Returns:
+        Time in seconds, or 0.0 if no window crosses the threshold
+    """
+    n = rms.shape[0]
+    if window <= 0 or n <= window:
+        return 0.0
+
+    acc = 0.0
+    for i in range(window):
+        acc += rms[i]
+    inv = 1.0 / window
+
+    for i in range(n - window):
+        if i > 0:
+            acc += rms[i + window - 1] - rms[i - 1]
+        if acc * inv > threshold:
+            return i * hop / sr
+
+    return 0.0
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def scan_outro(rms, window, threshold, hop, sr, default):
+    """Return the time of the last window whose mean energy exceeds threshold.
+
+    Equivalent to scanning mean(rms[i - window:i]) for decreasing i.
+
+    Returns:
+        Time in seconds, or ``default`` if no window crosses the threshold
+    """
+    n = rms.shape[0]
+    if window <= 0 or n - 1 <= window:
+        return default
+
+    acc = 0.0
+    for i in range(n - 1 - window, n - 1):
+        acc += rms[i]
+    inv = 1.0 / window
+
+    for i in range(n - 1, window, -1):
+        if i < n - 1:
+            acc += rms[i - window] - rms[i]
+        if acc * inv > threshold:
+            return i * hop / sr
+
+    return default
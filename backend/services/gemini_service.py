@@ -4,6 +4,8 @@ import base64
 import os
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Literal
 
 from google import genai
@@ -12,6 +14,19 @@ from google.genai import types
 from config import get_settings
 
 
+# Background pool for deleting extracted frames off the request path
+_CLEANUP_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="veo-cleanup")
+
+
+def _cleanup_files(paths: list[str]) -> None:
+    """Delete temp files, ignoring ones that are already gone."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
 AngleType = Literal["wide", "closeup", "crowd", "goal_angle", "stage", "other"]
 
 VALID_ANGLES = ["wide", "closeup", "crowd", "goal_angle", "stage", "other"]
@@ -30,8 +45,13 @@ Analyze the visual composition and respond with ONLY ONE WORD from the options a
 Do not include any explanation or punctuation."""
 
 
+@lru_cache
 def get_gemini_client() -> genai.Client:
-    """Get Google GenAI client for Gemini using Vertex AI."""
+    """Get Google GenAI client for Gemini using Vertex AI (cached singleton).
+
+    The client is thread-safe and keeps its HTTP connection pool alive, so
+    sharing one instance avoids a TLS handshake on every Gemini/Veo call.
+    """
     settings = get_settings()
     # Use Vertex AI with OAuth2 credentials (not API key)
     # Requires GOOGLE_APPLICATION_CREDENTIALS env var to be set
@@ -188,28 +208,57 @@ def extract_frames_at_timestamp(
         step = spread_sec / (num_frames - 1)
         timestamps = [start + i * step for i in range(num_frames)]
 
-    for i, ts in enumerate(timestamps):
-        output_path = os.path.join(
-            tempfile.gettempdir(),
-            f"frame_{int(timestamp_sec)}_{i}.jpg"
-        )
-
-        cmd = [
-            "ffmpeg", "-y",
-            "-ss", str(ts),
-            "-i", video_path,
-            "-vframes", "1",
-            "-q:v", "2",  # High quality JPEG
-            output_path
-        ]
+    # Single decode pass: fast-seek to just before the first frame, then let
+    # the select filter pick the first decoded frame at or after each target
+    seek_start = max(0.0, timestamps[0] - 0.5)
+    select_expr = "+".join(
+        f"gte(t,{ts - seek_start:.3f})*(isnan(prev_t)+lt(prev_t,{ts - seek_start:.3f}))"
+        for ts in timestamps
+    )
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0 and os.path.exists(output_path):
-            frame_paths.append(output_path)
+    output_paths = [
+        os.path.join(tempfile.gettempdir(), f"frame_{int(timestamp_sec)}_{i}.jpg")
+        for i in range(num_frames)
+    ]
+    for path in output_paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+    cmd = [
+        "ffmpeg", "-y",
+        "-ss", str(seek_start),
+        "-i", video_path,
+        "-vf", f"select='{select_expr}'",
+        "-vsync", "vfr",
+        "-frames:v", str(num_frames),
+        "-q:v", "2",  # High quality JPEG
+        "-start_number", "0",
+        os.path.join(tempfile.gettempdir(), f"frame_{int(timestamp_sec)}_%d.jpg"),
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode == 0:
+        frame_paths = [path for path in output_paths if os.path.exists(path)]
 
     return frame_paths
 
 
+def load_frame_as_bytes(frame_path: str) -> bytes:
+    """Load a frame image as raw bytes.
+
+    The GenAI SDK accepts raw bytes in types.Blob and encodes them itself,
+    so this avoids a Python-side base64 pass and its 4/3 size inflation.
+
+    Args:
+        frame_path: Path to JPEG frame
+
+    Returns:
+        Raw image bytes
+    """
+    with open(frame_path, "rb") as f:
+        return f.read()
+
+
 def load_frame_as_base64(frame_path: str) -> str:
     """Load a frame image as base64 string.
 
@@ -309,12 +358,11 @@ def analyze_scene_for_veo_context(
     content_parts = [types.Part(text=SCENE_ANALYSIS_PROMPT)]
 
     for frame_path in frame_paths:
-        frame_b64 = load_frame_as_base64(frame_path)
         content_parts.append(
             types.Part(
                 inline_data=types.Blob(
                     mime_type="image/jpeg",
-                    data=frame_b64,
+                    data=load_frame_as_bytes(frame_path),
                 )
             )
         )
@@ -331,26 +379,16 @@ def analyze_scene_for_veo_context(
         import json
         result = json.loads(response.text)
         print(f"[Gemini] Scene analysis complete: {list(result.keys())}")
-
-        # Cleanup frames
-        for fp in frame_paths:
-            try:
-                os.remove(fp)
-            except OSError:
-                pass
-
         return result
 
     except Exception as e:
         print(f"[Gemini] Scene analysis failed: {e}")
-        # Cleanup frames
-        for fp in frame_paths:
-            try:
-                os.remove(fp)
-            except OSError:
-                pass
         return _default_scene_context()
 
+    finally:
+        # Cleanup frames in the background so the caller only waits on Gemini
+        _CLEANUP_POOL.submit(_cleanup_files, list(frame_paths))
+
 
 def _default_scene_context() -> dict:
     """Return default scene context when analysis fails."""
@@ -390,6 +428,16 @@ def _default_scene_context() -> dict:
     }
 
 
+# Product motion description by overlay style
+_STYLE_MOTIONS = {
+    "floating": "gentle floating motion, subtle bob up and down",
+    "showcase": "smooth slow rotation, elegant reveal",
+    "dynamic": "energetic entrance, quick attention-grabbing motion",
+    "minimal": "subtle fade in, nearly static with gentle pulse",
+    "pulse": "rhythmic pulsing glow, attention-grabbing beat",
+}
+
+
 def build_veo_prompt_from_scene_analysis(
     scene_analysis: dict,
     product: dict,
@@ -437,15 +485,7 @@ def build_veo_prompt_from_scene_analysis(
     motion = action.get("motion_speed", "moderate")
 
     # Style-specific motion
-    style_motions = {
-        "floating": "gentle floating motion, subtle bob up and down",
-        "showcase": "smooth slow rotation, elegant reveal",
-        "dynamic": "energetic entrance, quick attention-grabbing motion",
-        "minimal": "subtle fade in, nearly static with gentle pulse",
-        "pulse": "rhythmic pulsing glow, attention-grabbing beat",
-    }
-
-    product_motion = style_motions.get(style, style_motions["floating"])
+    product_motion = _STYLE_MOTIONS.get(style, _STYLE_MOTIONS["floating"])
 
     # Get environment details for context
     setting = env.get("setting", "sports venue")
@@ -482,7 +522,7 @@ Create a 4-second product showcase video with {product.get('title')} performing
 def get_reference_frame_for_veo(
     video_path: str,
     timestamp_sec: float,
-) -> tuple[str, str]:
+) -> tuple[str, bytes]:
     """Get a reference frame for Veo image-to-video generation.
 
     Extracts a single high-quality frame that can be passed to Veo
@@ -493,7 +533,8 @@ def get_reference_frame_for_veo(
         timestamp_sec: Timestamp to extract frame from
 
     Returns:
-        Tuple of (frame_path, base64_data)
+        Tuple of (frame_path, raw JPEG bytes) - pass the bytes straight to
+        types.Blob(mime_type="image/jpeg", data=...)
     """
     frame_paths = extract_frames_at_timestamp(
         video_path, timestamp_sec, num_frames=1
@@ -503,6 +544,6 @@ def get_reference_frame_for_veo(
         return None, None
 
     frame_path = frame_paths[0]
-    frame_b64 = load_frame_as_base64(frame_path)
+    frame_bytes = load_frame_as_bytes(frame_path)
 
-    return frame_path, frame_b64
+    return frame_path, frame_bytes
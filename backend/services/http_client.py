@@ -0,0 +1,19 @@
+"""Shared HTTP client for outbound API calls and downloads."""
+
+from functools import lru_cache
+
+import httpx
+
+
+@lru_cache
+def get_http_client() -> httpx.Client:
+    """Get pooled httpx client singleton.
+
+    Keeps connections to Shopify and image CDNs alive across calls so each
+    request skips the TCP/TLS handshake. httpx clients are thread-safe, so
+    the sync's worker threads and placement downloads share one pool.
+    """
+    return httpx.Client(
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
@@ -4,6 +4,7 @@ import numpy as np
 import librosa
 
 from config import VideoConfig
+from services._music_jit import scan_intro, scan_outro
 
 
 def analyze_music_track(audio_path: str) -> dict:
@@ -30,12 +31,14 @@ def analyze_music_track(audio_path: str) -> dict:
     intro_end_ms = find_intro_end(rms, sr) * 1000
     outro_start_ms = find_outro_start(rms, sr, len(y)) * 1000
 
-    # Normalize and sample intensity curve
-    intensity_curve = rms / (rms.max() + 1e-8)
-    # Downsample to ~1 value per second
+    # Downsample to ~1 value per second (mean of each 1s bucket), then normalize
     samples_per_sec = sr / 512  # hop_length for rms
     step = max(1, int(samples_per_sec))
-    intensity_curve = intensity_curve[::step].tolist()
+    edges = np.arange(0, rms.size, step)
+    counts = np.diff(np.append(edges, rms.size))
+    per_sec = np.add.reduceat(rms.astype(np.float32, copy=False), edges) / counts
+    # Stored as JSON in Supabase, so convert once at the end
+    intensity_curve = (per_sec / (per_sec.max() + 1e-8)).tolist()
 
     return {
         "tempo_bpm": float(tempo) if isinstance(tempo, np.ndarray) else float(tempo[0]) if hasattr(tempo, '__iter__') else float(tempo),
@@ -47,6 +50,26 @@ def analyze_music_track(audio_path: str) -> dict:
     }
 
 
+def _energy_threshold(rms: np.ndarray, threshold_percentile: int) -> float:
+    """Linear-interpolated percentile of rms via O(n) selection.
+
+    Matches np.percentile's default method but uses np.partition on the two
+    neighbouring order statistics instead of a full sort.
+
+    Args:
+        rms: RMS energy array
+        threshold_percentile: Percentile to select (0-100)
+
+    Returns:
+        Percentile value
+    """
+    pos = threshold_percentile / 100 * (rms.size - 1)
+    lo = int(pos)
+    hi = min(lo + 1, rms.size - 1)
+    part = np.partition(rms, (lo, hi))
+    return float(part[lo] + (part[hi] - part[lo]) * (pos - lo))
+
+
 def find_intro_end(rms: np.ndarray, sr: int, threshold_percentile: int = 30) -> float:
     """Find the end of the intro (where energy consistently rises).
 
@@ -58,15 +81,11 @@ def find_intro_end(rms: np.ndarray, sr: int, threshold_percentile: int = 30) ->
     Returns:
         Time in seconds where intro ends
     """
-    threshold = np.percentile(rms, threshold_percentile)
+    threshold = _energy_threshold(rms, threshold_percentile)
 
     # Find first point where energy consistently exceeds threshold
     window_size = int(sr / 512 * 2)  # 2 second window
-    for i in range(len(rms) - window_size):
-        if np.mean(rms[i:i + window_size]) > threshold:
-            return i * 512 / sr
-
-    return 0.0
+    return float(scan_intro(rms.astype(np.float32, copy=False), window_size, threshold, 512, sr))
 
 
 def find_outro_start(rms: np.ndarray, sr: int, total_samples: int, threshold_percentile: int = 30) -> float:
@@ -81,16 +100,12 @@ def find_outro_start(rms: np.ndarray, sr: int, total_samples: int, threshold_per
     Returns:
         Time in seconds where outro starts
     """
-    threshold = np.percentile(rms, threshold_percentile)
+    threshold = _energy_threshold(rms, threshold_percentile)
     total_duration = total_samples / sr
 
     # Find last point where energy consistently exceeds threshold (working backwards)
     window_size = int(sr / 512 * 2)  # 2 second window
-    for i in range(len(rms) - 1, window_size, -1):
-        if np.mean(rms[i - window_size:i]) > threshold:
-            return i * 512 / sr
-
-    return total_duration
+    return float(scan_outro(rms.astype(np.float32, copy=False), window_size, threshold, 512, sr, total_duration))
 
 
 def align_cuts_to_beats(
@@ -140,6 +155,24 @@ def align_cuts_to_beats(
     return synced_segments
 
 
+def _merge_intervals(intervals: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """Sort intervals and coalesce any that overlap or touch.
+
+    Args:
+        intervals: List of (start_sec, end_sec) tuples
+
+    Returns:
+        Sorted, non-overlapping list of (start_sec, end_sec) tuples
+    """
+    merged: list[list[float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
 def create_ducking_filter(
     music_metadata: dict,
     speech_segments: list[dict],
@@ -159,31 +192,32 @@ def create_ducking_filter(
     Returns:
         FFmpeg volume filter string
     """
-    filters = []
-
-    # Duck to 20% during speech
-    for seg in speech_segments:
-        filters.append(
-            f"volume={VideoConfig.MUSIC_DUCK_SPEECH_VOLUME}:"
-            f"enable='between(t,{seg['start_sec']},{seg['end_sec']})'"
+    speech = [(seg["start_sec"], seg["end_sec"]) for seg in speech_segments]
+    action = [
+        (moment["start_sec"], moment["end_sec"])
+        for moment in action_intensity_timeline
+        if moment.get("intensity", 0) >= 8
+    ]
+    ads = [
+        (
+            ad["timestamp_ms"] / 1000 - 0.5,
+            (ad["timestamp_ms"] + ad.get("duration_ms", 4000)) / 1000 + 0.5,
         )
+        for ad in (ad_slots or [])
+    ]
 
-    # Boost during high action
-    for moment in action_intensity_timeline:
-        if moment.get("intensity", 0) >= 8:
-            filters.append(
-                f"volume={VideoConfig.MUSIC_BOOST_ACTION_VOLUME}:"
-                f"enable='between(t,{moment['start_sec']},{moment['end_sec']})'"
-            )
-
-    # Mute during ads
-    if ad_slots:
-        for ad in ad_slots:
-            start_sec = ad["timestamp_ms"] / 1000 - 0.5
-            end_sec = (ad["timestamp_ms"] + ad.get("duration_ms", 4000)) / 1000 + 0.5
-            filters.append(
-                f"volume=0:enable='between(t,{start_sec},{end_sec})'"
-            )
+    # One volume node per level: duck to 20% during speech, boost during
+    # high action, mute during ads
+    filters = []
+    for volume, intervals in (
+        (VideoConfig.MUSIC_DUCK_SPEECH_VOLUME, speech),
+        (VideoConfig.MUSIC_BOOST_ACTION_VOLUME, action),
+        (0, ads),
+    ):
+        merged = _merge_intervals(intervals)
+        if merged:
+            enable = "+".join(f"between(t,{start},{end})" for start, end in merged)
+            filters.append(f"volume={volume}:enable='{enable}'")
 
     return ",".join(filters) if filters else "anull"
 
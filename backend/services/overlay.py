@@ -1,11 +1,18 @@
 """Sponsor overlay service for power plays and branding."""
 
+import hashlib
 import os
+import subprocess
 import tempfile
+import threading
+import time
+from functools import lru_cache
 
 import ffmpeg
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 
 from config import VideoConfig
+from services.render import _get_encoding_params
 
 
 # Sponsor power play templates
@@ -18,6 +25,151 @@ SPONSOR_TEMPLATES = {
     "outro": "Brought to you by {sponsor}",
 }
 
+# Overlay anchor coordinates (x, y expressions) by position name
+_POSITIONS = {
+    "bottom_left": ("20", "H-100"),
+    "bottom_right": ("W-520", "H-100"),
+    "top_left": ("20", "20"),
+    "top_right": ("W-520", "20"),
+}
+
+
+def _get_video_encoding_params() -> dict:
+    """Get final-output encoder parameters from render's backend probe.
+
+    Overlays only touch a few seconds of frames, so the full-video encode
+    dominates. Reusing render's verified (test-encoded, persisted) backend
+    keeps both modules on the same encoder; audio is left to each call.
+
+    Returns:
+        Dict of ffmpeg output parameters for the video stream
+    """
+    params = _get_encoding_params()
+    params.pop("acodec", None)
+    return params
+
+
+def _parse_color(color: str) -> tuple[int, int, int, int]:
+    """Convert an FFmpeg color string (e.g. "black@0.6") to an RGBA tuple."""
+    name, _, alpha = color.partition("@")
+    r, g, b = ImageColor.getrgb(name)[:3]
+    a = int(float(alpha) * 255) if alpha else 255
+    return (r, g, b, a)
+
+
+# Pre-rendered text PNGs live here; files unused for this long are deleted
+# whenever a new one is rendered
+_TEXT_PNG_DIR = os.path.join(tempfile.gettempdir(), "anchor_overlay_text")
+TEXT_PNG_TTL_SEC = 24 * 3600
+
+
+def _prune_text_pngs() -> None:
+    """Delete text PNGs unused for TEXT_PNG_TTL_SEC.
+
+    Sponsor texts differ per event, so without this the directory grows for
+    as long as a worker runs.
+    """
+    cutoff = time.time() - TEXT_PNG_TTL_SEC
+    try:
+        entries = os.scandir(_TEXT_PNG_DIR)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass  # Already removed by another worker
+
+
+@lru_cache(maxsize=1)
+def _drawtext_font_path() -> str | None:
+    """Font file drawtext falls back to without fontfile (fontconfig's "Sans")."""
+    try:
+        result = subprocess.run(
+            ["fc-match", "-f", "%{file}", "Sans"],
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    path = result.stdout.strip()
+    return path if result.returncode == 0 and os.path.isfile(path) else None
+
+
+@lru_cache(maxsize=8)
+def _overlay_font(fontsize: int) -> ImageFont.ImageFont | ImageFont.FreeTypeFont:
+    """Load the font the drawtext overlays used, at the given size."""
+    path = _drawtext_font_path()
+    if path:
+        return ImageFont.truetype(path, fontsize)
+    print("[Overlay] fontconfig Sans not found, using Pillow's default font")
+    return ImageFont.load_default(size=fontsize)
+
+
+def _render_text_png(
+    text: str,
+    fontsize: int = 36,
+    fg: str = "white",
+    bg: str = "black@0.6",
+) -> str:
+    """Rasterize overlay text to a transparent PNG once.
+
+    drawtext re-shapes glyphs on every frame; compositing a pre-rendered
+    bitmap with the overlay filter only costs a blit per frame. The PNG bakes
+    in the same look as the drawtext overlays (drawtext's default font, 2px
+    black border, boxed background with 10px padding). Files are named by
+    content and reused while they exist, so a cleaned temp directory just
+    means the next call renders the PNG again; unused ones are pruned by age.
+
+    Args:
+        text: Text to render
+        fontsize: Font size in pixels
+        fg: Text color (FFmpeg color syntax)
+        bg: Box background color (FFmpeg color syntax)
+
+    Returns:
+        Path to the rendered RGBA PNG
+    """
+    key = hashlib.sha1(
+        f"{text}|{fontsize}|{fg}|{bg}|{_drawtext_font_path()}".encode()
+    ).hexdigest()[:16]
+    output_path = os.path.join(_TEXT_PNG_DIR, f"overlay_text_{key}.png")
+    try:
+        # Reuse marks the PNG as recently used so pruning leaves it alone
+        os.utime(output_path)
+        return output_path
+    except FileNotFoundError:
+        pass
+
+    font = _overlay_font(fontsize)
+    border = 2
+    padding = 10
+
+    left, top, right, bottom = ImageDraw.Draw(Image.new("RGBA", (1, 1))).textbbox(
+        (0, 0), text, font=font, stroke_width=border
+    )
+    width = right - left + 2 * padding
+    height = bottom - top + 2 * padding
+
+    image = Image.new("RGBA", (width, height), _parse_color(bg))
+    ImageDraw.Draw(image).text(
+        (padding - left, padding - top),
+        text,
+        font=font,
+        fill=_parse_color(fg),
+        stroke_width=border,
+        stroke_fill=(0, 0, 0, 255),
+    )
+
+    # Write then rename so concurrent renders never read a partial PNG
+    os.makedirs(_TEXT_PNG_DIR, exist_ok=True)
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    image.save(tmp_path, format="PNG")
+    os.replace(tmp_path, output_path)
+    _prune_text_pngs()
+    return output_path
+
 
 def create_lower_third_overlay(
     text: str,
@@ -81,38 +233,23 @@ def apply_sponsor_overlay(
     template = SPONSOR_TEMPLATES.get(overlay_type, "{sponsor}")
     text = template.format(sponsor=sponsor_name)
 
-    # Position coordinates
-    positions = {
-        "bottom_left": ("20", "H-100"),
-        "bottom_right": ("W-520", "H-100"),
-        "top_left": ("20", "20"),
-        "top_right": ("W-520", "20"),
-    }
-    x, y = positions.get(position, positions["bottom_left"])
+    x, y = _POSITIONS.get(position, _POSITIONS["bottom_left"])
 
-    # Apply overlay with enable filter for timing
+    # Composite the pre-rendered text bitmap with enable filter for timing
     video = ffmpeg.input(video_path)
+    text_image = ffmpeg.input(_render_text_png(text))
 
-    video_with_overlay = (
-        video.video
-        .filter("drawtext",
-                text=text,
-                fontsize=36,
-                fontcolor="white",
-                borderw=2,
-                bordercolor="black",
-                box=1,
-                boxcolor="black@0.6",
-                boxborderw=10,
-                x=x,
-                y=y,
-                enable=f"between(t,{start_time},{start_time + duration})")
+    video_with_overlay = video.video.overlay(
+        text_image,
+        x=x,
+        y=y,
+        enable=f"between(t,{start_time},{start_time + duration})",
     )
 
     (
         ffmpeg
         .output(video_with_overlay, video.audio, output_path,
-                vcodec="libx264", acodec="copy", crf=18)
+                acodec="copy", **_get_video_encoding_params())
         .overwrite_output()
         .run(quiet=True)
     )
@@ -144,32 +281,23 @@ def apply_multiple_overlays(
     video = ffmpeg.input(video_path)
     video_stream = video.video
 
-    for overlay in overlays:
-        template = SPONSOR_TEMPLATES.get(overlay.get("type", "highlight"), "{sponsor}")
-        text = template.format(sponsor=overlay["sponsor_name"])
-
-        positions = {
-            "bottom_left": ("20", "H-100"),
-            "bottom_right": ("W-520", "H-100"),
-            "top_left": ("20", "20"),
-            "top_right": ("W-520", "20"),
-        }
-        position = overlay.get("position", "bottom_left")
-        x, y = positions.get(position, positions["bottom_left"])
-
-        start = overlay.get("start_time", 0)
-        duration = overlay.get("duration", 4.0)
-
-        video_stream = video_stream.filter(
-            "drawtext",
-            text=text,
-            fontsize=36,
-            fontcolor="white",
-            borderw=2,
-            bordercolor="black",
-            box=1,
-            boxcolor="black@0.6",
-            boxborderw=10,
+    # Resolve text and placement for every overlay before building the graph
+    specs = [
+        (
+            SPONSOR_TEMPLATES.get(overlay.get("type", "highlight"), "{sponsor}").format(
+                sponsor=overlay["sponsor_name"]
+            ),
+            *_POSITIONS.get(overlay.get("position", "bottom_left"), _POSITIONS["bottom_left"]),
+            overlay.get("start_time", 0),
+            overlay.get("duration", 4.0),
+        )
+        for overlay in overlays
+    ]
+
+    for text, x, y, start, duration in specs:
+        # Identical texts share one cached PNG input
+        video_stream = video_stream.overlay(
+            ffmpeg.input(_render_text_png(text)),
             x=x,
             y=y,
             enable=f"between(t,{start},{start + duration})",
@@ -178,27 +306,68 @@ def apply_multiple_overlays(
     (
         ffmpeg
         .output(video_stream, video.audio, output_path,
-                vcodec="libx264", acodec="copy", crf=18)
+                acodec="copy", **_get_video_encoding_params())
         .overwrite_output()
         .run(quiet=True)
     )
 
 
-def generate_intro_card(
+def generate_cards_batch(cards: list[dict], output_paths: list[str]) -> None:
+    """Render several title cards in a single ffmpeg process.
+
+    Each card gets its own lavfi color source and drawtext chain inside one
+    filter graph, and every chain is mapped to its own output file, so the
+    process and encoder startup cost is paid once for the whole batch.
+
+    Args:
+        cards: List of card dicts with bg_color, duration and texts, where
+            texts is a list of dicts with text, fontsize, fontcolor and y
+        output_paths: Output video path for each card (same order as cards)
+    """
+    if len(cards) != len(output_paths):
+        raise ValueError("cards and output_paths must have the same length")
+    if not cards:
+        return
+
+    encoding_params = _get_video_encoding_params()
+    outputs = []
+    for card, output_path in zip(cards, output_paths):
+        duration = card["duration"]
+        stream = ffmpeg.input(
+            f"color=c={card['bg_color']}:s=1920x1080:d={duration}", f="lavfi"
+        )
+        for line in card["texts"]:
+            if not line["text"]:
+                continue
+            stream = stream.filter("drawtext",
+                                   text=line["text"],
+                                   fontsize=line["fontsize"],
+                                   fontcolor=line["fontcolor"],
+                                   x="(w-text_w)/2",
+                                   y=line["y"])
+        outputs.append(
+            stream.output(output_path, t=duration, **encoding_params)
+        )
+
+    ffmpeg.merge_outputs(*outputs).overwrite_output().run(quiet=True)
+
+
+def intro_card_spec(
     title: str,
     sponsor_name: str,
-    output_path: str,
     duration: float = 3.0,
     event_type: str = "sports",
-) -> None:
-    """Generate an intro card with event title and sponsor.
+) -> dict:
+    """Build the card dict for an intro card (see generate_cards_batch).
 
     Args:
         title: Event title
         sponsor_name: Sponsor name
-        output_path: Output video path
         duration: Duration in seconds
         event_type: Event type for styling
+
+    Returns:
+        Card dict for generate_cards_batch
     """
     # Color schemes by event type
     colors = {
@@ -206,28 +375,57 @@ def generate_intro_card(
         "ceremony": "#311b92",  # Deep purple
         "performance": "#b71c1c",  # Dark red
     }
-    bg_color = colors.get(event_type, colors["sports"])
-
     sponsor_text = f"Presented by {sponsor_name}" if sponsor_name else ""
 
-    (
-        ffmpeg
-        .input(f"color=c={bg_color}:s=1920x1080:d={duration}", f="lavfi")
-        .filter("drawtext",
-                text=title,
-                fontsize=72,
-                fontcolor="white",
-                x="(w-text_w)/2",
-                y="(h-text_h)/2-50")
-        .filter("drawtext",
-                text=sponsor_text,
-                fontsize=36,
-                fontcolor="white@0.8",
-                x="(w-text_w)/2",
-                y="(h-text_h)/2+50")
-        .output(output_path, vcodec="libx264", pix_fmt="yuv420p", t=duration)
-        .overwrite_output()
-        .run(quiet=True)
+    return {
+        "bg_color": colors.get(event_type, colors["sports"]),
+        "duration": duration,
+        "texts": [
+            {"text": title, "fontsize": 72, "fontcolor": "white", "y": "(h-text_h)/2-50"},
+            {"text": sponsor_text, "fontsize": 36, "fontcolor": "white@0.8", "y": "(h-text_h)/2+50"},
+        ],
+    }
+
+
+def outro_card_spec(sponsor_name: str, duration: float = 3.0) -> dict:
+    """Build the card dict for an outro card (see generate_cards_batch).
+
+    Args:
+        sponsor_name: Sponsor name
+        duration: Duration in seconds
+
+    Returns:
+        Card dict for generate_cards_batch
+    """
+    text = f"Brought to you by {sponsor_name}" if sponsor_name else "Thanks for watching"
+
+    return {
+        "bg_color": "black",
+        "duration": duration,
+        "texts": [
+            {"text": text, "fontsize": 48, "fontcolor": "white", "y": "(h-text_h)/2"},
+        ],
+    }
+
+
+def generate_intro_card(
+    title: str,
+    sponsor_name: str,
+    output_path: str,
+    duration: float = 3.0,
+    event_type: str = "sports",
+) -> None:
+    """Generate an intro card with event title and sponsor.
+
+    Args:
+        title: Event title
+        sponsor_name: Sponsor name
+        output_path: Output video path
+        duration: Duration in seconds
+        event_type: Event type for styling
+    """
+    generate_cards_batch(
+        [intro_card_spec(title, sponsor_name, duration, event_type)], [output_path]
     )
 
 
@@ -243,18 +441,4 @@ def generate_outro_card(
         output_path: Output video path
         duration: Duration in seconds
     """
-    text = f"Brought to you by {sponsor_name}" if sponsor_name else "Thanks for watching"
-
-    (
-        ffmpeg
-        .input("color=c=black:s=1920x1080:d=" + str(duration), f="lavfi")
-        .filter("drawtext",
-                text=text,
-                fontsize=48,
-                fontcolor="white",
-                x="(w-text_w)/2",
-                y="(h-text_h)/2")
-        .output(output_path, vcodec="libx264", pix_fmt="yuv420p", t=duration)
-        .overwrite_output()
-        .run(quiet=True)
-    )
+    generate_cards_batch([outro_card_spec(sponsor_name, duration)], [output_path])
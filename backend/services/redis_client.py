@@ -1,12 +1,31 @@
 """Redis client for caching and temporary data storage."""
 
+import asyncio
+import weakref
 from functools import lru_cache
 
 import redis
+import redis.asyncio as aioredis
 
 from config import get_settings
 
 
+def _pool_kwargs() -> dict:
+    """Connection pool options shared by the sync and async clients.
+
+    Keepalive and periodic health checks avoid paying a reconnect on the
+    first command after an idle period; max_connections bounds concurrency.
+    """
+    settings = get_settings()
+    return {
+        "max_connections": settings.redis_max_connections or 64,
+        "socket_keepalive": True,
+        "health_check_interval": 30,
+        "retry_on_timeout": True,
+        "decode_responses": False,
+    }
+
+
 @lru_cache
 def get_redis() -> redis.Redis:
     """Get Redis client singleton.
@@ -17,15 +36,52 @@ def get_redis() -> redis.Redis:
     - Caching TwelveLabs results
     """
     settings = get_settings()
-    return redis.from_url(settings.redis_url, decode_responses=False)
+    pool = redis.ConnectionPool.from_url(settings.redis_url, **_pool_kwargs())
+    return redis.Redis(connection_pool=pool)
+
+
+# One async client per event loop (asyncio pools are loop-bound), keyed on
+# the loop object itself: id(loop) is reused once a loop is collected
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _new_async_client() -> aioredis.Redis:
+    settings = get_settings()
+    pool = aioredis.ConnectionPool.from_url(settings.redis_url, **_pool_kwargs())
+    return aioredis.Redis(connection_pool=pool)
+
 
+@lru_cache
+def _get_redis_async_unbound() -> aioredis.Redis:
+    """Async client for callers outside a running loop."""
+    return _new_async_client()
 
-def get_redis_async():
+
+def get_redis_async() -> aioredis.Redis:
     """Get async Redis client for use in async contexts.
 
+    Returns one pooled client per running event loop, so repeated calls
+    reuse connections instead of building a new pool each time. Call
+    close_redis_async() before the loop shuts down to release it.
+
     Note: For most use cases, the sync client works fine with FastAPI.
     Only use this if you need true async Redis operations.
     """
-    import redis.asyncio as aioredis
-    settings = get_settings()
-    return aioredis.from_url(settings.redis_url, decode_responses=False)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _get_redis_async_unbound()
+
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = _new_async_client()
+    return client
+
+
+async def close_redis_async() -> None:
+    """Close the running loop's async client, if one was created."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -1,91 +1,494 @@
 """FFmpeg rendering service for video composition and output."""
 
+import bisect
+import hashlib
+import json
 import os
 import platform
+import re
+import shutil
 import subprocess
 import tempfile
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from typing import Literal
 
 import ffmpeg
+import numpy as np
 
-from config import VideoConfig, MUSIC_MIX_PROFILES, CROSSFADE_DURATION_BY_EVENT, DEFAULT_CROSSFADE_DURATION
+try:
+    import av  # PyAV: in-process libav probing, no ffprobe subprocess
+except ImportError:
+    av = None
 
-# Number of parallel segment extractions (balance between speed and system load)
-MAX_PARALLEL_EXTRACTIONS = 4
+from config import get_settings, VideoConfig, MUSIC_MIX_PROFILES, CROSSFADE_DURATION_BY_EVENT, DEFAULT_CROSSFADE_DURATION
+
+# Parallel segment extraction sizing
+# Stream copies are I/O-bound, so allow 2x CPU of them in flight; re-encodes
+# are CPU-bound, so cap them at the CPU count and split encoder threads
+# between them instead of letting every ffmpeg spawn one thread per core
+CPU_COUNT = os.cpu_count() or 4
+MAX_PARALLEL_COPIES = 2 * CPU_COUNT
+MAX_PARALLEL_REENCODES = CPU_COUNT
+# Consumer NVIDIA GPUs allow only a few concurrent NVENC sessions; more fail
+# to open instead of queueing
+NVENC_MAX_SESSIONS = 3
+
+
+class _ReencodeSlots:
+    """Process-wide bound on concurrent ffmpeg re-encodes.
+
+    Always bounded by MAX_PARALLEL_REENCODES; on the NVENC backend each
+    re-encode also holds one of NVENC_MAX_SESSIONS encoder sessions.
+    """
+
+    def __init__(self) -> None:
+        self._cpu = threading.BoundedSemaphore(MAX_PARALLEL_REENCODES)
+        self._nvenc = threading.BoundedSemaphore(NVENC_MAX_SESSIONS)
+
+    def acquire(self) -> None:
+        self._cpu.acquire()
+        if _get_hw_backend() == "nvenc":
+            self._nvenc.acquire()
+
+    def release(self) -> None:
+        if _get_hw_backend() == "nvenc":
+            self._nvenc.release()
+        self._cpu.release()
+
+    def __enter__(self) -> "_ReencodeSlots":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+# Shared by segment extraction, normalization and ad preparation
+_REENCODE_SLOTS = _ReencodeSlots()
+
+
+def _max_parallel_reencodes() -> int:
+    """Useful re-encode concurrency for the active encoder backend."""
+    if _get_hw_backend() == "nvenc":
+        return min(MAX_PARALLEL_REENCODES, NVENC_MAX_SESSIONS)
+    return MAX_PARALLEL_REENCODES
 
 
 # Hardware acceleration settings
-# On macOS, use VideoToolbox for ~5-10x faster encoding
-# Falls back to libx264 if hardware encoder fails
-_HWACCEL_AVAILABLE: bool | None = None
+# On macOS, use VideoToolbox for ~5-10x faster encoding; on NVIDIA GPU hosts,
+# use NVENC, and on Intel GPU hosts Quick Sync. Falls back to libx264 if no
+# hardware encoder works
+_HW_ENCODERS: frozenset[str] | None = None
+# Hardware decode methods from `ffmpeg -hwaccels`, filled by the same probe
+_HWACCELS: frozenset[str] = frozenset()
 
+# Encoders detected by the capability probe (matched on raw `-encoders` bytes)
+_HW_ENCODER_RE = re.compile(rb"\b(h264_videotoolbox|hevc_videotoolbox|h264_nvenc|hevc_nvenc|h264_qsv|hevc_qsv)\b")
 
-def _check_hwaccel_available() -> bool:
-    """Check if hardware acceleration is available."""
-    global _HWACCEL_AVAILABLE
-    if _HWACCEL_AVAILABLE is not None:
-        return _HWACCEL_AVAILABLE
+# First meaningful error line in ffmpeg stderr
+_FFMPEG_ERR_RE = re.compile(rb"^[^\n]*(?:[Ee]rror|Invalid|No such file)[^\n]*", re.MULTILINE)
 
-    if platform.system() != "Darwin":
-        _HWACCEL_AVAILABLE = False
-        return False
+# Probe results persisted across worker processes, keyed by machine + ffmpeg build
+_HWACCEL_CACHE_PATH = os.path.join(tempfile.gettempdir(), "anchor_hwaccel.json")
+
+
+def _hwaccel_cache_key() -> str | None:
+    """Cache key for the encoder probe: platform plus ffmpeg binary identity."""
+    ffmpeg_bin = shutil.which("ffmpeg")
+    if not ffmpeg_bin:
+        return None
+    st = os.stat(ffmpeg_bin)
+    # Bump the version prefix whenever the set of probed encoders changes
+    return f"v4|{platform.platform()}|{ffmpeg_bin}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _get_hw_encoders() -> frozenset[str]:
+    """Get the hardware encoders ffmpeg supports on this machine.
+
+    The `ffmpeg -encoders` / `-hwaccels` subprocesses only run once per
+    machine and ffmpeg build; the result is persisted to a JSON file in the
+    temp dir so fresh worker processes skip it. Also fills _HWACCELS.
+    """
+    global _HW_ENCODERS, _HWACCELS
+    if _HW_ENCODERS is not None:
+        return _HW_ENCODERS
+
+    key = _hwaccel_cache_key()
+    if key is None:
+        _HW_ENCODERS = frozenset()
+        return _HW_ENCODERS
+
+    try:
+        with open(_HWACCEL_CACHE_PATH) as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            _HWACCELS = frozenset(cached["hwaccels"])
+            _HW_ENCODERS = frozenset(cached["encoders"])
+            return _HW_ENCODERS
+    except (OSError, ValueError, KeyError):
+        pass
 
-    # Check if h264_videotoolbox encoder is available
     try:
         result = subprocess.run(
             ["ffmpeg", "-hide_banner", "-encoders"],
             capture_output=True,
-            text=True,
             timeout=5,
         )
-        _HWACCEL_AVAILABLE = "h264_videotoolbox" in result.stdout
-        if _HWACCEL_AVAILABLE:
-            print("[Render] Hardware acceleration available: h264_videotoolbox")
-        return _HWACCEL_AVAILABLE
+        encoders = {m.decode() for m in _HW_ENCODER_RE.findall(result.stdout)}
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            capture_output=True,
+            timeout=5,
+        )
+        # One method per line after the "Hardware acceleration methods:" header
+        _HWACCELS = frozenset(
+            line.strip() for line in result.stdout.decode(errors="replace").splitlines()[1:] if line.strip()
+        )
+    except Exception:
+        _HW_ENCODERS = frozenset()
+        return _HW_ENCODERS
+
+    # NVENC and QSV are compiled into many ffmpeg builds that have no usable
+    # GPU, so only keep them if a tiny test encode actually succeeds
+    for encoder in sorted(e for e in encoders if e.endswith(("_nvenc", "_qsv"))):
+        if not _encoder_works(encoder):
+            encoders.discard(encoder)
+    _HW_ENCODERS = frozenset(encoders)
+
+    # Write atomically so concurrent workers never read a partial file
+    try:
+        tmp_path = f"{_HWACCEL_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"key": key, "encoders": sorted(_HW_ENCODERS), "hwaccels": sorted(_HWACCELS)}, f)
+        os.replace(tmp_path, _HWACCEL_CACHE_PATH)
+    except OSError:
+        pass
+
+    return _HW_ENCODERS
+
+
+def _encoder_works(encoder: str) -> bool:
+    """Run a tiny test encode to confirm a hardware encoder can open a session."""
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg", "-hide_banner", "-f", "lavfi", "-i", "nullsrc=s=256x256:d=0.1",
+                "-c:v", encoder, "-f", "null", "-",
+            ],
+            capture_output=True,
+            timeout=10,
+        )
+        return result.returncode == 0
     except Exception:
-        _HWACCEL_AVAILABLE = False
         return False
 
 
+@lru_cache(maxsize=1)
+def _get_hw_backend() -> Literal["videotoolbox", "nvenc", "qsv"] | None:
+    """Get the hardware encoding backend to use, if any."""
+    encoders = _get_hw_encoders()
+    if platform.system() == "Darwin" and "h264_videotoolbox" in encoders:
+        backend = "videotoolbox"
+    elif "h264_nvenc" in encoders:
+        backend = "nvenc"
+    elif "h264_qsv" in encoders:
+        backend = "qsv"
+    else:
+        return None
+    print(f"[Render] Hardware acceleration available: h264_{backend}")
+    return backend
+
+
+def _check_hwaccel_available() -> bool:
+    """Check if hardware acceleration is available."""
+    return _get_hw_backend() is not None
+
+
+def _check_hevc_hwaccel_available() -> bool:
+    """Check if a hardware HEVC encoder for the active backend is available."""
+    backend = _get_hw_backend()
+    return backend is not None and f"hevc_{backend}" in _get_hw_encoders()
+
+
 def _get_video_codec() -> str:
     """Get the best available video codec."""
-    if _check_hwaccel_available():
-        return "h264_videotoolbox"
+    backend = _get_hw_backend()
+    if backend:
+        return f"h264_{backend}"
     return "libx264"
 
 
-def _get_encoding_params(use_hw: bool = True) -> dict:
+# Encoder settings per backend; _get_encoding_params hands out copies
+# NVENC constant-quality VBR (-b:v 0 lets cq alone drive quality)
+_NVENC_PARAMS = {
+    "vcodec": "h264_nvenc",
+    "preset": "p4",
+    "tune": "hq",
+    "rc": "vbr",
+    "cq": 23,
+    "video_bitrate": "0",
+    "acodec": "aac",
+    "pix_fmt": "yuv420p",
+    "movflags": "+faststart",
+}
+# VideoToolbox parameters - uses bitrate instead of CRF
+# realtime favours throughput; allow_sw keeps encoding working if the
+# hardware session can't be created
+_VIDEOTOOLBOX_PARAMS = {
+    "vcodec": "h264_videotoolbox",
+    "video_bitrate": "8M",  # 8 Mbps for high quality
+    "realtime": 1,
+    "allow_sw": 1,
+    "acodec": "aac",
+    "pix_fmt": "yuv420p",
+    "movflags": "+faststart",
+}
+# Software encoding with libx264
+_X264_PARAMS = {
+    "vcodec": "libx264",
+    "crf": 18,
+    "acodec": "aac",
+    "pix_fmt": "yuv420p",
+    "movflags": "+faststart",
+}
+# Quick Sync ICQ mode (global_quality is the quality target)
+_QSV_PARAMS = {
+    "vcodec": "h264_qsv",
+    "preset": "medium",
+    "global_quality": 23,
+    "acodec": "aac",
+    "pix_fmt": "nv12",
+    "movflags": "+faststart",
+}
+_ENCODING_PARAMS_BY_BACKEND = {
+    "nvenc": _NVENC_PARAMS,
+    "qsv": _QSV_PARAMS,
+    "videotoolbox": _VIDEOTOOLBOX_PARAMS,
+    None: _X264_PARAMS,
+}
+# Faster settings for files that are re-encoded again later in the
+# pipeline. crf 20 (not 23) keeps generation loss from the second encode
+# out of the final output; the preset is where the time goes.
+_INTERMEDIATE_OVERRIDES_BY_BACKEND = {
+    "nvenc": {"preset": "p1", "cq": 26},
+    "qsv": {"preset": "veryfast"},
+    "videotoolbox": {},
+    None: {"preset": "veryfast", "crf": 20},
+}
+
+
+def _get_encoding_params(use_hw: bool = True, intermediate: bool = False) -> dict:
     """Get encoding parameters based on available hardware.
 
+    The backend probe is cached, so this is a dict lookup plus a shallow
+    copy (callers add per-call keys such as threads or ar).
+
     Args:
         use_hw: Whether to attempt hardware encoding
+        intermediate: Use the faster settings for a file that a later
+            stage re-encodes (never for anything that can end up as the
+            final output via stream copy)
 
     Returns:
         Dict of ffmpeg output parameters
     """
-    if use_hw and _check_hwaccel_available():
-        # VideoToolbox parameters - uses bitrate instead of CRF
-        return {
-            "vcodec": "h264_videotoolbox",
-            "video_bitrate": "8M",  # 8 Mbps for high quality
-            "acodec": "aac",
-            "pix_fmt": "yuv420p",
-            "movflags": "+faststart",
-        }
-    else:
-        # Software encoding with libx264
-        return {
-            "vcodec": "libx264",
-            "crf": 18,
-            "acodec": "aac",
-            "pix_fmt": "yuv420p",
-            "movflags": "+faststart",
-        }
+    backend = _get_hw_backend() if use_hw else None
+    params = dict(_ENCODING_PARAMS_BY_BACKEND[backend])
+    if intermediate:
+        params.update(_INTERMEDIATE_OVERRIDES_BY_BACKEND[backend])
+    return params
+
+
+# ffmpeg-python keyword names that don't map to -<name> on the command line
+_ARGV_FLAG_ALIASES = {"video_bitrate": "-b:v", "audio_bitrate": "-b:a"}
+
+
+def _encoding_args(params: dict) -> list[str]:
+    """Convert an encoding params dict (ffmpeg-python style) to argv flags."""
+    args = []
+    for key, value in params.items():
+        args.extend([_ARGV_FLAG_ALIASES.get(key, f"-{key}"), str(value)])
+    return args
+
+
+@lru_cache(maxsize=32)
+def _encoding_argv(intermediate: bool = False, threads: int | None = None) -> tuple[str, ...]:
+    """Encoder argv flags for the current backend, built once per shape.
+
+    Segment extraction issues the same encoder flags for every segment;
+    caching them by (intermediate, threads) skips rebuilding the params
+    dict and argv list per ffmpeg call.
+
+    Args:
+        intermediate: Use the faster intermediate encoder settings
+        threads: Optional encoder thread count
+
+    Returns:
+        Tuple of argv flags (see _encoding_args)
+    """
+    params = _get_encoding_params(intermediate=intermediate)
+    if threads:
+        params["threads"] = threads
+    return tuple(_encoding_args(params))
+
+
+def _ffmpeg_error_summary(error: Exception, limit: int = 200) -> str:
+    """Extract the relevant error line from an ffmpeg failure for logging."""
+    stderr = getattr(error, "stderr", None)
+    if not stderr:
+        return str(error)
+    match = _FFMPEG_ERR_RE.search(stderr)
+    line = match.group(0) if match else stderr
+    return line[:limit].decode(errors="replace")
+
+
+def _run_ffmpeg(args: list[str]) -> None:
+    """Run ffmpeg with a prebuilt argument list.
+
+    Used on the hot per-segment paths instead of building an ffmpeg-python
+    graph just to compile it back to argv. Raises ffmpeg.Error on failure so
+    callers handle errors the same way for both styles.
+
+    Args:
+        args: ffmpeg arguments (without the executable and global flags)
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", *args]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", result.stdout, result.stderr)
+
+
+# Stream copy eligibility
+# Copying only works cleanly for codecs the mp4 muxer accepts as-is, and only
+# gives a frame-accurate cut when the segment starts close to a keyframe
+_STREAM_COPY_VCODECS = frozenset({"h264"})
+_STREAM_COPY_ACODECS = frozenset({"aac", "mp3"})
+STREAM_COPY_KEYFRAME_TOLERANCE_SEC = 0.25
+
+def _scan_keyframes(path: str) -> list[float] | None:
+    """Get keyframe timestamps of a video's first video stream.
+
+    Only demuxes packets (no decoding), in-process with PyAV when installed
+    and through ffprobe otherwise. Returns None when neither works, in which
+    case keyframe alignment is not checked.
+    """
+    if av is None:
+        return _scan_keyframes_ffprobe(path)
+    try:
+        with av.open(path) as container:
+            if not container.streams.video:
+                return []
+            stream = container.streams.video[0]
+            return sorted(
+                float(packet.pts * stream.time_base)
+                for packet in container.demux(stream)
+                if packet.is_keyframe and packet.pts is not None
+            )
+    except Exception as e:
+        print(f"[Render] Keyframe scan failed for {path}: {e}")
+        return None
+
+
+# Keyframe packet lines from `ffprobe -show_entries packet=pts_time,flags -of csv=p=0`
+_KEYFRAME_PACKET_RE = re.compile(rb"^(\d+(?:\.\d+)?),K", re.MULTILINE)
+
+
+def _scan_keyframes_ffprobe(path: str) -> list[float] | None:
+    """Get keyframe timestamps with an ffprobe packet scan (see _scan_keyframes)."""
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path,
+            ],
+            capture_output=True,
+        )
+    except OSError as e:
+        print(f"[Render] Keyframe scan failed for {path}: {e}")
+        return None
+    if result.returncode != 0:
+        print(f"[Render] Keyframe scan failed for {path}: {result.stderr[:200].decode(errors='replace')}")
+        return None
+    return sorted(float(m) for m in _KEYFRAME_PACKET_RE.findall(result.stdout))
+
+
+@lru_cache(maxsize=512)
+def _get_stream_info_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Probe codec names and keyframe positions; the key invalidates on change."""
+    media = _probe_media(path)
+    return {
+        "vcodec": media["vcodec"],
+        "acodec": media["acodec"],
+        "keyframes": _scan_keyframes(path),
+    }
+
+
+def _get_stream_info(path: str) -> dict:
+    """Get (and cache) codec names and keyframe positions for a source video.
+
+    Bounded like _probe_media so long-lived workers don't keep keyframe lists
+    for every file they have ever probed.
+    """
+    st = os.stat(path)
+    return _get_stream_info_cached(path, st.st_mtime_ns, st.st_size)
 
 
-def _extract_single_segment(task: dict) -> tuple[int, str | None, str | None]:
-    """Extract a single segment using stream copy (fast) with re-encode fallback.
+def _can_stream_copy(info: dict, start_sec: float) -> bool:
+    """Decide from probed metadata whether a segment can be stream-copied."""
+    if info["vcodec"] not in _STREAM_COPY_VCODECS:
+        return False
+    if info["acodec"] is not None and info["acodec"] not in _STREAM_COPY_ACODECS:
+        return False
+
+    keyframes = info["keyframes"]
+    if keyframes is None:
+        return True
+    # Nearest keyframe at or before start_sec
+    i = bisect.bisect_right(keyframes, start_sec) - 1
+    return i >= 0 and start_sec - keyframes[i] <= STREAM_COPY_KEYFRAME_TOLERANCE_SEC
+
+
+# Decode method paired with each encoder backend
+_HWACCEL_BY_BACKEND = {"videotoolbox": "videotoolbox", "nvenc": "cuda", "qsv": "qsv"}
+
+
+def _get_hwaccel_input_kwargs() -> dict:
+    """ffmpeg-python input options for hardware decoding, when available.
+
+    Decoded frames are handed back in system memory because the filter
+    graphs (scale, pad, xfade, zoompan) run on the CPU.
+    """
+    hwaccel = _HWACCEL_BY_BACKEND.get(_get_hw_backend())
+    # Encoder support doesn't imply the matching decoder was built in
+    if hwaccel and hwaccel in _HWACCELS:
+        return {"hwaccel": hwaccel}
+    return {}
+
+
+@lru_cache(maxsize=1)
+def _get_hwaccel_input_args() -> tuple[str, ...]:
+    """Input flags for hardware decoding, when available (see _get_hwaccel_input_kwargs)."""
+    args = []
+    for key, value in _get_hwaccel_input_kwargs().items():
+        args.extend([f"-{key}", value])
+    return tuple(args)
+
+
+def _extract_single_segment(
+    task: dict,
+    reencode_slots: _ReencodeSlots | None = None,
+) -> tuple[int, str | None, str | None]:
+    """Extract a single segment using stream copy (fast) or re-encode.
+
+    Stream copy is only attempted when the task is marked copy-eligible
+    (see _can_stream_copy); a copy that still fails falls back to re-encode.
+
+    Args:
+        task: Extraction task dict
+        reencode_slots: Optional slots bounding concurrent re-encodes
 
     Returns:
         Tuple of (index, segment_path or None, error message or None)
@@ -96,62 +499,244 @@ def _extract_single_segment(task: dict) -> tuple[int, str | None, str | None]:
     start_sec = task["start_sec"]
     duration_sec = task["duration_sec"]
 
-    # Try stream copy first (10-100x faster than re-encoding)
-    try:
-        (
-            ffmpeg
-            .input(video_path, ss=start_sec, t=duration_sec)
-            .output(segment_path, vcodec="copy", acodec="copy", movflags="+faststart")
-            .overwrite_output()
-            .run(quiet=True)
-        )
-        return (index, segment_path, None)
-    except ffmpeg.Error:
-        # Stream copy failed, fall back to re-encoding with hardware acceleration
+    # Stream copy is 10-100x faster than re-encoding
+    # -ss stays an input option so ffmpeg seeks by keyframe instead of
+    # decoding and discarding everything before start_sec
+    if task.get("stream_copy", True):
         try:
-            enc_params = _get_encoding_params()
-            (
-                ffmpeg
-                .input(video_path, ss=start_sec, t=duration_sec)
-                .output(segment_path, **enc_params)
-                .overwrite_output()
-                .run(quiet=True)
-            )
+            # Copy cuts land on the preceding keyframe anyway, so let the
+            # demuxer jump there via the index instead of seeking accurately
+            _run_ffmpeg([
+                "-fflags", "+fastseek", "-noaccurate_seek",
+                "-ss", str(start_sec), "-i", video_path,
+                "-t", str(duration_sec),
+                "-c", "copy", "-avoid_negative_ts", "make_zero",
+                "-movflags", "+faststart",
+                segment_path,
+            ])
             return (index, segment_path, None)
-        except ffmpeg.Error as e:
-            error_msg = e.stderr.decode()[:200] if hasattr(e, 'stderr') and e.stderr else str(e)
-            return (index, None, error_msg)
+        except ffmpeg.Error:
+            # Stream copy failed, fall back to re-encoding
+            pass
+
+    # Re-encode with hardware acceleration
+    # Input seek only: ffmpeg jumps to the keyframe before start_sec via the
+    # container index and, when transcoding, discards decoded frames up to
+    # start_sec itself (accurate_seek), so the cut is still frame-accurate
+    encoding_argv = _encoding_argv(task.get("intermediate", False), task.get("threads"))
+    try:
+        if reencode_slots is not None:
+            reencode_slots.acquire()
+        try:
+            _run_ffmpeg([
+                *_get_hwaccel_input_args(), "-ss", str(start_sec), "-i", video_path,
+                "-t", str(duration_sec),
+                *encoding_argv,
+                segment_path,
+            ])
+        finally:
+            if reencode_slots is not None:
+                reencode_slots.release()
+        return (index, segment_path, None)
+    except ffmpeg.Error as e:
+        error_msg = _ffmpeg_error_summary(e)
+        return (index, None, error_msg)
+
+
+# Re-encoded windows of one source whose gaps are at most this long are cut
+# by one ffmpeg process; decoding a short gap is cheaper than a new process,
+# input parse and seek
+SINGLE_PASS_MAX_GAP_SEC = 10.0
+
+
+def _batch_nearby_windows(tasks: list[dict]) -> list[list[dict]]:
+    """Group one source's extraction tasks into runs of nearby windows.
+
+    Args:
+        tasks: Extraction task dicts for the same video_path
+
+    Returns:
+        Batches of tasks in start order; consecutive windows in a batch are
+        at most SINGLE_PASS_MAX_GAP_SEC apart
+    """
+    batches: list[list[dict]] = []
+    batch_end = None
+    for task in sorted(tasks, key=lambda t: t["start_sec"]):
+        if batch_end is not None and task["start_sec"] - batch_end <= SINGLE_PASS_MAX_GAP_SEC:
+            batches[-1].append(task)
+            batch_end = max(batch_end, task["start_sec"] + task["duration_sec"])
+        else:
+            batches.append([task])
+            batch_end = task["start_sec"] + task["duration_sec"]
+    return batches
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink src to dst (no extra bytes), copying if linking isn't possible.
+
+    An existing dst is replaced.
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
 
 
 def _extract_segments_parallel(tasks: list[dict]) -> tuple[list[str], list[int]]:
     """Extract multiple segments in parallel.
 
+    Each source video is probed once up front, and every task is tagged with
+    whether it can be stream-copied, so workers never start a copy that is
+    bound to fail. Tasks that cut the same window from the same source are
+    extracted once and hardlinked for the duplicates, and nearby re-encoded
+    windows of one source share a single ffmpeg process.
+
     Args:
-        tasks: List of extraction task dicts
+        tasks: List of extraction task dicts, with "index" values 0..len(tasks)-1
 
     Returns:
         Tuple of (list of segment paths in order, list of task indices that succeeded)
     """
-    results = {}
+    results: list[str | None] = [None] * len(tasks)
+
+    stream_infos = {}
+    for video_path in {task["video_path"] for task in tasks}:
+        try:
+            stream_infos[video_path] = _get_stream_info(video_path)
+        except Exception as e:
+            print(f"[Render] Could not probe {video_path}: {e}")
+    for task in tasks:
+        info = stream_infos.get(task["video_path"])
+        task["stream_copy"] = info is None or _can_stream_copy(info, task["start_sec"])
+
+    # Identical windows (same source, start and duration) are extracted once
+    unique_tasks = []
+    duplicates: dict[int, list[dict]] = {}  # extracted task index -> duplicate tasks
+    first_by_window: dict[tuple, dict] = {}
+    for task in tasks:
+        window = (task["video_path"], round(task["start_sec"], 3), round(task["duration_sec"], 3))
+        first = first_by_window.get(window)
+        if first is None:
+            first_by_window[window] = task
+            unique_tasks.append(task)
+        else:
+            duplicates.setdefault(first["index"], []).append(task)
+    if len(unique_tasks) != len(tasks):
+        print(f"[Render] {len(tasks) - len(unique_tasks)} duplicate segments will reuse extracted files")
+
+    # Copies run one process each; re-encoded windows that sit close together
+    # in one source are cut by a single process that decodes that stretch once
+    jobs = [[task] for task in unique_tasks if task["stream_copy"]]
+    reencode_by_source: dict[str, list[dict]] = {}
+    for task in unique_tasks:
+        if not task["stream_copy"]:
+            reencode_by_source.setdefault(task["video_path"], []).append(task)
+    reencode_jobs = [
+        batch for group in reencode_by_source.values() for batch in _batch_nearby_windows(group)
+    ]
+    jobs.extend(reencode_jobs)
+
+    # Size the pool for the actual mix of copy and re-encode work
+    reencode_count = len(reencode_jobs)
+    max_reencodes = max(1, min(_max_parallel_reencodes(), reencode_count))
+    threads_per_encode = max(1, CPU_COUNT // max_reencodes)
+    for task in unique_tasks:
+        task["threads"] = threads_per_encode
+    max_workers = max(1, min(MAX_PARALLEL_COPIES, len(jobs)))
+    print(f"[Render] Extraction pool: {max_workers} workers, {max_reencodes} concurrent re-encodes "
+          f"({reencode_count} planned for {sum(map(len, reencode_jobs))} segments), "
+          f"{threads_per_encode} encoder threads each")
+
+    def run_job(batch: list[dict]) -> list[tuple[int, str | None, str | None]]:
+        if len(batch) == 1:
+            batch_results = [_extract_single_segment(batch[0], _REENCODE_SLOTS)]
+        else:
+            batch_results = _extract_windows_single_pass(batch[0]["video_path"], batch, threads_per_encode)
+        # Probe each finished segment in the worker while other extractions
+        # are still running; concatenation reads these from the probe cache
+        # instead of running one ffprobe per segment after the pool drains
+        for _, segment_path, _ in batch_results:
+            if segment_path:
+                try:
+                    _probe_media(segment_path)
+                except Exception:
+                    pass
+        return batch_results
 
-    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_EXTRACTIONS) as executor:
-        futures = {executor.submit(_extract_single_segment, task): task for task in tasks}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_job, batch) for batch in jobs]
 
+        # Progress every ~10% rather than a line (and a stat) per segment
         completed = 0
-        total = len(tasks)
+        total = len(unique_tasks)
+        progress_step = max(1, total // 10)
         for future in as_completed(futures):
-            completed += 1
-            index, segment_path, error = future.result()
-            if segment_path:
-                results[index] = segment_path
-                seg_size = os.path.getsize(segment_path) / 1024
-                print(f"[Render] Segment {completed}/{total} extracted ({seg_size:.1f} KB)")
-            else:
-                print(f"[Render] ERROR extracting segment {index}: {error}")
+            for index, segment_path, error in future.result():
+                completed += 1
+                if completed % progress_step == 0 or completed == total:
+                    print(f"[Render] Segments extracted: {completed}/{total}")
+                if segment_path:
+                    results[index] = segment_path
+                    for dup in duplicates.get(index, []):
+                        _link_or_copy(segment_path, dup["segment_path"])
+                        results[dup["index"]] = dup["segment_path"]
+                else:
+                    print(f"[Render] ERROR extracting segment {index}: {error}")
 
     # Return paths and indices in order
-    sorted_indices = sorted(results.keys())
-    return [results[i] for i in sorted_indices], sorted_indices
+    extracted_indices = [i for i, path in enumerate(results) if path is not None]
+    return [results[i] for i in extracted_indices], extracted_indices
+
+
+# RAM-backed scratch space for intermediate render files (Linux tmpfs)
+RENDER_TMPFS_ROOT = "/dev/shm"
+# Rough intermediate size: 8 Mbps video, with up to ~4 stage outputs alive at once
+_ESTIMATED_BYTES_PER_SEC = 8_000_000 // 8
+_ESTIMATED_LIVE_STAGES = 4
+# tmpfs pages are RAM the ffmpeg processes also need; cap the render's share
+RENDER_TMPFS_MAX_RAM_FRACTION = 0.5
+
+
+def _available_ram_bytes() -> int | None:
+    """Available physical memory in bytes, or None where sysconf can't tell."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _best_tmp_root(estimated_bytes: int) -> str | None:
+    """Pick a temp root for intermediate files.
+
+    Prefers the RAM-backed tmpfs when it exists, has room for the
+    estimated pipeline size and that size stays under
+    RENDER_TMPFS_MAX_RAM_FRACTION of available memory; otherwise returns
+    None (default temp dir).
+
+    Args:
+        estimated_bytes: Estimated total size of intermediate files
+
+    Returns:
+        Directory to create the render temp dir in, or None for the default
+    """
+    if not os.path.isdir(RENDER_TMPFS_ROOT):
+        return None
+    try:
+        free = shutil.disk_usage(RENDER_TMPFS_ROOT).free
+    except OSError:
+        return None
+    if free < estimated_bytes:
+        print(f"[Render] {RENDER_TMPFS_ROOT} too small ({free / 1e9:.1f} GB free, "
+              f"need ~{estimated_bytes / 1e9:.1f} GB), using disk temp dir")
+        return None
+    available_ram = _available_ram_bytes()
+    if available_ram is not None and estimated_bytes > available_ram * RENDER_TMPFS_MAX_RAM_FRACTION:
+        print(f"[Render] Not enough free RAM for tmpfs intermediates ({available_ram / 1e9:.1f} GB available, "
+              f"need ~{estimated_bytes / 1e9:.1f} GB), using disk temp dir")
+        return None
+    return RENDER_TMPFS_ROOT
 
 
 def validate_timeline_for_render(
@@ -252,7 +837,7 @@ def render_final_video(
         generated_ads: Optional list of generated Veo ads with video_path and timestamp_ms
     """
     print(f"[Render] ========== STARTING FINAL VIDEO RENDER ==========")
-    print(f"[Render] Hardware acceleration: {'h264_videotoolbox' if _check_hwaccel_available() else 'disabled (using libx264)'}")
+    print(f"[Render] Hardware acceleration: {_get_video_codec() if _check_hwaccel_available() else 'disabled (using libx264)'}")
     print(f"[Render] Source videos: {len(video_paths)}")
     print(f"[Render] Output path: {output_path}")
     print(f"[Render] Music: {'Yes' if music_path else 'No'}")
@@ -269,8 +854,10 @@ def render_final_video(
 
     print(f"[Render] Timeline has {len(segments)} segments")
 
-    # Create temp directory for intermediate files
-    with tempfile.TemporaryDirectory() as tmpdir:
+    # Create temp directory for intermediate files, on tmpfs when it fits
+    timeline_sec = sum(max(0, seg["end_ms"] - seg["start_ms"]) for seg in segments) / 1000
+    estimated_bytes = int(timeline_sec * _ESTIMATED_BYTES_PER_SEC * _ESTIMATED_LIVE_STAGES)
+    with tempfile.TemporaryDirectory(dir=_best_tmp_root(estimated_bytes)) as tmpdir:
         print(f"[Render] Working in temp directory: {tmpdir}")
 
         # Extract and prepare each segment
@@ -331,98 +918,215 @@ def render_final_video(
             segment_index_map[task_idx] = i
             task_idx += 1
 
-        print(f"[Render] Extracting {len(extraction_tasks)} segments using {MAX_PARALLEL_EXTRACTIONS} parallel workers...")
+        # Post-concat stages, each (banner, intermediate file name,
+        # fn(input, output, intermediate), whether it re-encodes the video).
+        # The last active stage writes straight to output_path, so there is
+        # no trailing remux copy of the whole video. A stage's output uses
+        # the faster intermediate encoder settings only when the next stage
+        # re-encodes the video (music mixing copies it).
+        sponsor_windows = _sponsor_overlay_windows(sponsor_name, timeline) if sponsor_name else None
+        stages = []
+        if generated_ads:
+            stages.append((
+                f"INSERTING ADS ({len(generated_ads)})", "with_ads.mp4",
+                lambda src, dst, inter: insert_ads_into_video(src, generated_ads, dst, tmpdir, intermediate=inter),
+                True,
+            ))
+        if sponsor_windows:
+            stages.append((
+                f"ADDING SPONSOR OVERLAYS ({sponsor_name})", "overlay.mp4",
+                lambda src, dst, inter: add_sponsor_overlays(src, dst, sponsor_name, timeline, intermediate=inter),
+                True,
+            ))
+        if music_path:
+            stages.append((
+                f"MIXING MUSIC ({event_type} profile)", "mixed.mp4",
+                lambda src, dst, inter: mix_audio(src, music_path, dst, event_type),
+                False,
+            ))
+        concat_reencoded = bool(stages) and stages[0][3]
+
+        concat_path = os.path.join(tmpdir, "concat.mp4") if stages else output_path
+        crossfade_duration = get_crossfade_duration(event_type)
+        zooms = timeline.get("zooms", [])
+        # Segment (and zoomed segment) files are only ever inputs to another
+        # encode when crossfades or later stages re-encode them; otherwise a
+        # stream-copy concat can make them the final output
+        segments_reencoded = concat_reencoded or (crossfade_duration > 0 and len(extraction_tasks) > 1)
+        for task in extraction_tasks:
+            task["intermediate"] = segments_reencoded
+
+        # Hard cuts with no per-segment effects: let the concat demuxer read
+        # the source windows directly (inpoint/outpoint) with stream copy, so
+        # no segment files are written at all
+        direct_concat = (
+            crossfade_duration <= 0
+            and not zooms
+            and not generated_ads
+            and extraction_tasks
+            and _sources_stream_compatible([t["video_path"] for t in extraction_tasks])
+            and _windows_start_on_keyframes(extraction_tasks)
+        )
 
-        # Extract segments in parallel using stream copy (much faster)
-        segment_files, extracted_indices = _extract_segments_parallel(extraction_tasks)
+        if direct_concat:
+            print(f"[Render] ---------- CONCATENATING SOURCE WINDOWS (STREAM COPY) ----------")
+            print(f"[Render] Concatenating {len(extraction_tasks)} segments without extraction...")
+            _concatenate_source_windows(extraction_tasks, concat_path)
+            print(f"[Render] Concatenation complete")
+        else:
+            print(f"[Render] Extracting {len(extraction_tasks)} segments in parallel...")
+
+            # Extract segments in parallel using stream copy (much faster)
+            segment_files, extracted_indices = _extract_segments_parallel(extraction_tasks)
+
+            if not segment_files:
+                print(f"[Render] ERROR: No segments extracted")
+                raise ValueError("No segments extracted")
+
+            # Check if any segments failed - if so, we have gaps in the timeline
+            if len(segment_files) != len(extraction_tasks):
+                failed_count = len(extraction_tasks) - len(segment_files)
+                print(f"[Render] WARNING: {failed_count} segments failed to extract - output may have gaps!")
+
+            print(f"[Render] Total segments extracted: {len(segment_files)}")
+
+            # Build mapping from original segment index to extracted file index
+            original_to_extracted = {}
+            for extracted_idx, task_idx in enumerate(extracted_indices):
+                original_seg_idx = segment_index_map.get(task_idx)
+                if original_seg_idx is not None:
+                    original_to_extracted[original_seg_idx] = extracted_idx
+
+            fused = False
+            if (
+                get_settings().render_fused_pipeline
+                and crossfade_duration > 0
+                and len(segment_files) > 1
+            ):
+                print(f"[Render] ---------- FUSED RENDER ----------")
+                try:
+                    _render_fused(
+                        segment_files,
+                        output_path,
+                        crossfade_duration,
+                        zoom_plan=_plan_zooms(len(segment_files), segments, zooms, original_to_extracted),
+                        sponsor_windows=sponsor_windows,
+                        music_path=music_path,
+                        event_type=event_type,
+                        ads=generated_ads,
+                    )
+                    fused = True
+                    stages = []
+                    print(f"[Render] Fused render complete")
+                except Exception as e:
+                    print(f"[Render] Fused render failed, falling back to staged passes: {_ffmpeg_error_summary(e)}")
+
+            if not fused:
+                # Apply zooms to segments
+                if zooms:
+                    print(f"[Render] ---------- APPLYING ZOOMS ----------")
+                    print(f"[Render] Applying {len(zooms)} zoom effects...")
+                    segment_files = apply_zooms_to_segments(
+                        segment_files, segments, zooms, tmpdir, original_to_extracted,
+                        intermediate=segments_reencoded,
+                    )
+                else:
+                    print(f"[Render] No zoom effects to apply")
+
+                # Concatenate segments with crossfades (adaptive duration based on event type)
+                print(f"[Render] ---------- CONCATENATING SEGMENTS ----------")
+                print(f"[Render] Concatenating {len(segment_files)} segments with {crossfade_duration}s crossfades ({event_type} style)...")
+                concatenate_with_crossfades(
+                    segment_files, concat_path,
+                    crossfade_duration=crossfade_duration, intermediate=concat_reencoded,
+                )
+                print(f"[Render] Concatenation complete")
 
-        if not segment_files:
-            print(f"[Render] ERROR: No segments extracted")
-            raise ValueError("No segments extracted")
+        for stage_idx, (banner, file_name, run_stage, _) in enumerate(stages):
+            is_last = stage_idx == len(stages) - 1
+            stage_path = output_path if is_last else os.path.join(tmpdir, file_name)
+            print(f"[Render] ---------- {banner} ----------")
+            run_stage(concat_path, stage_path, not is_last and stages[stage_idx + 1][3])
+            concat_path = stage_path
+            print(f"[Render] Stage complete -> {stage_path}")
 
-        # Check if any segments failed - if so, we have gaps in the timeline
-        if len(segment_files) != len(extraction_tasks):
-            failed_count = len(extraction_tasks) - len(segment_files)
-            print(f"[Render] WARNING: {failed_count} segments failed to extract - output may have gaps!")
+        output_size = os.path.getsize(output_path) / (1024 * 1024)
+        print(f"[Render] Final video size: {output_size:.1f} MB")
+        print(f"[Render] ========== RENDER COMPLETE ==========")
 
-        print(f"[Render] Total segments extracted: {len(segment_files)}")
 
-        # Build mapping from original segment index to extracted file index
-        original_to_extracted = {}
-        for extracted_idx, task_idx in enumerate(extracted_indices):
-            original_seg_idx = segment_index_map.get(task_idx)
-            if original_seg_idx is not None:
-                original_to_extracted[original_seg_idx] = extracted_idx
+# Sized for reels and timelines with dozens of sources, segments and stage outputs
+@lru_cache(maxsize=512)
+def _probe_media_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Probe a media file (cached by path, mtime and size).
 
-        # Apply zooms to segments
-        zooms = timeline.get("zooms", [])
-        if zooms:
-            print(f"[Render] ---------- APPLYING ZOOMS ----------")
-            print(f"[Render] Applying {len(zooms)} zoom effects...")
-            segment_files = apply_zooms_to_segments(
-                segment_files, segments, zooms, tmpdir, original_to_extracted
-            )
-        else:
-            print(f"[Render] No zoom effects to apply")
+    Uses PyAV when installed to read the container in-process; otherwise
+    falls back to an ffprobe subprocess via ffmpeg.probe.
+    """
+    if av is not None:
+        with av.open(path) as container:
+            video = container.streams.video[0] if container.streams.video else None
+            audio = container.streams.audio[0] if container.streams.audio else None
+            rate = (video.base_rate or video.average_rate) if video else None
+            return {
+                "duration": container.duration / av.time_base if container.duration else 0.0,
+                "fps": float(rate) if rate else None,
+                "has_video": video is not None,
+                "has_audio": audio is not None,
+                "vcodec": video.codec_context.name if video else None,
+                "acodec": audio.codec_context.name if audio else None,
+                "width": video.codec_context.width if video else None,
+                "height": video.codec_context.height if video else None,
+                "pix_fmt": video.codec_context.pix_fmt if video else None,
+                "sample_rate": audio.codec_context.sample_rate if audio else None,
+            }
 
-        # Concatenate segments with crossfades (adaptive duration based on event type)
-        print(f"[Render] ---------- CONCATENATING SEGMENTS ----------")
-        concat_path = os.path.join(tmpdir, "concat.mp4")
-        crossfade_duration = get_crossfade_duration(event_type)
-        print(f"[Render] Concatenating {len(segment_files)} segments with {crossfade_duration}s crossfades ({event_type} style)...")
-        concatenate_with_crossfades(segment_files, concat_path, crossfade_duration=crossfade_duration)
-        print(f"[Render] Concatenation complete")
+    probe = ffmpeg.probe(path)
+    streams = probe.get("streams", [])
+    video = next((s for s in streams if s["codec_type"] == "video"), None)
+    audio = next((s for s in streams if s["codec_type"] == "audio"), None)
+    fps = None
+    if video:
+        # Parse frame rate (handles "30/1" or "30000/1001" format)
+        fps_parts = video["r_frame_rate"].split("/")
+        fps = int(fps_parts[0]) / int(fps_parts[1]) if len(fps_parts) == 2 else float(fps_parts[0])
+    return {
+        "duration": float(probe["format"]["duration"]),
+        "fps": fps,
+        "has_video": video is not None,
+        "has_audio": audio is not None,
+        "vcodec": video.get("codec_name") if video else None,
+        "acodec": audio.get("codec_name") if audio else None,
+        "width": video.get("width") if video else None,
+        "height": video.get("height") if video else None,
+        "pix_fmt": video.get("pix_fmt") if video else None,
+        "sample_rate": int(audio["sample_rate"]) if audio and "sample_rate" in audio else None,
+    }
 
-        # Insert generated ads if provided
-        if generated_ads:
-            print(f"[Render] ---------- INSERTING ADS ----------")
-            print(f"[Render] Inserting {len(generated_ads)} ads into video...")
-            ads_inserted_path = os.path.join(tmpdir, "with_ads.mp4")
-            insert_ads_into_video(concat_path, generated_ads, ads_inserted_path, tmpdir)
-            concat_path = ads_inserted_path
-            print(f"[Render] Ads inserted successfully")
-
-        # Add sponsor overlays if provided
-        if sponsor_name:
-            print(f"[Render] ---------- ADDING SPONSOR OVERLAYS ----------")
-            print(f"[Render] Adding sponsor overlays for: {sponsor_name}")
-            overlay_path = os.path.join(tmpdir, "overlay.mp4")
-            add_sponsor_overlays(concat_path, overlay_path, sponsor_name, timeline)
-            concat_path = overlay_path
-            print(f"[Render] Sponsor overlays added")
-
-        # Mix music if provided
-        if music_path:
-            print(f"[Render] ---------- MIXING MUSIC ----------")
-            print(f"[Render] Mixing music with event type profile: {event_type}")
-            mix_path = os.path.join(tmpdir, "mixed.mp4")
-            mix_audio(concat_path, music_path, mix_path, event_type)
-            concat_path = mix_path
-            print(f"[Render] Music mix complete")
-
-        # Final copy to output
-        print(f"[Render] ---------- FINALIZING OUTPUT ----------")
-        print(f"[Render] Copying final video to: {output_path}")
-        (
-            ffmpeg
-            .input(concat_path)
-            .output(output_path, vcodec="copy", acodec="copy")
-            .overwrite_output()
-            .run(quiet=True)
-        )
 
-        output_size = os.path.getsize(output_path) / (1024 * 1024)
-        print(f"[Render] Final video size: {output_size:.1f} MB")
-        print(f"[Render] ========== RENDER COMPLETE ==========")
+def _probe_media(path: str) -> dict:
+    """Get duration, stream presence and stream formats for a media file.
+
+    Results are cached per file version, so repeated probes of the same
+    segment (normalize, zoom, duration lookups) only read it once.
+
+    Args:
+        path: Media file path
+
+    Returns:
+        Dict with duration, fps, has_video, has_audio, vcodec, acodec,
+        width, height, pix_fmt, sample_rate
+    """
+    st = os.stat(path)
+    return _probe_media_cached(path, st.st_mtime_ns, st.st_size)
 
 
 def _get_video_duration(path: str) -> float:
-    """Get video duration in seconds using ffprobe."""
-    probe = ffmpeg.probe(path)
-    return float(probe["format"]["duration"])
+    """Get video duration in seconds."""
+    return _probe_media(path)["duration"]
 
 
-def _normalize_segment(input_path: str, output_path: str) -> None:
+def _normalize_segment(input_path: str, output_path: str, threads: int | None = None) -> None:
     """Normalize a segment to consistent format for concatenation with crossfades.
 
     Ensures all segments have:
@@ -430,47 +1134,49 @@ def _normalize_segment(input_path: str, output_path: str) -> None:
     - Same frame rate (30fps)
     - Same audio sample rate (48000Hz)
     - Same pixel format (yuv420p)
+
+    Args:
+        input_path: Segment to normalize
+        output_path: Path to write normalized segment
+        threads: Optional encoder thread count (when running several in parallel)
     """
     enc_params = _get_encoding_params()
     enc_params["ar"] = 48000  # Consistent audio sample rate
+    enc_params["ac"] = 2  # Consistent channel layout (silent fill is stereo too)
+    if threads:
+        enc_params["threads"] = threads
 
     try:
         # Check if input has audio stream
-        probe = ffmpeg.probe(input_path)
-        has_audio = any(s["codec_type"] == "audio" for s in probe.get("streams", []))
-
-        input_stream = ffmpeg.input(input_path)
+        has_audio = _probe_media(input_path)["has_audio"]
 
         # Apply video filters
-        video = (
-            input_stream.video
-            .filter("scale", w=1920, h=1080, force_original_aspect_ratio="decrease")
-            .filter("pad", w=1920, h=1080, x="(ow-iw)/2", y="(oh-ih)/2")
-            .filter("fps", fps=30)
-            .filter("format", pix_fmts="yuv420p")
+        video_filter = (
+            "scale=1920:1080:force_original_aspect_ratio=decrease,"
+            "pad=1920:1080:(ow-iw)/2:(oh-ih)/2,fps=30,format=yuv420p"
         )
 
         if has_audio:
-            # Get audio stream (will be resampled by ar parameter)
-            audio = input_stream.audio
-            # Output with both streams
-            (
-                ffmpeg
-                .output(video, audio, output_path, **enc_params)
-                .overwrite_output()
-                .run(quiet=True)
-            )
+            # Output with both streams (audio resampled by the ar parameter)
+            _run_ffmpeg([
+                *_get_hwaccel_input_args(), "-i", input_path,
+                "-map", "0:v:0", "-map", "0:a",
+                "-vf", video_filter,
+                *_encoding_args(enc_params),
+                output_path,
+            ])
         else:
             # Video only - generate silent audio to ensure consistent format
             # This prevents issues when concatenating with segments that have audio
-            silent_audio = ffmpeg.input("anullsrc=r=48000:cl=stereo", f="lavfi", t=_get_video_duration(input_path))
-            enc_params_no_ar = {k: v for k, v in enc_params.items() if k != "ar"}
-            (
-                ffmpeg
-                .output(video, silent_audio, output_path, **enc_params_no_ar, ar=48000)
-                .overwrite_output()
-                .run(quiet=True)
-            )
+            _run_ffmpeg([
+                *_get_hwaccel_input_args(), "-i", input_path,
+                "-f", "lavfi", "-t", str(_get_video_duration(input_path)),
+                "-i", "anullsrc=r=48000:cl=stereo",
+                "-map", "0:v:0", "-map", "1:a",
+                "-vf", video_filter,
+                *_encoding_args(enc_params),
+                output_path,
+            ])
             print("[Render] Added silent audio to segment without audio track")
 
     except ffmpeg.Error as e:
@@ -480,10 +1186,43 @@ def _normalize_segment(input_path: str, output_path: str) -> None:
         shutil.copy(input_path, output_path)
 
 
+def _normalize_segments(segment_files: list[str]) -> list[str]:
+    """Normalize segments next to the originals for concat-demuxer joins.
+
+    Runs the re-encodes concurrently (threads just wait on ffmpeg), bounded
+    by the shared re-encode slots so this never oversubscribes the CPU on
+    top of a running extraction.
+
+    Args:
+        segment_files: List of paths to segment files
+
+    Returns:
+        List of normalized segment paths (same order)
+    """
+    tmpdir = os.path.dirname(segment_files[0])
+    normalized_files = [
+        os.path.join(tmpdir, f"normalized_{i:04d}.mp4") for i in range(len(segment_files))
+    ]
+    max_workers = max(1, min(_max_parallel_reencodes(), len(segment_files)))
+    threads_per_encode = max(1, CPU_COUNT // max_workers)
+
+    def normalize(i: int) -> None:
+        with _REENCODE_SLOTS:
+            _normalize_segment(segment_files[i], normalized_files[i], threads=threads_per_encode)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # list() re-raises any worker exception here
+        list(executor.map(normalize, range(len(segment_files))))
+    print(f"[Render] Normalized {len(segment_files)} segments")
+
+    return normalized_files
+
+
 def concatenate_with_crossfades(
     segment_files: list[str],
     output_path: str,
     crossfade_duration: float = 0.5,
+    intermediate: bool = False,
 ) -> None:
     """Concatenate video segments with actual crossfade transitions using xfade filter.
 
@@ -494,79 +1233,42 @@ def concatenate_with_crossfades(
         segment_files: List of paths to segment files
         output_path: Path to write concatenated output
         crossfade_duration: Duration of crossfade in seconds
+        intermediate: Encode the crossfade output with the faster
+            intermediate settings (a later stage re-encodes it)
     """
     if len(segment_files) == 1:
-        # No concatenation needed - just copy
-        (
-            ffmpeg
-            .input(segment_files[0])
-            .output(output_path, vcodec="copy", acodec="copy")
-            .overwrite_output()
-            .run(quiet=True)
-        )
+        # No concatenation needed - the segment already is a finished MP4,
+        # so hardlink it (or copy across filesystems) instead of remuxing
+        _link_or_copy(segment_files[0], output_path)
         return
 
-    print(f"[Render] Concatenating {len(segment_files)} segments with crossfade transitions...")
-
-    # First, normalize all segments to ensure compatible formats
-    tmpdir = os.path.dirname(segment_files[0])
-    normalized_files = []
+    if crossfade_duration <= 0:
+        # No transition requested: hard cuts through the concat demuxer, with
+        # stream copy when the segments already match
+        if _streams_compatible(segment_files):
+            print(f"[Render] Concatenating {len(segment_files)} compatible segments with stream copy...")
+            _concatenate_simple(segment_files, output_path, copy=True)
+        else:
+            print(f"[Render] Concatenating {len(segment_files)} segments without crossfades...")
+            _concatenate_normalized(segment_files, output_path)
+        return
 
-    print("[Render] Normalizing segments for crossfade compatibility...")
-    for i, seg_path in enumerate(segment_files):
-        normalized_path = os.path.join(tmpdir, f"normalized_{i:04d}.mp4")
-        _normalize_segment(seg_path, normalized_path)
-        normalized_files.append(normalized_path)
-        print(f"[Render] Normalized segment {i + 1}/{len(segment_files)}")
+    print(f"[Render] Concatenating {len(segment_files)} segments with crossfade transitions...")
 
-    # Get durations of all normalized segments
-    durations = []
-    for f in normalized_files:
-        durations.append(_get_video_duration(f))
+    # Segments are normalized inside the xfade filter graph, so durations
+    # and audio presence come straight from the source segments
+    probes = [_probe_media(f) for f in segment_files]
+    durations = [p["duration"] for p in probes]
+    has_audio = [p["has_audio"] for p in probes]
 
     print(f"[Render] Segment durations: {[f'{d:.2f}s' for d in durations]}")
 
-    # Build xfade filter chain using ffmpeg-python
-    # For N segments, we need N-1 xfade transitions
     try:
-        if len(normalized_files) == 2:
-            # Simple case: two segments with one crossfade
-            offset = durations[0] - crossfade_duration
-            if offset < 0:
-                offset = 0
-
-            stream1 = ffmpeg.input(normalized_files[0])
-            stream2 = ffmpeg.input(normalized_files[1])
-
-            # Video crossfade
-            video = ffmpeg.filter(
-                [stream1.video, stream2.video],
-                "xfade",
-                transition="fade",
-                duration=crossfade_duration,
-                offset=offset
-            )
-
-            # Audio crossfade
-            audio = ffmpeg.filter(
-                [stream1.audio, stream2.audio],
-                "acrossfade",
-                d=crossfade_duration
-            )
-
-            enc_params = _get_encoding_params()
-            (
-                ffmpeg
-                .output(video, audio, output_path, **enc_params)
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
-        else:
-            # Multiple segments: use filter_complex with chained xfades
-            # This is complex with ffmpeg-python, so we'll use subprocess directly
-            _concatenate_multiple_with_xfade(normalized_files, durations, output_path, crossfade_duration)
-
-        print("[Render] Crossfade concatenation complete")
+        _concatenate_multiple_with_xfade(
+            segment_files, durations, output_path, crossfade_duration, has_audio,
+            intermediate=intermediate,
+        )
+        print("[Render] Crossfade concatenation complete")
 
     except Exception as e:
         # Handle both ffmpeg.Error (has stderr) and other exceptions
@@ -577,9 +1279,29 @@ def concatenate_with_crossfades(
                 error_msg = stderr.decode()
         print(f"[Render] Crossfade failed: {error_msg[:300]}")
         print("[Render] Falling back to simple concatenation...")
-        # Use normalized files if available, otherwise original
-        fallback_files = normalized_files if normalized_files else segment_files
-        _concatenate_simple(fallback_files, output_path)
+        # Normalize first so the concat demuxer sees matching stream formats
+        _concatenate_normalized(segment_files, output_path)
+
+
+def _xfade_offsets(durations: list[float], crossfade_duration: float) -> tuple[list[float], float]:
+    """Compute chained xfade offsets and the resulting output duration.
+
+    For chained xfades, the offset is when the crossfade starts in the LEFT
+    input's timeline: after k joins the output is sum(durations[:k+1]) -
+    k * crossfade long, and the next crossfade starts crossfade before its
+    end. Computed as one cumulative sum rather than a Python loop.
+
+    Args:
+        durations: Duration of each segment in seconds
+        crossfade_duration: Duration of each crossfade in seconds
+
+    Returns:
+        Tuple of (offset for each of the len(durations) - 1 joins, total duration)
+    """
+    totals = np.cumsum(np.asarray(durations, dtype=np.float64))
+    totals -= crossfade_duration * np.arange(len(totals))
+    offsets = np.maximum(totals[:-1] - crossfade_duration, 0.0)
+    return offsets.tolist(), float(totals[-1])
 
 
 def _concatenate_multiple_with_xfade(
@@ -587,87 +1309,92 @@ def _concatenate_multiple_with_xfade(
     durations: list[float],
     output_path: str,
     crossfade_duration: float,
+    has_audio: list[bool] | None = None,
+    intermediate: bool = False,
 ) -> None:
     """Concatenate multiple segments with xfade using raw ffmpeg command.
 
-    Uses filter_complex to chain xfade filters for both video and audio
-    to keep them in sync.
+    Each input is normalized (1920x1080, 30fps, yuv420p, 48kHz stereo) by its
+    own chain inside the filter graph and fed straight into chained xfade /
+    acrossfade filters, so the whole concatenation is a single decode and
+    encode pass. Inputs without audio get a silent track of matching length.
+
+    Args:
+        files: Segment file paths (at least 2)
+        durations: Duration of each segment in seconds
+        output_path: Path to write concatenated output
+        crossfade_duration: Duration of crossfade in seconds
+        has_audio: Whether each segment has an audio stream (default: all do)
+        intermediate: Use the faster intermediate encoder settings
     """
     n = len(files)
+    if has_audio is None:
+        has_audio = [True] * n
 
     # Build input arguments
+    hwaccel_args = _get_hwaccel_input_args()
     inputs = []
     for f in files:
-        inputs.extend(["-i", f])
+        inputs.extend([*hwaccel_args, "-i", f])
+
+    # Per-input normalization chains: [i:v] -> [vn{i}], [i:a] -> [an{i}]
+    norm_filters = []
+    for i in range(n):
+        norm_filters.append(
+            f"[{i}:v]scale=1920:1080:force_original_aspect_ratio=decrease,"
+            f"pad=1920:1080:(ow-iw)/2:(oh-ih)/2,fps=30,format=yuv420p,"
+            f"setpts=PTS-STARTPTS[vn{i}]"
+        )
+        if has_audio[i]:
+            norm_filters.append(
+                f"[{i}:a]aresample=48000,aformat=sample_fmts=fltp:channel_layouts=stereo,"
+                f"asetpts=PTS-STARTPTS[an{i}]"
+            )
+        else:
+            norm_filters.append(
+                f"anullsrc=r=48000:cl=stereo,atrim=duration={durations[i]:.3f},"
+                f"aformat=sample_fmts=fltp:channel_layouts=stereo[an{i}]"
+            )
 
     # Build filter_complex string
-    # Chain xfades for video: [0:v][1:v]xfade -> [v0], [v0][2:v]xfade -> [v1], etc.
-    # Chain acrossfade for audio: [0:a][1:a]acrossfade -> [a0], [a0][2:a]acrossfade -> [a1], etc.
+    # Chain xfades for video: [vn0][vn1]xfade -> [v0], [v0][vn2]xfade -> [v1], etc.
+    # Chain acrossfade for audio: [an0][an1]acrossfade -> [a0], [a0][an2]acrossfade -> [a1], etc.
     # This keeps video and audio durations in sync
 
     video_filters = []
     audio_filters = []
 
-    # For chained xfades, offset is when crossfade starts in the LEFT input's timeline
-    # First xfade: offset = duration[0] - crossfade
-    # After first xfade, output duration = duration[0] + duration[1] - crossfade
-    # Second xfade offset = (output duration) - crossfade
-    # etc.
-
-    current_output_duration = durations[0]
+    offsets, _ = _xfade_offsets(durations, crossfade_duration)
 
-    for i in range(n - 1):
-        offset = current_output_duration - crossfade_duration
-        if offset < 0:
-            offset = 0
-
-        if i == 0:
-            # First xfade/acrossfade: combine inputs 0 and 1
-            video_filters.append(
-                f"[0:v][1:v]xfade=transition=fade:duration={crossfade_duration}:offset={offset:.3f}[v{i}]"
-            )
-            audio_filters.append(
-                f"[0:a][1:a]acrossfade=d={crossfade_duration}:c1=tri:c2=tri[a{i}]"
-            )
-        else:
-            # Chain from previous result with next input
-            video_filters.append(
-                f"[v{i-1}][{i+1}:v]xfade=transition=fade:duration={crossfade_duration}:offset={offset:.3f}[v{i}]"
-            )
-            audio_filters.append(
-                f"[a{i-1}][{i+1}:a]acrossfade=d={crossfade_duration}:c1=tri:c2=tri[a{i}]"
-            )
-
-        # Update output duration: previous output + next segment - crossfade overlap
-        current_output_duration = current_output_duration + durations[i + 1] - crossfade_duration
+    for i, offset in enumerate(offsets):
+        # First xfade combines inputs 0 and 1, later ones chain from the previous result
+        left_v = "[vn0]" if i == 0 else f"[v{i-1}]"
+        left_a = "[an0]" if i == 0 else f"[a{i-1}]"
+        video_filters.append(
+            f"{left_v}[vn{i+1}]xfade=transition=fade:duration={crossfade_duration}:offset={offset:.3f}[v{i}]"
+        )
+        audio_filters.append(
+            f"{left_a}[an{i+1}]acrossfade=d={crossfade_duration}:c1=tri:c2=tri[a{i}]"
+        )
 
-    # Combine all filters (video first, then audio)
-    filter_complex = ";".join(video_filters + audio_filters)
+    # Combine all filters (normalization, then video, then audio)
+    filter_complex = ";".join(norm_filters + video_filters + audio_filters)
 
     # Final output labels
     final_video = f"[v{n-2}]"
     final_audio = f"[a{n-2}]"
 
     # Build full command
-    enc_params = _get_encoding_params()
+    enc_params = _get_encoding_params(intermediate=intermediate)
     cmd = ["ffmpeg", "-y"] + inputs + [
         "-filter_complex", filter_complex,
         "-map", final_video,
         "-map", final_audio,
-        "-vcodec", enc_params.get("vcodec", "libx264"),
-        "-acodec", enc_params.get("acodec", "aac"),
-        "-pix_fmt", enc_params.get("pix_fmt", "yuv420p"),
-        "-movflags", "+faststart",
+        *_encoding_args(enc_params),
+        "-ar", "48000",
+        output_path,
     ]
 
-    # Add video-specific encoding params
-    if "crf" in enc_params:
-        cmd.extend(["-crf", str(enc_params["crf"])])
-    elif "video_bitrate" in enc_params:
-        cmd.extend(["-b:v", enc_params["video_bitrate"]])
-
-    cmd.append(output_path)
-
     print(f"[Render] Running xfade command with {n} inputs...")
     print(f"[Render] Filter complex: {filter_complex[:300]}...")
     result = subprocess.run(cmd, capture_output=True, text=True)
@@ -677,15 +1404,314 @@ def _concatenate_multiple_with_xfade(
         raise RuntimeError(f"FFmpeg xfade failed: {result.stderr[:500]}")
 
 
-def _concatenate_simple(segment_files: list[str], output_path: str) -> None:
-    """Simple concatenation fallback using concat demuxer."""
+def _normalize_streams(video, audio, duration: float):
+    """Normalize ffmpeg-python streams to 1920x1080 30fps yuv420p / 48kHz stereo.
+
+    Args:
+        video: Video stream
+        audio: Audio stream, or None to substitute silence
+        duration: Duration of the input in seconds (length of the silence)
+
+    Returns:
+        Tuple of (video, audio) streams with timestamps starting at zero
+    """
+    video = (
+        video
+        .filter("scale", 1920, 1080, force_original_aspect_ratio="decrease")
+        .filter("pad", 1920, 1080, "(ow-iw)/2", "(oh-ih)/2")
+        .filter("fps", fps=30)
+        .filter("format", "yuv420p")
+        .filter("setpts", "PTS-STARTPTS")
+    )
+
+    if audio is not None:
+        audio = audio.filter("aresample", 48000)
+    else:
+        audio = ffmpeg.input("anullsrc=r=48000:cl=stereo", f="lavfi", t=f"{duration:.3f}").audio
+    audio = (
+        audio
+        .filter("aformat", sample_fmts="fltp", channel_layouts="stereo")
+        .filter("asetpts", "PTS-STARTPTS")
+    )
+    return video, audio
+
+
+def _xfade_streams(videos: list, audios: list, durations: list[float], crossfade_duration: float):
+    """Chain xfade / acrossfade over normalized streams.
+
+    Uses the same offsets as _concatenate_multiple_with_xfade.
+
+    Returns:
+        Tuple of (video, audio, total duration in seconds)
+    """
+    offsets, total_duration = _xfade_offsets(durations, crossfade_duration)
+    video = videos[0]
+    audio = audios[0]
+    for i, offset in enumerate(offsets, start=1):
+        video = ffmpeg.filter(
+            [video, videos[i]], "xfade",
+            transition="fade", duration=crossfade_duration, offset=f"{offset:.3f}",
+        )
+        audio = ffmpeg.filter([audio, audios[i]], "acrossfade", d=crossfade_duration, c1="tri", c2="tri")
+    return video, audio, total_duration
+
+
+def _splice_ad_streams(
+    video,
+    audio,
+    duration: float,
+    ads: list[dict],
+    crossfade_duration: float = 0.5,
+):
+    """Splice ads into an in-graph timeline, as insert_ads_into_video does on files.
+
+    The timeline is split at each ad's timestamp_ms and the (silent,
+    normalized) ads are joined in with the shared xfade chain.
+
+    Args:
+        video: Timeline video stream
+        audio: Timeline audio stream
+        duration: Timeline duration in seconds
+        ads: List of ad dicts with timestamp_ms and video_path
+        crossfade_duration: Duration of crossfade transitions in seconds
+
+    Returns:
+        Tuple of (video, audio, duration in seconds) of the spliced timeline
+    """
+    # Same plan as insert_ads_into_video: (start, end) timeline parts and ad paths
+    plan = []
+    current_pos = 0
+    for ad in sorted(ads, key=lambda a: a["timestamp_ms"]):
+        insert_time = ad["timestamp_ms"] / 1000
+        if insert_time >= duration:
+            continue
+        if insert_time > current_pos:
+            plan.append((current_pos, insert_time))
+        ad_path = ad.get("video_path")
+        if ad_path and os.path.exists(ad_path):
+            plan.append(ad_path)
+        current_pos = insert_time
+    if current_pos < duration:
+        plan.append((current_pos, duration))
+
+    windows = [part for part in plan if isinstance(part, tuple)]
+    if len(plan) == len(windows):
+        return video, audio, duration
+    video_parts = video.filter_multi_output("split", len(windows))
+    audio_parts = audio.filter_multi_output("asplit", len(windows))
+
+    videos = []
+    audios = []
+    durations = []
+    window_idx = 0
+    for part in plan:
+        if isinstance(part, tuple):
+            start, end = part
+            videos.append(
+                video_parts.stream(window_idx)
+                .filter("trim", start=f"{start:.3f}", end=f"{end:.3f}")
+                .filter("setpts", "PTS-STARTPTS")
+            )
+            audios.append(
+                audio_parts.stream(window_idx)
+                .filter("atrim", start=f"{start:.3f}", end=f"{end:.3f}")
+                .filter("asetpts", "PTS-STARTPTS")
+            )
+            durations.append(end - start)
+            window_idx += 1
+        else:
+            # Normalized ads are video-only in the staged path; keep them silent here too
+            ad_duration = _probe_media(part)["duration"]
+            ad_video, ad_audio = _normalize_streams(ffmpeg.input(part).video, None, ad_duration)
+            videos.append(ad_video)
+            audios.append(ad_audio)
+            durations.append(ad_duration)
+
+    return _xfade_streams(videos, audios, durations, crossfade_duration)
+
+
+def _render_fused(
+    segment_files: list[str],
+    output_path: str,
+    crossfade_duration: float,
+    zoom_plan: list[tuple[int, int, float, float, float]] | None = None,
+    sponsor_windows: dict[str, list[float]] | None = None,
+    music_path: str | None = None,
+    event_type: str = "sports",
+    ads: list[dict] | None = None,
+) -> None:
+    """Render zooms, crossfades, ads, sponsor overlays and music in one ffmpeg pass.
+
+    Builds the same graph as the staged path (apply_zooms_to_segments ->
+    concatenate_with_crossfades -> insert_ads_into_video ->
+    add_sponsor_overlays -> mix_audio) as a single filter_complex, so the
+    timeline is decoded and encoded once instead of once per stage.
+
+    Args:
+        segment_files: Extracted segment file paths (at least 2)
+        output_path: Path to write the final video
+        crossfade_duration: Duration of each crossfade in seconds
+        zoom_plan: Zooms from _plan_zooms
+        sponsor_windows: Overlay start times by text from _sponsor_overlay_windows
+        music_path: Optional music file path
+        event_type: Event type for mixing profile
+        ads: Optional generated ads with video_path and timestamp_ms
+    """
+    zooms_by_file: dict[int, list[tuple[float, float]]] = {}
+    for _, file_idx, _, zoom_duration, zoom_factor in zoom_plan or []:
+        zooms_by_file.setdefault(file_idx, []).append((zoom_duration, zoom_factor))
+
+    hwaccel = _get_hwaccel_input_kwargs()
+    videos = []
+    audios = []
+    durations = []
+    for i, path in enumerate(segment_files):
+        info = _probe_media(path)
+        duration = info["duration"]
+        source = ffmpeg.input(path, **hwaccel)
+
+        video = source.video
+        zoom_size, zoom_fps = _zoompan_geometry(info)
+        if i in zooms_by_file and info["fps"] and info["fps"] > zoom_fps:
+            video = video.filter("fps", fps=zoom_fps)
+        for zoom_duration, zoom_factor in zooms_by_file.get(i, []):
+            video = video.filter(
+                "zoompan",
+                z=_ken_burns_zoom_expr(zoom_fps, zoom_duration, zoom_factor),
+                d=1,
+                x="iw/2-(iw/zoom/2)",
+                y="ih/2-(ih/zoom/2)",
+                s=zoom_size,
+                fps=zoom_fps,
+            )
+        video, audio = _normalize_streams(video, source.audio if info["has_audio"] else None, duration)
+        videos.append(video)
+        audios.append(audio)
+        durations.append(duration)
+
+    video, audio, total_duration = _xfade_streams(videos, audios, durations, crossfade_duration)
+    if ads:
+        video, audio, total_duration = _splice_ad_streams(video, audio, total_duration, ads)
+
+    if sponsor_windows:
+        video = _apply_sponsor_drawtext(video, sponsor_windows)
+    if music_path:
+        audio = _mix_music_into(audio, music_path, total_duration, event_type)
+
+    print(f"[Render] Running fused render with {len(segment_files)} inputs "
+          f"({len(zoom_plan or [])} zooms, {len(ads or [])} ads, overlays: {'yes' if sponsor_windows else 'no'}, "
+          f"music: {'yes' if music_path else 'no'})...")
+    (
+        ffmpeg
+        .output(video, audio, output_path, ar=48000, **_get_encoding_params())
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def _streams_compatible(segment_files: list[str]) -> bool:
+    """Check whether segments share codecs, resolution, frame rate and audio format.
+
+    Compatible segments can be joined by the concat demuxer with stream copy.
+    """
+    keys = {
+        (p["vcodec"], p["width"], p["height"], p["fps"], p["acodec"], p["sample_rate"])
+        for p in (_probe_media(f) for f in segment_files)
+    }
+    return len(keys) == 1
+
+
+def _sources_stream_compatible(video_paths: list[str]) -> bool:
+    """Check whether source videos can be joined by the concat demuxer with stream copy."""
+    try:
+        return _streams_compatible(sorted(set(video_paths)))
+    except Exception as e:
+        print(f"[Render] Could not probe sources for direct concat: {e}")
+        return False
+
+
+def _windows_start_on_keyframes(tasks: list[dict]) -> bool:
+    """Check that every window can be stream-copied from its source as-is.
+
+    A copied window that doesn't start on a keyframe pulls in frames back to
+    the previous one, shifting the cut and every later segment, so direct
+    concat needs known keyframes and a copyable start for each window.
+    """
+    try:
+        for task in tasks:
+            info = _get_stream_info(task["video_path"])
+            if info["keyframes"] is None or not _can_stream_copy(info, task["start_sec"]):
+                return False
+        return True
+    except Exception as e:
+        print(f"[Render] Could not check keyframes for direct concat: {e}")
+        return False
+
+
+def _concat_list_entry(path: str) -> str:
+    """Concat demuxer 'file' line, with single quotes in the path escaped."""
+    escaped = path.replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+
+def _concatenate_source_windows(tasks: list[dict], output_path: str) -> None:
+    """Stream-copy segment windows straight from the source videos.
+
+    Writes one concat demuxer list with an inpoint/outpoint per segment and
+    runs a single ffmpeg process; no per-segment files are produced. Callers
+    must check _windows_start_on_keyframes first so cuts land where asked.
+
+    Args:
+        tasks: Extraction task dicts (video_path, start_sec, duration_sec), in order
+        output_path: Path to write concatenated output
+    """
+    concat_list_path = output_path + ".txt"
+    with open(concat_list_path, "w") as f:
+        for task in tasks:
+            f.write(_concat_list_entry(task["video_path"]))
+            f.write(f"inpoint {task['start_sec']:.3f}\n")
+            f.write(f"outpoint {task['start_sec'] + task['duration_sec']:.3f}\n")
+
+    try:
+        _run_ffmpeg([
+            "-f", "concat", "-safe", "0", "-i", concat_list_path,
+            "-c", "copy", "-movflags", "+faststart",
+            output_path,
+        ])
+    finally:
+        if os.path.exists(concat_list_path):
+            os.remove(concat_list_path)
+
+
+def _concatenate_normalized(segment_files: list[str], output_path: str) -> None:
+    """Normalize segments, then join them with the concat demuxer.
+
+    Normalized segments share resolution, frame rate, pixel format, audio
+    format and encoder settings, so they are stream-copied; the join only
+    re-encodes if a segment could not be normalized.
+    """
+    normalized = _normalize_segments(segment_files)
+    _concatenate_simple(normalized, output_path, copy=_streams_compatible(normalized))
+
+
+def _concatenate_simple(segment_files: list[str], output_path: str, copy: bool = False) -> None:
+    """Simple concatenation using concat demuxer.
+
+    Args:
+        segment_files: List of paths to segment files
+        output_path: Path to write concatenated output
+        copy: Stream-copy instead of re-encoding (segments must be compatible)
+    """
     concat_list_path = output_path + ".txt"
     with open(concat_list_path, "w") as f:
         for segment in segment_files:
-            f.write(f"file '{segment}'\n")
+            f.write(_concat_list_entry(segment))
 
     try:
-        enc_params = _get_encoding_params()
+        if copy:
+            enc_params = {"vcodec": "copy", "acodec": "copy", "movflags": "+faststart"}
+        else:
+            enc_params = _get_encoding_params()
         (
             ffmpeg
             .input(concat_list_path, format="concat", safe=0)
@@ -704,6 +1730,7 @@ def apply_zooms_to_segments(
     zooms: list[dict],
     tmpdir: str,
     original_to_extracted: dict[int, int] | None = None,
+    intermediate: bool = False,
 ) -> list[str]:
     """Apply Ken Burns zoom effects to segments containing zoom moments.
 
@@ -713,6 +1740,8 @@ def apply_zooms_to_segments(
         zooms: Zoom moments from timeline
         tmpdir: Temp directory for intermediate files
         original_to_extracted: Mapping from original segment index to extracted file index
+        intermediate: Encode zoomed segments with the faster intermediate
+            settings (the concatenation re-encodes them)
 
     Returns:
         Updated list of segment files (some may be replaced with zoomed versions)
@@ -722,6 +1751,49 @@ def apply_zooms_to_segments(
 
     result_files = list(segment_files)
 
+    for seg_idx, file_idx, segment_offset, zoom_duration, zoom_factor in _plan_zooms(
+        len(result_files), segments, zooms, original_to_extracted
+    ):
+        # Apply zoom to this segment
+        zoomed_path = os.path.join(tmpdir, f"zoomed_{seg_idx:04d}.mp4")
+
+        try:
+            apply_ken_burns_zoom(
+                input_path=result_files[file_idx],
+                output_path=zoomed_path,
+                start_sec=segment_offset,
+                duration_sec=zoom_duration,
+                zoom_factor=zoom_factor,
+                intermediate=intermediate,
+            )
+            result_files[file_idx] = zoomed_path
+            print(f"[Render] Applied zoom to segment {seg_idx} (file idx {file_idx})")
+        except Exception as e:
+            print(f"[Render] Failed to apply zoom to segment {seg_idx}: {e}")
+
+    return result_files
+
+
+def _plan_zooms(
+    file_count: int,
+    segments: list[dict],
+    zooms: list[dict],
+    original_to_extracted: dict[int, int] | None = None,
+) -> list[tuple[int, int, float, float, float]]:
+    """Resolve zoom moments to the segment files they apply to.
+
+    Args:
+        file_count: Number of segment files
+        segments: Timeline segments
+        zooms: Zoom moments from timeline
+        original_to_extracted: Mapping from original segment index to extracted file index
+
+    Returns:
+        List of (segment index, file index, offset within segment in seconds,
+        zoom duration in seconds, zoom factor), in zoom order
+    """
+    plan = []
+
     for zoom in zooms:
         # Find which segment contains this zoom
         zoom_start = zoom["start_ms"]
@@ -738,32 +1810,74 @@ def apply_zooms_to_segments(
                     file_idx = original_to_extracted[seg_idx]
                 else:
                     file_idx = seg_idx
-                    if file_idx >= len(result_files):
+                    if file_idx >= file_count:
                         print(f"[Render] Zoom target index {file_idx} out of range, skipping zoom")
                         break
 
-                # Apply zoom to this segment
-                zoomed_path = os.path.join(tmpdir, f"zoomed_{seg_idx:04d}.mp4")
-
                 # Time within segment
                 segment_offset = (zoom_start - segment["start_ms"]) / 1000
+                plan.append((seg_idx, file_idx, segment_offset, zoom_duration, zoom_factor))
+                break
 
-                try:
-                    apply_ken_burns_zoom(
-                        input_path=result_files[file_idx],
-                        output_path=zoomed_path,
-                        start_sec=segment_offset,
-                        duration_sec=zoom_duration,
-                        zoom_factor=zoom_factor,
-                    )
-                    result_files[file_idx] = zoomed_path
-                    print(f"[Render] Applied zoom to segment {seg_idx} (file idx {file_idx})")
-                except Exception as e:
-                    print(f"[Render] Failed to apply zoom to segment {seg_idx}: {e}")
+    return plan
 
-                break
 
-    return result_files
+# zoompan renders every frame at its output size and rate, and everything
+# downstream is normalized to 1080p30, so never zoom above that
+ZOOM_MAX_WIDTH = 1920
+ZOOM_MAX_HEIGHT = 1080
+ZOOM_MAX_FPS = 30
+
+
+def _zoompan_geometry(info: dict) -> tuple[str, float]:
+    """Pick the zoompan output size and frame rate for a segment.
+
+    Uses the segment's own resolution (scaled down to fit 1920x1080) and
+    frame rate (capped at 30fps), so 720p sources aren't upscaled and 4K or
+    60fps sources aren't zoomed at a cost the final output throws away.
+    zoompan emits one frame per input frame, so callers drop frames with an
+    fps filter first when the returned rate is below the source's.
+
+    Args:
+        info: Probe result for the segment (see _probe_media)
+
+    Returns:
+        Tuple of (zoompan s value, zoompan fps)
+    """
+    fps = min(info["fps"] or ZOOM_MAX_FPS, ZOOM_MAX_FPS)
+    width, height = info["width"], info["height"]
+    if not width or not height:
+        return f"{ZOOM_MAX_WIDTH}x{ZOOM_MAX_HEIGHT}", fps
+    factor = min(1.0, ZOOM_MAX_WIDTH / width, ZOOM_MAX_HEIGHT / height)
+    width = max(2, int(width * factor) // 2 * 2)
+    height = max(2, int(height * factor) // 2 * 2)
+    return f"{width}x{height}", fps
+
+
+def _ken_burns_zoom_expr(fps: float, duration_sec: float, zoom_factor: float) -> str:
+    """Build the zoompan z expression for an ease-in, hold, ease-out zoom.
+
+    Args:
+        fps: Frame rate the zoompan filter runs at
+        duration_sec: Duration of zoom effect
+        zoom_factor: Maximum zoom level (e.g., 1.5 = 150%)
+
+    Returns:
+        zoompan z expression
+    """
+    # Calculate frames
+    ease_frames = max(1, int(0.3 * fps))
+    hold_frames = max(1, int((duration_sec - 0.6) * fps))
+    ease_out_start = ease_frames + hold_frames
+
+    # Zoom curve with ease-in, hold, ease-out as one branchless expression:
+    # ramps up by k per frame until ease_frames, holds at zoom_factor, then
+    # ramps down by k per frame after ease_out_start
+    k = (zoom_factor - 1) / ease_frames
+    return (
+        f"min({zoom_factor},"
+        f"1+{k:.6f}*min(on,{ease_frames})-{k:.6f}*max(0,on-{ease_out_start}))"
+    )
 
 
 def apply_ken_burns_zoom(
@@ -772,6 +1886,7 @@ def apply_ken_burns_zoom(
     start_sec: float,
     duration_sec: float,
     zoom_factor: float,
+    intermediate: bool = False,
 ) -> None:
     """Apply Ken Burns zoom effect using FFmpeg zoompan filter.
 
@@ -781,111 +1896,218 @@ def apply_ken_burns_zoom(
         start_sec: When to start zoom within video (currently applies to entire segment)
         duration_sec: Duration of zoom effect
         zoom_factor: Maximum zoom level (e.g., 1.5 = 150%)
+        intermediate: Use the faster intermediate encoder settings
     """
     # Get input properties
-    probe = ffmpeg.probe(input_path)
-    video_streams = [s for s in probe["streams"] if s["codec_type"] == "video"]
-    if not video_streams:
+    info = _probe_media(input_path)
+    if not info["has_video"]:
         raise ValueError(f"No video stream found in {input_path}")
+    size, fps = _zoompan_geometry(info)
 
-    video_info = video_streams[0]
-    # Parse frame rate (handles "30/1" or "30000/1001" format)
-    fps_parts = video_info["r_frame_rate"].split("/")
-    fps = int(fps_parts[0]) / int(fps_parts[1]) if len(fps_parts) == 2 else float(fps_parts[0])
-
-    # Calculate frames
-    ease_frames = int(0.3 * fps)
-    hold_frames = max(1, int((duration_sec - 0.6) * fps))
-    total_frames = ease_frames * 2 + hold_frames
-
-    # Build zoompan expression with ease-in, hold, ease-out
-    zoom_expr = (
-        f"if(lte(on,{ease_frames}),"
-        f"1+({zoom_factor - 1}/{ease_frames})*on,"
-        f"if(lte(on,{ease_frames + hold_frames}),"
-        f"{zoom_factor},"
-        f"{zoom_factor}-({zoom_factor - 1}/{ease_frames})*(on-{ease_frames + hold_frames})))"
-    )
+    zoom_expr = _ken_burns_zoom_expr(fps, duration_sec, zoom_factor)
 
     # Apply zoom with proper fps setting
-    # Note: zoompan outputs at specified fps, we match input fps
-    input_stream = ffmpeg.input(input_path)
+    # d=1 emits one output frame per input frame (zoompan otherwise repeats
+    # each input frame d times); output fps matches input fps up to 30
+    hwaccel = _get_hwaccel_input_kwargs()
+    input_stream = ffmpeg.input(input_path, **hwaccel).video
+    if info["fps"] and info["fps"] > fps:
+        input_stream = input_stream.filter("fps", fps=fps)
     (
         input_stream
         .filter("zoompan",
                 z=zoom_expr,
-                d=total_frames,
+                d=1,
                 x="iw/2-(iw/zoom/2)",
                 y="ih/2-(ih/zoom/2)",
-                s="1920x1080",
+                s=size,
                 fps=fps)
-        .output(output_path, **_get_encoding_params())
+        .output(output_path, **_get_encoding_params(intermediate=intermediate))
         .overwrite_output()
         .run(quiet=True)
     )
 
 
-def add_sponsor_overlays(
-    input_path: str,
-    output_path: str,
-    sponsor_name: str,
-    timeline: dict,
-) -> None:
-    """Add sponsor lower-third overlays at key moments.
+def _sponsor_overlay_windows(sponsor_name: str, timeline: dict) -> dict[str, list[float]]:
+    """Collect sponsor overlay start times, grouped by overlay text.
 
     Args:
-        input_path: Input video path
-        output_path: Output video path
         sponsor_name: Sponsor name to display
         timeline: Timeline with chapters for overlay placement
+
+    Returns:
+        Dict mapping overlay text to its start times in seconds
     """
     # Find moments for sponsor overlays (use chapters as trigger points)
-    chapters = timeline.get("chapters", [])
-    overlays = []
-
-    for chapter in chapters:
+    windows_by_text: dict[str, list[float]] = {}
+    for chapter in timeline.get("chapters", []):
         if chapter.get("type") == "highlight":
-            timestamp_sec = chapter["timestamp_ms"] / 1000
             text = f"{sponsor_name} HIGHLIGHT"
-            overlays.append((timestamp_sec, text))
+            windows_by_text.setdefault(text, []).append(chapter["timestamp_ms"] / 1000)
+    return windows_by_text
 
-    if not overlays:
-        # No overlays needed, just copy
-        (
-            ffmpeg
-            .input(input_path)
-            .output(output_path, vcodec="copy", acodec="copy")
-            .overwrite_output()
-            .run(quiet=True)
-        )
+
+# drawtext reads overlay text from files here instead of inline text= values;
+# files not used for this long are deleted when a new one is written
+_DRAWTEXT_DIR = os.path.join(tempfile.gettempdir(), "anchor_drawtext")
+DRAWTEXT_FILE_TTL_SEC = 24 * 3600
+
+
+def _prune_drawtext_files() -> None:
+    """Delete drawtext files unused for DRAWTEXT_FILE_TTL_SEC.
+
+    Sponsor names and product titles differ per event, so without this the
+    directory grows for as long as a worker runs.
+    """
+    cutoff = time.time() - DRAWTEXT_FILE_TTL_SEC
+    try:
+        entries = os.scandir(_DRAWTEXT_DIR)
+    except OSError:
         return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass  # Already removed by another worker
+
+
+def _drawtext_textfile(text: str) -> str:
+    """Write overlay text to a UTF-8 file for drawtext's textfile option.
+
+    Passing text= inline means every ':', quote and backslash in sponsor
+    names and product titles has to survive filtergraph escaping, and a
+    newline can't be expressed at all. Files are named by content hash, so
+    repeated overlays reuse the same file; unused ones are pruned by age.
+
+    Args:
+        text: Overlay text (may contain newlines)
+
+    Returns:
+        Path to the text file
+    """
+    data = text.encode("utf-8")
+    path = os.path.join(_DRAWTEXT_DIR, f"{hashlib.sha1(data).hexdigest()}.txt")
+    try:
+        # Reuse marks the file as recently used so pruning leaves it alone
+        os.utime(path)
+    except FileNotFoundError:
+        os.makedirs(_DRAWTEXT_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        _prune_drawtext_files()
+    return path
+
+
+def _merge_overlay_windows(timestamps: list[float], duration: float) -> list[tuple[float, float]]:
+    """Merge overlapping [start, start + duration] windows into disjoint intervals."""
+    merged: list[tuple[float, float]] = []
+    for start in sorted(timestamps):
+        end = start + duration
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
 
-    # Build filter for drawtext overlays
-    video = ffmpeg.input(input_path)
 
-    for timestamp, text in overlays:
-        # Show for 4 seconds
+def _apply_sponsor_drawtext(video, windows_by_text: dict[str, list[float]]):
+    """Add one drawtext per unique text, enabled over the sum of its windows.
+
+    Each overlay shows for 4 seconds from its start time. Overlapping
+    windows are merged first, so the enable expression evaluated on every
+    frame has one between() per disjoint interval.
+    """
+    for text, timestamps in windows_by_text.items():
+        intervals = _merge_overlay_windows(timestamps, 4)
         video = video.filter(
             "drawtext",
-            text=text,
+            textfile=_drawtext_textfile(text),
             fontsize=36,
             fontcolor="white",
             borderw=2,
             bordercolor="black",
             x="20",
             y="h-60",
-            enable=f"between(t,{timestamp},{timestamp + 4})",
+            fix_bounds=1,
+            enable="+".join(f"between(t,{start},{end})" for start, end in intervals),
         )
+    return video
 
-    enc_params = _get_encoding_params()
+
+def add_sponsor_overlays(
+    input_path: str,
+    output_path: str,
+    sponsor_name: str,
+    timeline: dict,
+    intermediate: bool = False,
+) -> None:
+    """Add sponsor lower-third overlays at key moments.
+
+    Args:
+        input_path: Input video path
+        output_path: Output video path
+        sponsor_name: Sponsor name to display
+        timeline: Timeline with chapters for overlay placement
+        intermediate: Use the faster intermediate encoder settings
+    """
+    windows_by_text = _sponsor_overlay_windows(sponsor_name, timeline)
+
+    if not windows_by_text:
+        # No overlays needed: link or copy the file instead of an ffmpeg
+        # remux (every render stage already writes +faststart MP4s)
+        _link_or_copy(input_path, output_path)
+        return
+
+    source = ffmpeg.input(input_path, **_get_hwaccel_input_kwargs())
+    video = _apply_sponsor_drawtext(source.video, windows_by_text)
+
+    # The overlay only touches video; the AAC track is copied unchanged
+    enc_params = _get_encoding_params(intermediate=intermediate)
+    enc_params["acodec"] = "copy"
     (
         ffmpeg
-        .output(video, ffmpeg.input(input_path).audio, output_path, **enc_params)
+        .output(video, source.audio, output_path, **enc_params)
         .overwrite_output()
         .run(quiet=True)
     )
 
 
+def _mix_music_into(event_audio, music_path: str, duration: float, event_type: str):
+    """Mix a music track under an event audio stream using the event's profile.
+
+    Args:
+        event_audio: ffmpeg-python audio stream of the event
+        music_path: Music file path
+        duration: Duration of the event audio in seconds (for the fade-out)
+        event_type: Event type for mixing profile
+
+    Returns:
+        Mixed ffmpeg-python audio stream
+    """
+    profile = MUSIC_MIX_PROFILES.get(event_type, MUSIC_MIX_PROFILES["sports"])
+    music_vol = profile["music_volume"]
+    event_vol = profile["event_volume"]
+
+    # Apply fades to music
+    music_audio = (
+        ffmpeg.input(music_path).audio
+        .filter("afade", t="in", d=VideoConfig.MUSIC_FADE_IN_SEC)
+        .filter("afade", t="out", d=VideoConfig.MUSIC_FADE_OUT_SEC, st=duration - VideoConfig.MUSIC_FADE_OUT_SEC)
+    )
+
+    # Mix with the profile volumes as amix weights instead of separate volume
+    # filters; halved with normalize off to keep the levels of amix's default
+    # 1/inputs scaling that the profiles were tuned against
+    return ffmpeg.filter(
+        [music_audio, event_audio], "amix",
+        inputs=2, duration="first", weights=f"{music_vol / 2} {event_vol / 2}", normalize=0,
+    )
+
+
 def mix_audio(
     video_path: str,
     music_path: str,
@@ -894,41 +2116,26 @@ def mix_audio(
 ) -> None:
     """Mix music with video audio using event-specific profile.
 
+    Only the audio is re-encoded; the video stream is copied as-is.
+
     Args:
         video_path: Input video path
         music_path: Music file path
         output_path: Output video path
         event_type: Event type for mixing profile
     """
-    profile = MUSIC_MIX_PROFILES.get(event_type, MUSIC_MIX_PROFILES["sports"])
-    music_vol = profile["music_volume"]
-    event_vol = profile["event_volume"]
-
-    # Get video duration
-    probe = ffmpeg.probe(video_path)
-    duration = float(probe["format"]["duration"])
+    # Get video duration (cached probe). The fade-out has to end with the
+    # video, not the music track, so an areverse/afade trick on the music
+    # can't replace it
+    duration = _get_video_duration(video_path)
 
+    # Every render stage writes H.264 yuv420p, so the video only needs copying
     video = ffmpeg.input(video_path)
-    music = ffmpeg.input(music_path)
-
-    # Apply volume and fades to music
-    music_audio = (
-        music.audio
-        .filter("volume", music_vol)
-        .filter("afade", t="in", d=VideoConfig.MUSIC_FADE_IN_SEC)
-        .filter("afade", t="out", d=VideoConfig.MUSIC_FADE_OUT_SEC, st=duration - VideoConfig.MUSIC_FADE_OUT_SEC)
-    )
-
-    # Apply volume to event audio
-    event_audio = video.audio.filter("volume", event_vol)
-
-    # Mix
-    mixed = ffmpeg.filter([music_audio, event_audio], "amix", inputs=2, duration="first")
+    mixed = _mix_music_into(video.audio, music_path, duration, event_type)
 
-    enc_params = _get_encoding_params()
     (
         ffmpeg
-        .output(video.video, mixed, output_path, **enc_params)
+        .output(video.video, mixed, output_path, vcodec="copy", acodec="aac", movflags="+faststart")
         .overwrite_output()
         .run(quiet=True)
     )
@@ -951,64 +2158,73 @@ def render_highlight_reel(
         vibe: Vibe for styling
     """
     print(f"[Render:Reel] ========== RENDERING HIGHLIGHT REEL ==========")
-    print(f"[Render:Reel] Title: '{title}'")
-    print(f"[Render:Reel] Vibe: {vibe}")
-    print(f"[Render:Reel] Clips: {len(clips)}")
-    print(f"[Render:Reel] Music: {'Yes' if music_path else 'No'}")
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Generate title card
-        print(f"[Render:Reel] Generating title card...")
-        title_path = os.path.join(tmpdir, "title.mp4")
-        generate_title_card(title, vibe, title_path)
-        print(f"[Render:Reel] Title card generated")
-
-        # Extract clips
-        print(f"[Render:Reel] ---------- EXTRACTING CLIPS ----------")
-        clip_files = [title_path]
-        for i, clip in enumerate(clips):
-            clip_path = os.path.join(tmpdir, f"clip_{i:04d}.mp4")
-            start = clip["start"]
-            duration = clip["end"] - clip["start"]
-
-            print(f"[Render:Reel] Extracting clip {i + 1}/{len(clips)}: {start:.1f}s - {clip['end']:.1f}s ({duration:.1f}s)")
-            enc_params = _get_encoding_params()
-            (
-                ffmpeg
-                .input(clip["path"], ss=start, t=duration)
-                .output(clip_path, **enc_params)
-                .overwrite_output()
-                .run(quiet=True)
-            )
-            clip_files.append(clip_path)
-            print(f"[Render:Reel] Clip {i + 1} extracted")
+    print(f"[Render:Reel] Title: '{title}', vibe: {vibe}, clips: {len(clips)}, "
+          f"music: {'Yes' if music_path else 'No'}")
+
+    # Title card, clips, crossfades and music as one filter graph: each clip
+    # is decoded once from its source window and the reel is encoded once
+    title_duration = 2.0
+    videos = [_title_card_stream(title, vibe, title_duration)]
+    audios = [None]
+    durations = [title_duration]
+
+    for clip in clips:
+        duration = clip["end"] - clip["start"]
+        source = ffmpeg.input(clip["path"], ss=clip["start"], t=duration, **_get_hwaccel_input_kwargs())
+        videos.append(source.video)
+        audios.append(source.audio if _probe_media(clip["path"])["has_audio"] else None)
+        durations.append(duration)
+
+    streams = [_normalize_streams(v, a, d) for v, a, d in zip(videos, audios, durations)]
+    video, audio, total_duration = _xfade_streams(
+        [v for v, _ in streams], [a for _, a in streams], durations, crossfade_duration=0.5
+    )
 
-        # Concatenate with crossfades
-        print(f"[Render:Reel] ---------- CONCATENATING CLIPS ----------")
-        concat_path = os.path.join(tmpdir, "concat.mp4")
-        print(f"[Render:Reel] Concatenating {len(clip_files)} clips (including title)...")
-        concatenate_with_crossfades(clip_files, concat_path, crossfade_duration=0.5)
-        print(f"[Render:Reel] Concatenation complete")
+    if music_path:
+        audio = _mix_music_into(audio, music_path, total_duration, "sports")
 
-        # Add music if provided
-        if music_path:
-            print(f"[Render:Reel] ---------- ADDING MUSIC ----------")
-            print(f"[Render:Reel] Mixing music...")
-            mix_audio(concat_path, music_path, output_path, "sports")
-            print(f"[Render:Reel] Music added")
-        else:
-            print(f"[Render:Reel] Copying to output (no music)...")
-            (
-                ffmpeg
-                .input(concat_path)
-                .output(output_path, vcodec="copy", acodec="copy")
-                .overwrite_output()
-                .run(quiet=True)
-            )
+    print(f"[Render:Reel] Rendering {len(durations)} clips (including title, "
+          f"{total_duration:.1f}s total) in one pass...")
+    (
+        ffmpeg
+        .output(video, audio, output_path, ar=48000, **_get_encoding_params())
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+    output_size = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"[Render:Reel] Output size: {output_size:.1f} MB")
+    print(f"[Render:Reel] ========== HIGHLIGHT REEL COMPLETE ==========")
 
-        output_size = os.path.getsize(output_path) / (1024 * 1024)
-        print(f"[Render:Reel] Output size: {output_size:.1f} MB")
-        print(f"[Render:Reel] ========== HIGHLIGHT REEL COMPLETE ==========")
+
+def _title_card_stream(title: str, vibe: str, duration: float, fps: int = 30):
+    """Build the title card as an ffmpeg-python lavfi video stream.
+
+    The text is drawn onto a single frame, which the loop filter then
+    repeats for the whole duration, so drawtext runs once instead of
+    once per frame.
+    """
+    vibe_colors = {
+        "high_energy": "#FF5722",
+        "emotional": "#3F51B5",
+        "calm": "#4CAF50",
+    }
+    bg_color = vibe_colors.get(vibe, "#333333")
+
+    frames = max(1, round(duration * fps))
+    return (
+        ffmpeg
+        .input(f"color=c={bg_color}:s=1920x1080:r={fps}:d={1 / fps:.6f}", f="lavfi")
+        .filter("trim", end_frame=1)
+        .filter("drawtext",
+                textfile=_drawtext_textfile(title),
+                fontsize=72,
+                fontcolor="white",
+                x="(w-text_w)/2",
+                y="(h-text_h)/2")
+        .filter("loop", loop=frames - 1, size=1)
+        .filter("setpts", f"N/{fps}/TB")
+    )
 
 
 def generate_title_card(
@@ -1025,26 +2241,15 @@ def generate_title_card(
         output_path: Output video path
         duration: Duration in seconds
     """
-    vibe_colors = {
-        "high_energy": "#FF5722",
-        "emotional": "#3F51B5",
-        "calm": "#4CAF50",
-    }
-    bg_color = vibe_colors.get(vibe, "#333333")
-
     # Use FFmpeg to generate title card
     enc_params = _get_encoding_params()
     # Remove acodec for title card (no audio source)
     enc_params_no_audio = {k: v for k, v in enc_params.items() if k != "acodec"}
+    if enc_params_no_audio["vcodec"] == "libx264":
+        # Identical frames encode almost entirely as skip blocks
+        enc_params_no_audio["tune"] = "stillimage"
     (
-        ffmpeg
-        .input(f"color=c={bg_color}:s=1920x1080:d={duration}", f="lavfi")
-        .filter("drawtext",
-                text=title,
-                fontsize=72,
-                fontcolor="white",
-                x="(w-text_w)/2",
-                y="(h-text_h)/2")
+        _title_card_stream(title, vibe, duration)
         .output(output_path, t=duration, **enc_params_no_audio)
         .overwrite_output()
         .run(quiet=True)
@@ -1057,41 +2262,47 @@ def insert_ads_into_video(
     output_path: str,
     tmpdir: str,
     crossfade_duration: float = 0.5,
+    intermediate: bool = False,
 ) -> None:
     """Insert generated ads into video at specified timestamps with crossfade transitions.
 
-    This creates a seamless TV commercial break feel by:
-    1. Splitting the video at each ad insertion point
-    2. Inserting the ad with xfade transitions on both sides
-    3. Reassembling the final video
+    This creates a seamless TV commercial break feel by joining the video
+    parts and ads with xfade / acrossfade transitions on both sides of each
+    ad. With crossfades this is one ffmpeg invocation that reads every part
+    straight from its source (_insert_ads_single_pass). Without crossfades,
+    or if that pass fails, the parts and normalized ads are written out in
+    parallel and joined by concatenate_with_crossfades.
 
     Args:
         video_path: Path to the main video
         ads: List of ad dicts with timestamp_ms, video_path, duration_ms
         output_path: Path to write output video
-        tmpdir: Temp directory for intermediate files
+        tmpdir: Temp directory for intermediate files; allocate it under
+            _best_tmp_root() so the split parts stay on tmpfs when they fit
         crossfade_duration: Duration of crossfade transitions in seconds
+        intermediate: Encode the output with the faster intermediate
+            settings (a later stage re-encodes it)
     """
     if not ads:
-        # No ads to insert, just copy
-        (
-            ffmpeg
-            .input(video_path)
-            .output(output_path, vcodec="copy", acodec="copy")
-            .overwrite_output()
-            .run(quiet=True)
-        )
+        # No ads to insert, just link or copy the file (no remux)
+        _link_or_copy(video_path, output_path)
         return
 
     # Sort ads by timestamp
     sorted_ads = sorted(ads, key=lambda a: a["timestamp_ms"])
 
     # Get video duration
-    probe = ffmpeg.probe(video_path)
-    video_duration = float(probe["format"]["duration"])
+    video_duration = _get_video_duration(video_path)
+
+    # Video parts cut on a keyframe of an h264/aac source are stream-copied;
+    # the rest are re-encoded
+    stream_info = _get_stream_info(video_path)
 
-    # Build list of all segments (video parts + ads)
+    # Plan all segments (video parts + ads) in order, then run them in
+    # parallel: every part is an independent encode or copy
     all_segments = []
+    video_tasks = []  # extraction tasks for the video parts
+    ad_jobs = []  # (ad path, normalized path, expected duration in seconds)
     current_pos = 0
 
     for i, ad in enumerate(sorted_ads):
@@ -1104,35 +2315,33 @@ def insert_ads_into_video(
         # Extract segment before this ad
         if insert_time > current_pos:
             segment_path = os.path.join(tmpdir, f"pre_ad_{i:02d}.mp4")
-            segment_duration = insert_time - current_pos
-
-            try:
-                enc_params = _get_encoding_params()
-                (
-                    ffmpeg
-                    .input(video_path, ss=current_pos, t=segment_duration)
-                    .output(segment_path, **enc_params)
-                    .overwrite_output()
-                    .run(quiet=True)
-                )
-                all_segments.append({
-                    "path": segment_path,
-                    "type": "video",
-                })
-            except ffmpeg.Error as e:
-                print(f"Error extracting pre-ad segment {i}: {e}")
+            video_tasks.append({
+                "index": len(video_tasks),
+                "video_path": video_path,
+                "segment_path": segment_path,
+                "start_sec": current_pos,
+                "duration_sec": insert_time - current_pos,
+                "stream_copy": _can_stream_copy(stream_info, current_pos),
+            })
+            all_segments.append({
+                "path": segment_path,
+                "type": "video",
+                "source": video_path,
+                "start_sec": current_pos,
+                "duration_sec": insert_time - current_pos,
+            })
 
         # Add the ad
         ad_path = ad.get("video_path")
         if ad_path and os.path.exists(ad_path):
             # Normalize ad video to match main video specs
             normalized_ad_path = os.path.join(tmpdir, f"ad_{i:02d}_normalized.mp4")
-            normalize_ad_video(ad_path, normalized_ad_path)
-
+            ad_jobs.append((ad_path, normalized_ad_path, ad.get("duration_ms", 8000) / 1000))
             all_segments.append({
                 "path": normalized_ad_path,
                 "type": "ad",
                 "product_title": ad.get("product_title", ""),
+                "source": ad_path,
             })
 
         # Update position (skip over the ad duration in the timeline)
@@ -1141,28 +2350,181 @@ def insert_ads_into_video(
     # Extract remaining video after last ad
     if current_pos < video_duration:
         final_segment_path = os.path.join(tmpdir, "post_ads.mp4")
+        video_tasks.append({
+            "index": len(video_tasks),
+            "video_path": video_path,
+            "segment_path": final_segment_path,
+            "start_sec": current_pos,
+            "duration_sec": video_duration - current_pos,
+            "stream_copy": _can_stream_copy(stream_info, current_pos),
+        })
+        all_segments.append({
+            "path": final_segment_path,
+            "type": "video",
+            "source": video_path,
+            "start_sec": current_pos,
+            "duration_sec": video_duration - current_pos,
+        })
+
+    if not all_segments:
+        raise ValueError("No segments created for ad insertion")
+
+    if crossfade_duration > 0 and len(all_segments) > 1:
         try:
-            enc_params = _get_encoding_params()
-            (
-                ffmpeg
-                .input(video_path, ss=current_pos)
-                .output(final_segment_path, **enc_params)
-                .overwrite_output()
-                .run(quiet=True)
-            )
-            all_segments.append({
-                "path": final_segment_path,
-                "type": "video",
-            })
-        except ffmpeg.Error as e:
-            print(f"Error extracting final segment: {e}")
+            _insert_ads_single_pass(all_segments, output_path, crossfade_duration, intermediate)
+            return
+        except Exception as e:
+            print(f"[Render] Single-pass ad insertion failed, falling back to per-part encodes: "
+                  f"{_ffmpeg_error_summary(e)}")
+
+    # Video parts that need re-encoding all come from the same input, so
+    # they are cut in one ffmpeg process that decodes the source once
+    copy_tasks = [task for task in video_tasks if task["stream_copy"]]
+    reencode_tasks = [task for task in video_tasks if not task["stream_copy"]]
+    reencode_count = len(ad_jobs) + (1 if reencode_tasks else 0)
+    max_reencodes = max(1, min(_max_parallel_reencodes(), reencode_count))
+    threads_per_encode = max(1, CPU_COUNT // max_reencodes)
+    max_workers = max(1, min(MAX_PARALLEL_COPIES, len(copy_tasks) + reencode_count))
+    # Parts and ads are re-encoded by the crossfade concatenation below
+    parts_reencoded = crossfade_duration > 0 and len(all_segments) > 1
+    for task in video_tasks:
+        task["threads"] = threads_per_encode
+        task["intermediate"] = parts_reencoded
+
+    # Longest encodes first, so ad normalization overlaps the long segment
+    # encodes instead of trailing after them; stream copies are near-free.
+    # Segment jobs return lists of (index, path, error) results
+    jobs = [
+        (duration, lambda a=ad_path, n=normalized_path: normalize_ad_video(
+            a, n, threads=threads_per_encode, intermediate=parts_reencoded
+        ))
+        for ad_path, normalized_path, duration in ad_jobs
+    ]
+    if reencode_tasks:
+        jobs.append((
+            sum(task["duration_sec"] for task in reencode_tasks),
+            lambda: _extract_windows_single_pass(video_path, reencode_tasks, threads_per_encode),
+        ))
+    jobs.extend(
+        (task["duration_sec"] * 0.01, lambda t=task: [_extract_single_segment(t, _REENCODE_SLOTS)])
+        for task in copy_tasks
+    )
+    order = sorted(range(len(jobs)), key=lambda j: jobs[j][0], reverse=True)
+
+    failed_paths = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures: list = [None] * len(jobs)
+        for j in order:
+            futures[j] = executor.submit(jobs[j][1])
+        for future in futures[:len(ad_jobs)]:
+            future.result()
+        for future in futures[len(ad_jobs):]:
+            for index, segment_path, error in future.result():
+                if segment_path is None:
+                    print(f"Error extracting segment {video_tasks[index]['segment_path']}: {error}")
+                    failed_paths.add(video_tasks[index]["segment_path"])
+
+    all_segments = [seg for seg in all_segments if seg["path"] not in failed_paths]
 
     if not all_segments:
         raise ValueError("No segments created for ad insertion")
 
     # Concatenate all segments with crossfades
     segment_paths = [s["path"] for s in all_segments]
-    concatenate_with_crossfades(segment_paths, output_path, crossfade_duration)
+    concatenate_with_crossfades(segment_paths, output_path, crossfade_duration, intermediate=intermediate)
+
+
+def _insert_ads_single_pass(
+    parts: list[dict],
+    output_path: str,
+    crossfade_duration: float,
+    intermediate: bool = False,
+) -> None:
+    """Splice ads into a video with one filter graph and a single encode.
+
+    Each video part is read straight from its source window (input-side
+    seek and duration) and each ad from its file; all of them are
+    normalized in-graph and joined by the xfade / acrossfade chain, so no
+    parts or normalized ads are written to disk.
+
+    Args:
+        parts: Planned parts in order; video parts carry source, start_sec and
+            duration_sec, ads carry source
+        output_path: Path to write output video
+        crossfade_duration: Duration of crossfade transitions in seconds
+        intermediate: Use the faster intermediate encoder settings
+    """
+    hwaccel = _get_hwaccel_input_kwargs()
+    videos = []
+    audios = []
+    durations = []
+    for part in parts:
+        if part["type"] == "ad":
+            duration = _probe_media(part["source"])["duration"]
+            source = ffmpeg.input(part["source"], **hwaccel)
+            # Normalized ads are video-only in the staged path; keep them silent here too
+            audio = None
+        else:
+            duration = part["duration_sec"]
+            source = ffmpeg.input(part["source"], ss=part["start_sec"], t=duration, **hwaccel)
+            audio = source.audio if _probe_media(part["source"])["has_audio"] else None
+        video, audio = _normalize_streams(source.video, audio, duration)
+        videos.append(video)
+        audios.append(audio)
+        durations.append(duration)
+
+    video, audio, _ = _xfade_streams(videos, audios, durations, crossfade_duration)
+
+    print(f"[Render] Inserting ads in one pass ({len(parts)} parts)...")
+    (
+        ffmpeg
+        .output(video, audio, output_path, ar=48000, **_get_encoding_params(intermediate=intermediate))
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def _extract_windows_single_pass(
+    video_path: str,
+    tasks: list[dict],
+    threads: int | None = None,
+) -> list[tuple[int, str | None, str | None]]:
+    """Re-encode several windows of one video with a single decode.
+
+    One ffmpeg process reads the input once (from the first window's start)
+    and writes every window as its own output, trimmed with output-side
+    -ss/-t. Falls back to extracting windows one by one if it fails.
+
+    Args:
+        video_path: Source video path
+        tasks: Extraction task dicts for windows of video_path
+        threads: Optional encoder thread count per output
+
+    Returns:
+        List of (index, segment_path or None, error message or None), one per task
+    """
+    if len(tasks) == 1:
+        return [_extract_single_segment(tasks[0], _REENCODE_SLOTS)]
+
+    coarse_sec = max(0.0, min(task["start_sec"] for task in tasks) - 2.0)
+    encoding_argv = _encoding_argv(all(task.get("intermediate") for task in tasks), threads)
+    args = [*_get_hwaccel_input_args(), "-ss", str(coarse_sec), "-i", video_path]
+    for task in tasks:
+        args.extend([
+            "-map", "0:v:0", "-map", "0:a:0?",
+            "-ss", str(task["start_sec"] - coarse_sec), "-t", str(task["duration_sec"]),
+            *encoding_argv,
+            task["segment_path"],
+        ])
+
+    try:
+        with _REENCODE_SLOTS:
+            _run_ffmpeg(args)
+        return [(task["index"], task["segment_path"], None) for task in tasks]
+    except ffmpeg.Error as e:
+        print(f"[Render] Single-pass extraction failed, extracting windows separately: "
+              f"{_ffmpeg_error_summary(e)}")
+        return [_extract_single_segment(task, _REENCODE_SLOTS) for task in tasks]
 
 
 def normalize_ad_video(
@@ -1171,6 +2533,8 @@ def normalize_ad_video(
     target_width: int = 1920,
     target_height: int = 1080,
     target_fps: int = 30,
+    threads: int | None = None,
+    intermediate: bool = False,
 ) -> None:
     """Normalize ad video to match main video specifications.
 
@@ -1182,20 +2546,58 @@ def normalize_ad_video(
         target_width: Target width in pixels
         target_height: Target height in pixels
         target_fps: Target frame rate
+        threads: Optional encoder thread count (when encoding in parallel)
+        intermediate: Use the faster intermediate encoder settings
     """
+    # Ads that already match the target only need their audio dropped (the
+    # normalized ad is video-only): a stream copy instead of a re-encode
+    info = None
     try:
-        enc_params = _get_encoding_params()
-        enc_params["ar"] = 44100  # Ensure consistent audio sample rate
-        (
-            ffmpeg
-            .input(input_path)
-            .filter("scale", w=target_width, h=target_height, force_original_aspect_ratio="decrease")
-            .filter("pad", w=target_width, h=target_height, x="(ow-iw)/2", y="(oh-ih)/2")
-            .filter("fps", fps=target_fps)
-            .output(output_path, **enc_params)
-            .overwrite_output()
-            .run(quiet=True)
-        )
+        info = _probe_media(input_path)
+        if (
+            info["vcodec"] == "h264"
+            and info["pix_fmt"] == "yuv420p"
+            and (info["width"], info["height"]) == (target_width, target_height)
+            and info["fps"] is not None
+            and abs(info["fps"] - target_fps) < 0.01
+        ):
+            if info["has_audio"]:
+                _run_ffmpeg([
+                    "-i", input_path, "-map", "0:v:0",
+                    "-c", "copy", "-movflags", "+faststart", output_path,
+                ])
+            else:
+                _link_or_copy(input_path, output_path)
+            return
+    except Exception as e:
+        print(f"Could not check ad video format, normalizing: {e}")
+
+    enc_params = _get_encoding_params(intermediate=intermediate)
+    enc_params["ar"] = 44100  # Ensure consistent audio sample rate
+    enc_params["r"] = target_fps  # Output frame rate instead of an fps filter node
+    if threads:
+        enc_params["threads"] = threads
+    scale = {"w": target_width, "h": target_height, "force_original_aspect_ratio": "decrease"}
+    pad = {"w": target_width, "h": target_height, "x": "(ow-iw)/2", "y": "(oh-ih)/2"}
+
+    try:
+        with _REENCODE_SLOTS:
+            if _get_hwaccel_input_kwargs().get("hwaccel") == "cuda" and info and info["width"] and info["height"]:
+                try:
+                    _normalize_ad_video_cuda(input_path, output_path, info, target_width, target_height, enc_params)
+                    return
+                except ffmpeg.Error as e:
+                    print(f"GPU ad normalization failed, retrying on CPU: {_ffmpeg_error_summary(e)}")
+
+            (
+                ffmpeg
+                .input(input_path)
+                .filter("scale", **scale)
+                .filter("pad", **pad)
+                .output(output_path, **enc_params)
+                .overwrite_output()
+                .run(quiet=True)
+            )
     except ffmpeg.Error as e:
         print(f"Error normalizing ad video: {e}")
         # Fall back to simple copy
@@ -1203,6 +2605,99 @@ def normalize_ad_video(
         shutil.copy(input_path, output_path)
 
 
+def _normalize_ad_video_cuda(
+    input_path: str,
+    output_path: str,
+    info: dict,
+    target_width: int,
+    target_height: int,
+    enc_params: dict,
+) -> None:
+    """Normalize an ad entirely on the GPU for NVENC.
+
+    The ad is decoded and letterbox-scaled with scale_cuda, then centered
+    on an uploaded black canvas with overlay_cuda instead of a CPU pad, so
+    the ad frames never leave the GPU between decode and encode.
+
+    Args:
+        input_path: Path to ad video
+        output_path: Path to write normalized video
+        info: Probe result for input_path (width and height are required)
+        target_width: Target width in pixels
+        target_height: Target height in pixels
+        enc_params: NVENC output parameters (pix_fmt is dropped: frames stay on the GPU)
+    """
+    # Letterbox size computed up front so the overlay position is a constant
+    factor = min(target_width / info["width"], target_height / info["height"])
+    scaled_width = max(2, int(info["width"] * factor) // 2 * 2)
+    scaled_height = max(2, int(info["height"] * factor) // 2 * 2)
+    fps = enc_params["r"]
+
+    ad = (
+        ffmpeg
+        .input(input_path, hwaccel="cuda", hwaccel_output_format="cuda", hwaccel_device="cu")
+        .video
+        .filter("scale_cuda", w=scaled_width, h=scaled_height, format="yuv420p")
+    )
+    canvas = (
+        ffmpeg
+        .input(f"color=c=black:s={target_width}x{target_height}:r={fps}", f="lavfi")
+        .filter("format", "yuv420p")
+        .filter("hwupload_cuda")
+    )
+    video = ffmpeg.filter(
+        [canvas, ad], "overlay_cuda",
+        x=(target_width - scaled_width) // 2,
+        y=(target_height - scaled_height) // 2,
+        shortest=1,
+    )
+    params = {k: v for k, v in enc_params.items() if k != "pix_fmt"}
+    (
+        ffmpeg
+        .output(video, output_path, **params)
+        .global_args("-init_hw_device", "cuda=cu:0", "-filter_hw_device", "cu")
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def _product_callout_stream(
+    video_path: str,
+    product_title: str,
+    price: str | None = None,
+    position: str = "bottom_right",
+):
+    """Build the callout drawtext chain over a video's stream (see add_product_callout)."""
+    # Build text (a real newline: textfile keeps it, an inline text= can't)
+    text = product_title
+    if price:
+        text += f"\n${price}"
+
+    # Position coordinates
+    positions = {
+        "bottom_right": ("W-tw-30", "H-th-30"),
+        "bottom_left": ("30", "H-th-30"),
+        "bottom_center": ("(W-tw)/2", "H-th-30"),
+    }
+    x, y = positions.get(position, positions["bottom_right"])
+
+    return (
+        ffmpeg
+        .input(video_path, **_get_hwaccel_input_kwargs())
+        .filter("drawtext",
+                textfile=_drawtext_textfile(text),
+                fontsize=28,
+                fontcolor="white",
+                borderw=2,
+                bordercolor="black@0.8",
+                x=x,
+                y=y,
+                box=1,
+                boxcolor="black@0.5",
+                boxborderw=10)
+    )
+
+
 def add_product_callout(
     video_path: str,
     output_path: str,
@@ -1221,40 +2716,50 @@ def add_product_callout(
         price: Optional price string
         position: Overlay position (bottom_right, bottom_left, bottom_center)
     """
-    # Build text
-    text = product_title
-    if price:
-        text += f"\\n${price}"
-
-    # Position coordinates
-    positions = {
-        "bottom_right": ("W-tw-30", "H-th-30"),
-        "bottom_left": ("30", "H-th-30"),
-        "bottom_center": ("(W-tw)/2", "H-th-30"),
-    }
-    x, y = positions.get(position, positions["bottom_right"])
-
     try:
         enc_params = _get_encoding_params()
         (
-            ffmpeg
-            .input(video_path)
-            .filter("drawtext",
-                    text=text,
-                    fontsize=28,
-                    fontcolor="white",
-                    borderw=2,
-                    bordercolor="black@0.8",
-                    x=x,
-                    y=y,
-                    box=1,
-                    boxcolor="black@0.5",
-                    boxborderw=10)
+            _product_callout_stream(video_path, product_title, price, position)
             .output(output_path, **enc_params)
             .overwrite_output()
             .run(quiet=True)
         )
     except ffmpeg.Error as e:
         print(f"Error adding product callout: {e}")
-        import shutil
         shutil.copy(video_path, output_path)
+
+
+def add_product_callouts_batch(specs: list[dict]) -> None:
+    """Add product callouts to several ad videos in a single ffmpeg process.
+
+    Every video gets its own input and drawtext chain inside one filter
+    graph, each mapped to its own output file, so process and encoder
+    startup is paid once. Falls back to add_product_callout per video if
+    the batch fails.
+
+    Args:
+        specs: List of dicts with video_path, output_path, product_title and
+            optional price and position (same meaning as add_product_callout)
+    """
+    if not specs:
+        return
+
+    enc_params = _get_encoding_params()
+    outputs = [
+        _product_callout_stream(
+            spec["video_path"], spec["product_title"], spec.get("price"), spec.get("position", "bottom_right")
+        ).output(spec["output_path"], **enc_params)
+        for spec in specs
+    ]
+    try:
+        ffmpeg.merge_outputs(*outputs).overwrite_output().run(quiet=True)
+    except ffmpeg.Error as e:
+        print(f"Error adding product callouts in batch, retrying one by one: {e}")
+        for spec in specs:
+            add_product_callout(
+                spec["video_path"],
+                spec["output_path"],
+                spec["product_title"],
+                spec.get("price"),
+                spec.get("position", "bottom_right"),
+            )
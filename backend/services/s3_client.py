@@ -1,30 +1,49 @@
 """S3 client for presigned URL generation and file operations."""
 
+import asyncio
+import time
 from functools import lru_cache
 
 import boto3
-from boto3.s3.transfer import TransferConfig
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
 from botocore.config import Config
 
 from config import get_settings
 
 
 # Optimized transfer config for parallel downloads/uploads
-# Uses multiple threads to speed up large file transfers
+# Uses multiple threads to speed up large file transfers; 16MB parts keep
+# each connection streaming long enough to reach full per-connection speed
 TRANSFER_CONFIG = TransferConfig(
     multipart_threshold=8 * 1024 * 1024,  # 8MB - use multipart for files > 8MB
-    max_concurrency=10,  # 10 parallel threads
-    multipart_chunksize=8 * 1024 * 1024,  # 8MB chunks
+    max_concurrency=20,  # 20 parallel threads (fits the client's connection pool)
+    multipart_chunksize=16 * 1024 * 1024,  # 16MB chunks
     use_threads=True,
+    max_io_queue=1000,
 )
 
+# Download URLs are reused within this window (keyed on bucket/key/expiry), so
+# repeated listings return byte-identical URLs the browser can cache. A reused
+# URL keeps at least expires_in minus the window of its validity.
+PRESIGN_CACHE_WINDOW_SEC = 300
+
 
 @lru_cache
 def get_s3_client():
-    """Get S3 client singleton with optional transfer acceleration."""
+    """Get S3 client singleton with optional transfer acceleration.
+
+    The client is thread-safe and shared by request handlers and transfer
+    threads, so its connection pool is sized for that concurrency instead
+    of botocore's default of 10.
+    """
     settings = get_settings()
 
-    config_params = {"signature_version": "s3v4"}
+    config_params = {
+        "signature_version": "s3v4",
+        "max_pool_connections": settings.s3_max_pool_connections,
+        "retries": {"max_attempts": 10, "mode": "adaptive"},
+        "tcp_keepalive": True,
+    }
 
     # Enable S3 Transfer Acceleration if configured
     if settings.s3_use_acceleration:
@@ -39,6 +58,16 @@ def get_s3_client():
     )
 
 
+@lru_cache
+def get_transfer_manager():
+    """Get the transfer manager singleton shared by uploads and downloads.
+
+    Reusing one manager keeps its worker threads and the client's pooled
+    connections alive across transfers instead of rebuilding them per call.
+    """
+    return create_transfer_manager(get_s3_client(), TRANSFER_CONFIG)
+
+
 def generate_presigned_upload_url(
     bucket: str,
     key: str,
@@ -75,6 +104,9 @@ def generate_presigned_download_url(
 ) -> str:
     """Generate a presigned URL for downloading from S3.
 
+    Identical requests within PRESIGN_CACHE_WINDOW_SEC return the same URL
+    instead of being re-signed.
+
     Args:
         bucket: S3 bucket name
         key: Object key (path) in the bucket
@@ -83,6 +115,13 @@ def generate_presigned_download_url(
     Returns:
         Presigned URL for GET download
     """
+    if expires_in <= PRESIGN_CACHE_WINDOW_SEC:
+        return _sign_download_url(bucket, key, expires_in)
+    window = int(time.time() // PRESIGN_CACHE_WINDOW_SEC)
+    return _cached_download_url(bucket, key, expires_in, window)
+
+
+def _sign_download_url(bucket: str, key: str, expires_in: int) -> str:
     s3 = get_s3_client()
     return s3.generate_presigned_url(
         "get_object",
@@ -94,6 +133,12 @@ def generate_presigned_download_url(
     )
 
 
+@lru_cache(maxsize=10_000)
+def _cached_download_url(bucket: str, key: str, expires_in: int, window: int) -> str:
+    """Sign once per cache window; window only partitions the cache key."""
+    return _sign_download_url(bucket, key, expires_in)
+
+
 def download_file(bucket: str, key: str, local_path: str) -> None:
     """Download a file from S3 to local filesystem.
 
@@ -104,8 +149,7 @@ def download_file(bucket: str, key: str, local_path: str) -> None:
         key: Object key (path) in the bucket
         local_path: Local file path to save to
     """
-    s3 = get_s3_client()
-    s3.download_file(bucket, key, local_path, Config=TRANSFER_CONFIG)
+    get_transfer_manager().download(bucket, key, local_path).result()
 
 
 def upload_file(local_path: str, bucket: str, key: str, content_type: str = None) -> str:
@@ -122,16 +166,11 @@ def upload_file(local_path: str, bucket: str, key: str, content_type: str = None
     Returns:
         S3 URI of the uploaded file
     """
-    s3 = get_s3_client()
     extra_args = {}
     if content_type:
         extra_args["ContentType"] = content_type
 
-    s3.upload_file(
-        local_path, bucket, key,
-        ExtraArgs=extra_args if extra_args else None,
-        Config=TRANSFER_CONFIG
-    )
+    get_transfer_manager().upload(local_path, bucket, key, extra_args=extra_args or None).result()
     return f"s3://{bucket}/{key}"
 
 
@@ -144,15 +183,12 @@ def parse_s3_uri(s3_uri: str) -> tuple[str, str]:
     Returns:
         Tuple of (bucket, key)
     """
-    if not s3_uri.startswith("s3://"):
-        raise ValueError(f"Invalid S3 URI: {s3_uri}")
-
-    path = s3_uri[5:]  # Remove "s3://"
-    parts = path.split("/", 1)
-    if len(parts) != 2:
+    scheme, sep, path = s3_uri.partition("://")
+    bucket, slash, key = path.partition("/")
+    if scheme != "s3" or not sep or not bucket or not slash or not key:
         raise ValueError(f"Invalid S3 URI: {s3_uri}")
 
-    return parts[0], parts[1]
+    return bucket, key
 
 
 # Multipart Upload Functions
@@ -176,6 +212,15 @@ def create_multipart_upload(bucket: str, key: str, content_type: str) -> str:
     return response["UploadId"]
 
 
+async def create_multipart_upload_async(bucket: str, key: str, content_type: str) -> str:
+    """Initiate a multipart upload from a worker thread.
+
+    Same as create_multipart_upload, but the S3 round trip doesn't block the
+    event loop of the async route calling it.
+    """
+    return await asyncio.to_thread(create_multipart_upload, bucket, key, content_type)
+
+
 def generate_presigned_chunk_url(
     bucket: str,
     key: str,
@@ -208,6 +253,58 @@ def generate_presigned_chunk_url(
     )
 
 
+def generate_presigned_chunk_urls(
+    bucket: str,
+    key: str,
+    upload_id: str,
+    part_count: int,
+    expires_in: int = 3600,
+) -> list[str]:
+    """Generate presigned URLs for every part of a multipart upload at once.
+
+    Signing is local CPU work, so one pass with the shared client replaces a
+    round trip to the API per chunk.
+
+    Args:
+        bucket: S3 bucket name
+        key: Object key (path) in the bucket
+        upload_id: Multipart upload ID
+        part_count: Number of parts to sign (parts 1..part_count)
+        expires_in: URL expiration time in seconds (default 1 hour)
+
+    Returns:
+        Presigned PUT URLs, index i for part number i + 1
+    """
+    s3 = get_s3_client()
+    params = {"Bucket": bucket, "Key": key, "UploadId": upload_id}
+    return [
+        s3.generate_presigned_url(
+            "upload_part",
+            Params={**params, "PartNumber": part_number},
+            ExpiresIn=expires_in,
+        )
+        for part_number in range(1, part_count + 1)
+    ]
+
+
+async def generate_presigned_chunk_urls_async(
+    bucket: str,
+    key: str,
+    upload_id: str,
+    part_count: int,
+    expires_in: int = 3600,
+) -> list[str]:
+    """Sign every part of a multipart upload from a worker thread.
+
+    Signing hundreds of parts takes tens of milliseconds; running it off
+    the event loop keeps other requests flowing meanwhile. Single URLs are
+    signed inline, where a thread hop would cost more than the signature.
+    """
+    return await asyncio.to_thread(
+        generate_presigned_chunk_urls, bucket, key, upload_id, part_count, expires_in
+    )
+
+
 def complete_multipart_upload(
     bucket: str, key: str, upload_id: str, parts: list[dict]
 ) -> None:
@@ -230,6 +327,24 @@ def complete_multipart_upload(
     )
 
 
+async def complete_multipart_upload_async(
+    bucket: str, key: str, upload_id: str, parts: list[dict]
+) -> None:
+    """Complete a multipart upload without blocking the event loop.
+
+    S3 assembles the object before CompleteMultipartUpload returns, which
+    takes seconds for large videos; running it in a worker thread lets the
+    API keep serving other requests (and other completes) meanwhile.
+
+    Args:
+        bucket: S3 bucket name
+        key: Object key (path) in the bucket
+        upload_id: Multipart upload ID
+        parts: List of completed parts with ETags, sorted by PartNumber
+    """
+    await asyncio.to_thread(complete_multipart_upload, bucket, key, upload_id, parts)
+
+
 def abort_multipart_upload(bucket: str, key: str, upload_id: str) -> None:
     """Abort a multipart upload and clean up parts.
 
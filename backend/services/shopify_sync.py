@@ -1,13 +1,79 @@
 """Shopify product sync service for brand-level integration."""
 
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any
 
 import httpx
 
 from config import get_settings
 from services.encryption import decrypt
+from services.http_client import get_http_client
 from services.supabase_client import get_supabase
 
+# Products per sync_shopify_products RPC call and
+# concurrent upsert requests during a sync
+SYNC_UPSERT_BATCH_SIZE = 500
+SYNC_UPSERT_WORKERS = 8
+# Rows per page when reading the cached catalog (PostgREST caps responses)
+SYNC_CACHE_PAGE_SIZE = 1000
+
+# Bulk operation polling (catalogs above settings.shopify_bulk_sync_threshold)
+BULK_POLL_INTERVAL_SEC = 2.0
+BULK_TIMEOUT_SEC = 600.0
+
+# Only the fields sync_shopify_products and the change check read; keeps
+# REST pages (and the raw_data we store) to a fraction of the full payload.
+_REST_PRODUCT_FIELDS = "id,title,body_html,status,updated_at,variants,images"
+
+# Products and their variants as a bulk operation; variants come back as
+# separate JSONL lines that reference their product via __parentId
+_BULK_PRODUCTS_QUERY = """
+{
+  products(query: "status:active") {
+    edges {
+      node {
+        id
+        legacyResourceId
+        title
+        descriptionHtml
+        status
+        updatedAt
+        featuredImage { url }
+        variants {
+          edges {
+            node {
+              id
+              legacyResourceId
+              price
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+_BULK_RUN_MUTATION = """
+mutation RunProductsBulkQuery($query: String!) {
+  bulkOperationRunQuery(query: $query) {
+    bulkOperation { id status }
+    userErrors { field message }
+  }
+}
+"""
+
+_BULK_STATUS_QUERY = """
+query BulkOperationStatus($id: ID!) {
+  node(id: $id) {
+    ... on BulkOperation { status errorCode url }
+  }
+}
+"""
+
 
 def get_first_available_store() -> dict | None:
     """Get the first active store with synced products.
@@ -48,6 +114,120 @@ def get_first_available_store() -> dict | None:
     return store
 
 
+def _shopify_headers(access_token: str) -> dict[str, str]:
+    """Admin API request headers for a store's access token."""
+    return {
+        "X-Shopify-Access-Token": access_token,
+        "Content-Type": "application/json",
+    }
+
+
+def count_shopify_products(shop_domain: str, access_token: str) -> int:
+    """Count a store's active products with the REST count endpoint.
+
+    Args:
+        shop_domain: The shop domain (e.g., "brand.myshopify.com")
+        access_token: Decrypted access token
+
+    Returns:
+        Number of active products
+    """
+    settings = get_settings()
+    client = get_http_client()
+    response = client.get(
+        f"https://{shop_domain}/admin/api/{settings.shopify_api_version}/products/count.json",
+        headers=_shopify_headers(access_token),
+        params={"status": "active"},
+    )
+    if response.status_code != 200:
+        raise Exception(f"Shopify API error: {response.status_code} - {response.text}")
+    return response.json().get("count", 0)
+
+
+def _shopify_graphql(client: httpx.Client, shop_domain: str, access_token: str, query: str, variables: dict) -> dict:
+    """Run an Admin GraphQL request and return its data, raising on errors."""
+    settings = get_settings()
+    response = client.post(
+        f"https://{shop_domain}/admin/api/{settings.shopify_api_version}/graphql.json",
+        headers=_shopify_headers(access_token),
+        json={"query": query, "variables": variables},
+    )
+    if response.status_code != 200:
+        raise Exception(f"Shopify API error: {response.status_code} - {response.text}")
+    payload = response.json()
+    if payload.get("errors"):
+        raise Exception(f"Shopify GraphQL error: {payload['errors']}")
+    return payload["data"]
+
+
+def fetch_shopify_products_bulk(shop_domain: str, access_token: str) -> list[dict[str, Any]]:
+    """Fetch the whole active catalog with one GraphQL bulk operation.
+
+    Starts a bulkOperationRunQuery, polls it until Shopify has written the
+    JSONL result, then streams that file line by line. Replaces one
+    sequential REST round trip per 250 products with a single export.
+    Products are returned in the REST shape the sync_shopify_products SQL
+    function reads (id, title, body_html, status, variants, images).
+
+    Args:
+        shop_domain: The shop domain (e.g., "brand.myshopify.com")
+        access_token: Decrypted access token
+
+    Returns:
+        List of product dictionaries
+
+    Raises:
+        Exception: If the bulk operation can't be started, fails or times out
+    """
+    client = get_http_client()
+    data = _shopify_graphql(client, shop_domain, access_token, _BULK_RUN_MUTATION, {"query": _BULK_PRODUCTS_QUERY})
+    result = data["bulkOperationRunQuery"]
+    if result["userErrors"]:
+        raise Exception(f"Shopify bulk operation rejected: {result['userErrors']}")
+    operation_id = result["bulkOperation"]["id"]
+
+    deadline = time.monotonic() + BULK_TIMEOUT_SEC
+    while True:
+        operation = _shopify_graphql(client, shop_domain, access_token, _BULK_STATUS_QUERY, {"id": operation_id})["node"]
+        if operation["status"] == "COMPLETED":
+            break
+        if operation["status"] in ("FAILED", "CANCELED", "EXPIRED"):
+            raise Exception(f"Shopify bulk operation {operation['status']}: {operation.get('errorCode')}")
+        if time.monotonic() > deadline:
+            raise Exception(f"Shopify bulk operation timed out after {BULK_TIMEOUT_SEC:.0f}s")
+        time.sleep(BULK_POLL_INTERVAL_SEC)
+
+    # No url means the query matched nothing
+    if not operation.get("url"):
+        return []
+
+    products: dict[str, dict[str, Any]] = {}
+    with client.stream("GET", operation["url"], timeout=120.0) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            node = json.loads(line)
+            parent_id = node.get("__parentId")
+            if parent_id is None:
+                products[node["id"]] = {
+                    "id": int(node["legacyResourceId"]),
+                    "title": node["title"],
+                    "body_html": node.get("descriptionHtml") or "",
+                    "status": (node.get("status") or "").lower(),
+                    "updated_at": node.get("updatedAt"),
+                    "variants": [],
+                    "images": [{"src": node["featuredImage"]["url"]}] if node.get("featuredImage") else [],
+                }
+            elif parent_id in products:
+                products[parent_id]["variants"].append({
+                    "id": int(node["legacyResourceId"]),
+                    "price": node.get("price") or "0.00",
+                })
+
+    return list(products.values())
+
+
 def fetch_shopify_products(
     shop_domain: str,
     access_token: str,
@@ -67,80 +247,93 @@ def fetch_shopify_products(
     all_products = []
     page_info = None
 
-    with httpx.Client(timeout=30.0) as client:
-        while True:
-            params = {"limit": min(limit, 250), "status": "active"}
-            if page_info:
-                params["page_info"] = page_info
-
-            response = client.get(
-                f"https://{shop_domain}/admin/api/{settings.shopify_api_version}/products.json",
-                headers={
-                    "X-Shopify-Access-Token": access_token,
-                    "Content-Type": "application/json",
-                },
-                params=params,
-            )
-
-            if response.status_code != 200:
-                raise Exception(f"Shopify API error: {response.status_code} - {response.text}")
-
-            data = response.json()
-            products = data.get("products", [])
-            all_products.extend(products)
-
-            # Check for pagination
-            link_header = response.headers.get("Link", "")
-            if 'rel="next"' in link_header:
-                # Extract page_info from Link header
-                for part in link_header.split(","):
-                    if 'rel="next"' in part:
-                        # Format: <url?page_info=xxx>; rel="next"
-                        page_info = part.split("page_info=")[1].split(">")[0]
-                        break
-            else:
-                break
+    # Built once for every page; cursor pages may only carry limit and fields
+    client = get_http_client()
+    url = f"https://{shop_domain}/admin/api/{settings.shopify_api_version}/products.json"
+    headers = _shopify_headers(access_token)
+    base_params = {"limit": min(limit, 250), "fields": _REST_PRODUCT_FIELDS}
+    while True:
+        if page_info:
+            params = {**base_params, "page_info": page_info}
+        else:
+            params = {**base_params, "status": "active"}
+
+        response = client.get(url, headers=headers, params=params)
+
+        if response.status_code != 200:
+            raise Exception(f"Shopify API error: {response.status_code} - {response.text}")
+
+        data = response.json()
+        products = data.get("products", [])
+        all_products.extend(products)
+
+        # Check for pagination
+        link_header = response.headers.get("Link", "")
+        if 'rel="next"' in link_header:
+            # Extract page_info from Link header
+            for part in link_header.split(","):
+                if 'rel="next"' in part:
+                    # Format: <url?page_info=xxx>; rel="next"
+                    page_info = part.split("page_info=")[1].split(">")[0]
+                    break
+        else:
+            break
 
     return all_products
 
 
-def transform_shopify_product(
-    product: dict[str, Any],
-    shop_domain: str,
-) -> dict[str, Any]:
-    """Transform Shopify product to our format.
+def _cached_product_state(supabase, store_id: str) -> dict[str, dict[str, Any]]:
+    """Load the stored Shopify updated_at and status of every cached product.
+
+    The timestamp comes from the raw product the cache was last written
+    from, not synced_at: an edit made between fetch and upsert is older
+    than synced_at but newer than the stored updated_at.
 
     Args:
-        product: Raw Shopify product data
-        shop_domain: Shop domain for building checkout URLs
+        supabase: Supabase client
+        store_id: UUID of the shopify_stores record
 
     Returns:
-        Transformed product dictionary
+        Dict mapping shopify_product_id to its cached updated_at and status
     """
-    variant = product["variants"][0] if product.get("variants") else {}
-    image = product["images"][0] if product.get("images") else {}
-
-    # Build checkout URL
-    checkout_url = None
-    if variant.get("id"):
-        checkout_url = f"https://{shop_domain}/cart/{variant['id']}:1"
-
-    return {
-        "shopify_product_id": str(product["id"]),
-        "title": product["title"],
-        "description": product.get("body_html", ""),
-        "price": float(variant.get("price", "0.00")),
-        "currency": "USD",  # Shopify doesn't return currency in product endpoint
-        "image_url": image.get("src"),
-        "checkout_url": checkout_url,
-        "status": "active" if product.get("status") == "active" else "inactive",
-        "raw_data": product,
-    }
+    state = {}
+    offset = 0
+    while True:
+        result = (
+            supabase.table("shopify_products")
+            .select("shopify_product_id,status,updated_at:raw_data->>updated_at")
+            .eq("store_id", store_id)
+            .order("shopify_product_id")
+            .range(offset, offset + SYNC_CACHE_PAGE_SIZE - 1)
+            .execute()
+        )
+        rows = result.data or []
+        for row in rows:
+            state[row["shopify_product_id"]] = row
+        if len(rows) < SYNC_CACHE_PAGE_SIZE:
+            return state
+        offset += SYNC_CACHE_PAGE_SIZE
+
+
+def _product_unchanged(product: dict[str, Any], cached: dict[str, Any] | None) -> bool:
+    """Whether Shopify's copy is no newer than the one the cache was built from."""
+    if not cached or cached.get("status") != "active":
+        return False
+    try:
+        updated_at = datetime.fromisoformat(product["updated_at"])
+        cached_updated_at = datetime.fromisoformat(cached["updated_at"])
+        return updated_at <= cached_updated_at
+    except (KeyError, TypeError, ValueError):
+        return False
 
 
 def sync_store_products(store_id: str) -> dict[str, Any]:
     """Sync all products for a store from Shopify to local cache.
 
+    Products whose Shopify updated_at is not newer than the updated_at
+    stored with their cached copy are left alone instead of being
+    rewritten every sync.
+
     Args:
         store_id: UUID of the shopify_stores record
 
@@ -158,29 +351,70 @@ def sync_store_products(store_id: str) -> dict[str, Any]:
     shop_domain = store["shop_domain"]
     access_token = decrypt(store["access_token"])
 
-    # Fetch products from Shopify
-    shopify_products = fetch_shopify_products(shop_domain, access_token)
+    # Fetch products from Shopify: one bulk export for large catalogs,
+    # REST pagination otherwise (a bulk operation has seconds of fixed
+    # latency, and some shops can't run them)
+    shopify_products = None
+    try:
+        if count_shopify_products(shop_domain, access_token) > get_settings().shopify_bulk_sync_threshold:
+            shopify_products = fetch_shopify_products_bulk(shop_domain, access_token)
+    except Exception as e:
+        print(f"[ShopifySync] Bulk fetch unavailable for {shop_domain}, using REST pagination: {e}")
+    if shopify_products is None:
+        shopify_products = fetch_shopify_products(shop_domain, access_token)
+
+    # Upsert changed products in batches, several batches at a time over
+    # the client's shared connection pool. The sync_shopify_products SQL
+    # function maps raw products to cached columns server-side, so each raw
+    # product goes over the wire once instead of twice (as columns and
+    # again as raw_data)
+    cached_state = _cached_product_state(supabase, store_id)
+    changed_products = []
+    unchanged_count = 0
+    for product in shopify_products:
+        if _product_unchanged(product, cached_state.get(str(product["id"]))):
+            unchanged_count += 1
+            continue
+        changed_products.append(product)
+
+    batches = [
+        changed_products[i:i + SYNC_UPSERT_BATCH_SIZE]
+        for i in range(0, len(changed_products), SYNC_UPSERT_BATCH_SIZE)
+    ]
+
+    def upsert_batch(batch: list[dict[str, Any]]) -> Exception | None:
+        try:
+            supabase.rpc(
+                "sync_shopify_products",
+                {"store": store_id, "shop": shop_domain, "products": batch},
+            ).execute()
+            return None
+        except Exception as e:
+            return e
 
-    # Transform and upsert products
     synced_count = 0
-    for product in shopify_products:
-        transformed = transform_shopify_product(product, shop_domain)
-        transformed["store_id"] = store_id
-        transformed["synced_at"] = "now()"
-
-        # Upsert product
-        supabase.table("shopify_products").upsert(
-            transformed,
-            on_conflict="store_id,shopify_product_id",
-        ).execute()
-        synced_count += 1
-
-    # Mark products not in this sync as inactive
-    current_product_ids = [str(p["id"]) for p in shopify_products]
+    failed_count = 0
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(SYNC_UPSERT_WORKERS, len(batches))) as executor:
+            for batch, error in zip(batches, executor.map(upsert_batch, batches)):
+                if error is None:
+                    synced_count += len(batch)
+                else:
+                    failed_count += len(batch)
+                    print(f"[ShopifySync] Failed to upsert {len(batch)} products for store {store_id}: {error}")
+
+    # Mark cached active products missing from this sync as inactive; only
+    # the stale ids go over the wire, not the whole catalog
+    current_product_ids = {str(p["id"]) for p in shopify_products}
     if current_product_ids:
-        supabase.table("shopify_products").update(
-            {"status": "inactive"}
-        ).eq("store_id", store_id).not_.in_("shopify_product_id", current_product_ids).execute()
+        stale_ids = sorted(
+            product_id for product_id, cached in cached_state.items()
+            if cached.get("status") == "active" and product_id not in current_product_ids
+        )
+        for i in range(0, len(stale_ids), SYNC_UPSERT_BATCH_SIZE):
+            supabase.table("shopify_products").update(
+                {"status": "inactive"}
+            ).eq("store_id", store_id).in_("shopify_product_id", stale_ids[i:i + SYNC_UPSERT_BATCH_SIZE]).execute()
 
     # Update store last_sync_at
     supabase.table("shopify_stores").update(
@@ -191,6 +425,8 @@ def sync_store_products(store_id: str) -> dict[str, Any]:
         "store_id": store_id,
         "shop_domain": shop_domain,
         "products_synced": synced_count,
+        "products_unchanged": unchanged_count,
+        "products_failed": failed_count,
     }
 
 
@@ -277,6 +513,9 @@ def add_event_brand_products(
             {"is_primary": False}
         ).eq("event_id", event_id).execute()
 
+    if not product_ids:
+        return []
+
     # Get current max display_order
     existing = (
         supabase.table("event_brand_products")
@@ -288,23 +527,26 @@ def add_event_brand_products(
     )
     next_order = (existing.data[0]["display_order"] + 1) if existing.data else 0
 
-    # Insert new associations
-    created = []
-    for i, product_id in enumerate(product_ids):
-        result = supabase.table("event_brand_products").upsert(
-            {
-                "event_id": event_id,
-                "store_id": store_id,
-                "product_id": product_id,
-                "display_order": next_order + i,
-                "is_primary": set_primary and i == 0,
-            },
-            on_conflict="event_id,product_id",
-        ).execute()
-        if result.data:
-            created.extend(result.data)
-
-    return created
+    # Insert new associations in one request. A repeated id would make the
+    # single upsert touch one row twice, which Postgres rejects outright, so
+    # keep only its first occurrence (and that position's order/primary)
+    product_ids = list(dict.fromkeys(product_ids))
+    rows = [
+        {
+            "event_id": event_id,
+            "store_id": store_id,
+            "product_id": product_id,
+            "display_order": next_order + i,
+            "is_primary": set_primary and i == 0,
+        }
+        for i, product_id in enumerate(product_ids)
+    ]
+    result = supabase.table("event_brand_products").upsert(
+        rows,
+        on_conflict="event_id,product_id",
+    ).execute()
+
+    return result.data or []
 
 
 def remove_event_brand_product(event_id: str, association_id: str) -> bool:
@@ -26,9 +26,13 @@ Pipeline for Veo scene matching:
 4. Composite onto event footage with alpha blending
 """
 
+import hashlib
 import os
+import shutil
+import threading
 import time
 import tempfile
+from functools import lru_cache
 from typing import Literal
 
 import ffmpeg
@@ -78,6 +82,11 @@ PLACEMENT_STYLES = {
     },
 }
 
+# Downloaded product images, keyed by URL hash, reused across overlays and
+# events until they are this old
+_IMAGE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "anchor_img_cache")
+PRODUCT_IMAGE_CACHE_TTL_SEC = 24 * 3600
+
 # Position coordinates for overlay placement (x, y as expressions for FFmpeg)
 POSITION_COORDS = {
     "top_left": ("30", "30"),
@@ -90,9 +99,43 @@ POSITION_COORDS = {
 }
 
 
+def _prune_image_cache() -> None:
+    """Delete cached product images older than PRODUCT_IMAGE_CACHE_TTL_SEC.
+
+    Expired entries would never be read again, so without this the cache
+    grows for as long as a worker runs. Files being written (temp names)
+    are only removed once they are stale too.
+    """
+    cutoff = time.time() - PRODUCT_IMAGE_CACHE_TTL_SEC
+    removed = 0
+    try:
+        shards = os.scandir(_IMAGE_CACHE_DIR)
+    except OSError:
+        return
+    with shards:
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            with os.scandir(shard.path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                            removed += 1
+                    except OSError:
+                        pass  # Already removed by another worker
+    if removed:
+        print(f"[SubtlePlacement] Pruned {removed} expired product images from cache")
+
+
 def download_product_image(product: dict, output_path: str) -> str:
     """Download product image from URL.
 
+    Images are cached on disk by URL for PRODUCT_IMAGE_CACHE_TTL_SEC, so a
+    product reused across overlays and events is fetched once; output_path
+    is hardlinked (or copied) from the cache. Expired entries are deleted
+    whenever a new one is written.
+
     Args:
         product: Product dict with image_url
         output_path: Where to save the image
@@ -100,25 +143,67 @@ def download_product_image(product: dict, output_path: str) -> str:
     Returns:
         Path to downloaded image
     """
-    import httpx
+    from services.http_client import get_http_client
 
     image_url = product.get("image_url")
     if not image_url:
         raise ValueError(f"Product {product.get('title')} has no image_url")
 
-    print(f"[SubtlePlacement] Downloading product image: {image_url[:80]}...")
-
-    with httpx.Client(timeout=30.0, follow_redirects=True) as client:
-        response = client.get(image_url)
-        response.raise_for_status()
-
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
+    key = hashlib.sha1(image_url.encode("utf-8")).hexdigest()
+    cache_path = os.path.join(_IMAGE_CACHE_DIR, key[:2], key)
+    try:
+        fresh = time.time() - os.path.getmtime(cache_path) < PRODUCT_IMAGE_CACHE_TTL_SEC
+    except OSError:
+        fresh = False
+
+    if fresh:
+        print(f"[SubtlePlacement] Product image cache hit: {image_url[:80]}")
+    else:
+        print(f"[SubtlePlacement] Downloading product image: {image_url[:80]}...")
+
+        # Stream straight to disk so large images are never held in memory
+        # whole; publish into the cache atomically once complete
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}"
+        client = get_http_client()
+        try:
+            with client.stream("GET", image_url, follow_redirects=True) as response:
+                response.raise_for_status()
+
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_bytes(chunk_size=64 * 1024):
+                        f.write(chunk)
+            os.replace(tmp_path, cache_path)
+            _prune_image_cache()
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    if os.path.lexists(output_path):
+        os.remove(output_path)
+    try:
+        os.link(cache_path, output_path)
+    except OSError:
+        shutil.copyfile(cache_path, output_path)
 
     print(f"[SubtlePlacement] Product image saved: {output_path}")
     return output_path
 
 
+@lru_cache(maxsize=64)
+def _overlay_video_filter(size: int) -> str:
+    """Build the image overlay filter for a square overlay size (memoized).
+
+    The image is scaled and padded onto a semi-transparent dark background
+    for visibility. Don't use zoompan here (it strips alpha).
+    """
+    return (
+        f"scale={size}:-1:force_original_aspect_ratio=decrease,"
+        f"pad={size}:{size}:(ow-iw)/2:(oh-ih)/2:color=black@0.6,"  # Semi-transparent dark bg
+        f"format=argb"
+    )
+
+
 def create_animated_product_overlay(
     product: dict,
     output_path: str,
@@ -143,46 +228,28 @@ def create_animated_product_overlay(
     """
     import subprocess
 
-    style_config = PLACEMENT_STYLES.get(style, PLACEMENT_STYLES["floating"])
-
     # Download product image
     image_path = output_path.replace(".mov", "_img.png").replace(".mp4", "_img.png")
     download_product_image(product, image_path)
 
     print(f"[SubtlePlacement] Creating {style} animation for {product.get('title')}")
 
-    # Create animated overlay from static image
-    # Use zoompan for animation + fade for appearance
-    # Output as MOV with ProRes 4444 for alpha support
-
+    # Create the overlay video from the static image; the fade in/out is
+    # applied by the compositing step (composite_product_overlay /
+    # composite_multiple_placements), which fades the overlay anyway.
     fps = 30
-    total_frames = int(duration * fps)
-
-    # SIMPLER approach that preserves alpha:
-    # Don't use zoompan (it strips alpha). Instead, use a simple scale + fade
-    # with a solid-color background that we can composite over the video.
 
-    # For visibility, we'll create an overlay with a semi-transparent
-    # dark background behind the product image
-
-    filter_complex = (
-        f"[0:v]scale={size}:-1:force_original_aspect_ratio=decrease,"
-        f"pad={size}:{size}:(ow-iw)/2:(oh-ih)/2:color=black@0.6,"  # Semi-transparent dark bg
-        f"format=rgba,"
-        f"fade=t=in:st=0:d=0.5:alpha=1,"
-        f"fade=t=out:st={duration-0.5}:d=0.5:alpha=1"
-    )
-
-    # Use PNG codec for proper alpha support (more compatible than ProRes)
+    # QuickTime RLE keeps alpha and only codes changes from the previous
+    # frame, so the identical frames of a static overlay cost next to
+    # nothing (PNG zlib-compresses every full frame)
     cmd = [
         "ffmpeg", "-y",
-        "-loop", "1",
+        "-loop", "1", "-framerate", str(fps),
         "-i", image_path,
-        "-filter_complex", filter_complex,
+        "-vf", _overlay_video_filter(size),
         "-t", str(duration),
-        "-r", str(fps),
-        "-c:v", "png",
-        "-pix_fmt", "rgba",
+        "-c:v", "qtrle",
+        "-pix_fmt", "argb",
         output_path
     ]
 
@@ -191,22 +258,7 @@ def create_animated_product_overlay(
 
     if result.returncode != 0:
         print(f"[SubtlePlacement] FFmpeg error: {result.stderr}")
-        # Fallback: try simpler approach with semi-transparent background
-        cmd_simple = [
-            "ffmpeg", "-y",
-            "-loop", "1",
-            "-i", image_path,
-            "-vf", f"scale={size}:-1:force_original_aspect_ratio=decrease,pad={size}:{size}:(ow-iw)/2:(oh-ih)/2:color=black@0.6,format=rgba",
-            "-t", str(duration),
-            "-r", str(fps),
-            "-c:v", "png",
-            "-pix_fmt", "rgba",
-            output_path.replace(".mov", "_simple.mov")
-        ]
-        result = subprocess.run(cmd_simple, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"FFmpeg animation failed: {result.stderr}")
-        output_path = output_path.replace(".mov", "_simple.mov")
+        raise RuntimeError(f"FFmpeg animation failed: {result.stderr}")
 
     # Cleanup temp image
     try:
@@ -502,10 +554,16 @@ def composite_multiple_placements(
     # Build FFmpeg command with filter_complex for proper alpha handling
     import subprocess
 
-    # Build input arguments
+    # Build input arguments. Each overlay is looped only to its own duration
+    # (-t as an input option), so ffmpeg decodes and fades just the frames
+    # that are shown instead of looping every overlay for the whole video
     inputs = ["-i", event_video]
-    for i, placement in enumerate(placements):
-        inputs.extend(["-stream_loop", "-1", "-i", placement["overlay_path"]])
+    for placement in placements:
+        inputs.extend([
+            "-stream_loop", "-1",
+            "-t", str(placement.get("duration", 4.0)),
+            "-i", placement["overlay_path"],
+        ])
 
     # Build filter_complex string
     filter_parts = []
@@ -521,13 +579,15 @@ def composite_multiple_placements(
         input_idx = i + 1  # 0 is the main video
         next_label = f"v{i}" if i < len(placements) - 1 else "outv"
 
-        # Fade the overlay and composite
+        # Fade the overlay, shift it to its start time and composite; once
+        # the overlay ends, eof_action=pass hands main frames straight through
         filter_parts.append(
             f"[{input_idx}:v]setpts=PTS-STARTPTS,"
             f"fade=t=in:st=0:d={fade_dur}:alpha=1,"
-            f"fade=t=out:st={duration - fade_dur}:d={fade_dur}:alpha=1[ovr{i}];"
+            f"fade=t=out:st={duration - fade_dur}:d={fade_dur}:alpha=1,"
+            f"setpts=PTS+{start_time}/TB[ovr{i}];"
             f"[{current_label}][ovr{i}]overlay={x}:{y}:"
-            f"enable='between(t,{start_time},{end_time})':format=auto[{next_label}]"
+            f"enable='between(t,{start_time},{end_time})':eof_action=pass:format=auto[{next_label}]"
         )
         current_label = next_label
 
@@ -542,7 +602,6 @@ def composite_multiple_placements(
         "-c:v", "libx264",
         "-crf", "18",
         "-c:a", "copy",
-        "-shortest",
         output_path
     ]
 
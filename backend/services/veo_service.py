@@ -6,22 +6,18 @@ import time
 import tempfile
 from typing import Literal
 
-from google import genai
 from google.genai import types
 
-from config import get_settings
-
 
 def get_veo_client():
-    """Get Google GenAI client for Veo using Vertex AI."""
-    settings = get_settings()
-    # Use Vertex AI with OAuth2 credentials (not API key)
-    # Requires GOOGLE_APPLICATION_CREDENTIALS env var to be set
-    return genai.Client(
-        vertexai=True,
-        project=settings.gcp_project_id,
-        location=settings.gcp_region or "us-central1",
-    )
+    """Get Google GenAI client for Veo using Vertex AI.
+
+    Veo and Gemini use the same Vertex AI project and region, so this returns
+    the shared cached client from gemini_service.
+    """
+    from services.gemini_service import get_gemini_client
+
+    return get_gemini_client()
 
 
 # ============================================================================
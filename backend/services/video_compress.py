@@ -3,6 +3,7 @@
 import os
 import subprocess
 import tempfile
+from functools import lru_cache
 
 
 # TwelveLabs limit is 2GB, we target 1.5GB to be safe
@@ -11,7 +12,14 @@ TARGET_SIZE_BYTES = 1.5 * 1024 * 1024 * 1024  # 1.5GB target after compression
 
 
 def get_video_duration(video_path: str) -> float:
-    """Get video duration in seconds using ffprobe."""
+    """Get video duration in seconds using ffprobe (cached per file version)."""
+    st = os.stat(video_path)
+    return _probe_duration(video_path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=64)
+def _probe_duration(video_path: str, mtime_ns: int, size: int) -> float:
+    """Run ffprobe for a file's duration; cached by path, mtime and size."""
     cmd = [
         "ffprobe",
         "-v", "error",
@@ -142,6 +142,21 @@ class TestCreateDuckingFilter:
 
         assert "volume=0" in result
 
+    def test_ducking_filter_merges_overlapping_segments(self):
+        """Test overlapping segments collapse into one volume node."""
+        from services.music_sync import create_ducking_filter
+
+        speech_segments = [
+            {"start_sec": 30, "end_sec": 40},
+            {"start_sec": 10, "end_sec": 20},
+            {"start_sec": 15, "end_sec": 25},
+        ]
+
+        result = create_ducking_filter({}, speech_segments, [])
+
+        assert result.count("volume=") == 1
+        assert "between(t,10,25)+between(t,30,40)" in result
+
 
 class TestGetAudioMixStrategy:
     """Test audio mix strategy determination."""
@@ -256,6 +271,27 @@ class TestFindIntroEnd:
         result = find_intro_end(rms, 22050)
         assert result == 0  # No intro
 
+    def test_find_intro_end_matches_windowed_mean(self):
+        """Test running-sum scan matches a direct windowed-mean scan."""
+        from services.music_sync import find_intro_end
+
+        rms = np.concatenate([
+            np.ones(100) * 0.01,
+            np.linspace(0.05, 0.9, 200),
+            np.ones(300) * 0.9,
+        ]).astype(np.float32)
+        sr = 22050
+
+        threshold = np.percentile(rms, 30)
+        window = int(sr / 512 * 2)
+        expected = next(
+            i * 512 / sr
+            for i in range(len(rms) - window)
+            if np.mean(rms[i:i + window]) > threshold
+        )
+
+        assert find_intro_end(rms, sr) == pytest.approx(expected)
+
 
 class TestFindOutroStart:
     """Test outro detection."""
@@ -273,3 +309,24 @@ class TestFindOutroStart:
         result = find_outro_start(rms, 22050, 22050 * 30)
         # Should detect outro starting around frame 100
         assert result > 0
+
+    def test_find_outro_start_matches_windowed_mean(self):
+        """Test running-sum scan matches a direct windowed-mean scan."""
+        from services.music_sync import find_outro_start
+
+        rms = np.concatenate([
+            np.ones(300) * 0.9,
+            np.linspace(0.9, 0.05, 200),
+            np.ones(200) * 0.05,
+        ]).astype(np.float32)
+        sr = 22050
+
+        threshold = np.percentile(rms, 30)
+        window = int(sr / 512 * 2)
+        expected = next(
+            i * 512 / sr
+            for i in range(len(rms) - 1, window, -1)
+            if np.mean(rms[i - window:i]) > threshold
+        )
+
+        assert find_outro_start(rms, sr, sr * 30) == pytest.approx(expected)
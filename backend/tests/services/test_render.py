@@ -0,0 +1,114 @@
+"""
+Tests for pure helpers of the render service.
+"""
+import pytest
+
+
+def _loop_xfade_offsets(durations, crossfade):
+    """Loop-based offset arithmetic the cumulative-sum version replaced."""
+    offsets = []
+    total = durations[0]
+    for duration in durations[1:]:
+        offsets.append(max(0, total - crossfade))
+        total = total + duration - crossfade
+    return offsets, total
+
+
+class TestXfadeOffsets:
+    """Test chained xfade offset computation."""
+
+    @pytest.mark.parametrize("durations,crossfade", [
+        ([5.0], 0.5),
+        ([5.0, 4.0], 0.5),
+        ([3.2, 7.5, 1.25, 4.0, 6.1], 0.5),
+        ([2.0, 2.0, 2.0], 1.0),
+        ([10.0, 0.3, 8.0], 0.0),
+    ])
+    def test_matches_loop_arithmetic(self, durations, crossfade):
+        """Offsets and total match the sequential loop it replaced."""
+        from services.render import _xfade_offsets
+
+        offsets, total = _xfade_offsets(durations, crossfade)
+        expected_offsets, expected_total = _loop_xfade_offsets(durations, crossfade)
+
+        assert offsets == pytest.approx(expected_offsets)
+        assert total == pytest.approx(expected_total)
+
+    def test_offsets_clamped_at_zero(self):
+        """A first segment shorter than the crossfade starts it at 0."""
+        from services.render import _xfade_offsets
+
+        offsets, total = _xfade_offsets([0.3, 5.0], 0.5)
+
+        assert offsets == [0.0]
+        assert total == pytest.approx(4.8)
+
+    def test_single_segment_has_no_joins(self):
+        """One segment has no offsets and keeps its own duration."""
+        from services.render import _xfade_offsets
+
+        assert _xfade_offsets([6.0], 0.5) == ([], 6.0)
+
+
+class TestMergeOverlayWindows:
+    """Test merging of sponsor overlay windows."""
+
+    def test_disjoint_windows_kept(self):
+        """Non-overlapping windows stay separate, sorted by start."""
+        from services.render import _merge_overlay_windows
+
+        assert _merge_overlay_windows([20.0, 0.0], 4) == [(0.0, 4.0), (20.0, 24.0)]
+
+    def test_overlapping_windows_merged(self):
+        """Overlapping windows collapse into one interval."""
+        from services.render import _merge_overlay_windows
+
+        assert _merge_overlay_windows([0.0, 2.0, 3.5], 4) == [(0.0, 7.5)]
+
+    def test_adjacent_windows_merged(self):
+        """A window starting exactly where another ends joins it."""
+        from services.render import _merge_overlay_windows
+
+        assert _merge_overlay_windows([0.0, 4.0], 4) == [(0.0, 8.0)]
+
+    def test_contained_window_absorbed(self):
+        """Duplicate starts don't shrink or split the interval."""
+        from services.render import _merge_overlay_windows
+
+        assert _merge_overlay_windows([10.0, 10.0, 1.0], 4) == [(1.0, 5.0), (10.0, 14.0)]
+
+    def test_covers_same_instants_as_per_window_between(self):
+        """Merged intervals enable exactly the instants the unmerged windows did."""
+        from services.render import _merge_overlay_windows
+
+        timestamps = [0.0, 3.0, 9.5, 13.5, 30.0, 31.0]
+        merged = _merge_overlay_windows(timestamps, 4)
+
+        for tenth in range(0, 400):
+            t = tenth / 10
+            unmerged = any(start <= t <= start + 4 for start in timestamps)
+            assert any(start <= t <= end for start, end in merged) == unmerged
+
+    def test_empty(self):
+        """No timestamps, no intervals."""
+        from services.render import _merge_overlay_windows
+
+        assert _merge_overlay_windows([], 4) == []
+
+
+class TestConcatListEntry:
+    """Test concat demuxer list lines."""
+
+    def test_plain_path(self):
+        """Paths without quotes are wrapped as-is."""
+        from services.render import _concat_list_entry
+
+        assert _concat_list_entry("/tmp/render/seg_0001.mp4") == "file '/tmp/render/seg_0001.mp4'\n"
+
+    def test_single_quotes_escaped(self):
+        """Each single quote closes the string, adds an escaped quote, and reopens."""
+        from services.render import _concat_list_entry
+
+        assert _concat_list_entry("/videos/it's a 'clip'.mp4") == (
+            "file '/videos/it'\\''s a '\\''clip'\\''.mp4'\n"
+        )
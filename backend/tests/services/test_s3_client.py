@@ -0,0 +1,35 @@
+"""
+Tests for S3 client helpers.
+"""
+import pytest
+
+
+class TestParseS3Uri:
+    """Test S3 URI parsing."""
+
+    @pytest.mark.parametrize("uri,expected", [
+        ("s3://bucket/key.mp4", ("bucket", "key.mp4")),
+        ("s3://test-bucket/events/abc/videos/def.mp4", ("test-bucket", "events/abc/videos/def.mp4")),
+        ("s3://bucket/dir/", ("bucket", "dir/")),
+    ])
+    def test_valid(self, uri, expected):
+        """Bucket is the first path component; the key is everything after it."""
+        from services.s3_client import parse_s3_uri
+
+        assert parse_s3_uri(uri) == expected
+
+    @pytest.mark.parametrize("uri", [
+        "bucket/key.mp4",            # Missing scheme
+        "https://bucket/key.mp4",    # Wrong scheme
+        "s3:/bucket/key.mp4",        # Malformed separator
+        "s3:///key.mp4",             # Empty bucket
+        "s3://bucket",               # No key
+        "s3://bucket/",              # Empty key
+        "",
+    ])
+    def test_invalid(self, uri):
+        """Anything that doesn't name an object raises ValueError."""
+        from services.s3_client import parse_s3_uri
+
+        with pytest.raises(ValueError, match="Invalid S3 URI"):
+            parse_s3_uri(uri)
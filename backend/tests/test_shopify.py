@@ -461,3 +461,305 @@ class TestVerifyHmac:
 
         params = {"code": "abc", "shop": "test.myshopify.com"}
         assert verify_shopify_hmac(params, "secret") is False
+
+
+# ============================================================================
+# Shopify Sync Service Tests
+# ============================================================================
+
+
+def _raw_product(product_id: int, updated_at: str = "2024-01-15T10:00:00+00:00") -> dict:
+    """Raw Shopify product in the REST shape the sync consumes."""
+    return {
+        "id": product_id,
+        "title": f"Product {product_id}",
+        "body_html": "A great product",
+        "status": "active",
+        "updated_at": updated_at,
+        "variants": [{"id": product_id * 10, "price": "29.99"}],
+        "images": [{"src": f"https://cdn.shopify.com/{product_id}.jpg"}],
+    }
+
+
+def _configure_sync_supabase(supabase: MagicMock, store: dict, cached_rows: list[dict]) -> dict:
+    """Route table() calls of a mock Supabase client by table name."""
+    stores = MagicMock()
+    stores.select.return_value.eq.return_value.single.return_value.execute.return_value = MagicMock(
+        data={**store, "access_token": "encrypted-token"}
+    )
+    products = MagicMock()
+    products.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = MagicMock(
+        data=cached_rows
+    )
+    tables = {"shopify_stores": stores, "shopify_products": products}
+    supabase.table.side_effect = tables.__getitem__
+    return tables
+
+
+def _run_sync(supabase: MagicMock, store: dict, products: list[dict]) -> dict:
+    """Run sync_store_products against a mock client and a fixed REST catalog."""
+    from services.shopify_sync import sync_store_products
+
+    with patch("services.shopify_sync.get_supabase", return_value=supabase), \
+         patch("services.shopify_sync.decrypt", return_value="shpat_test_token"), \
+         patch("services.shopify_sync.count_shopify_products", return_value=len(products)), \
+         patch("services.shopify_sync.fetch_shopify_products", return_value=products):
+        return sync_store_products(store["id"])
+
+
+def _rpc_batches(supabase: MagicMock) -> list[list[dict]]:
+    """Product batches passed to the sync_shopify_products RPC."""
+    return [c.args[1]["products"] for c in supabase.rpc.call_args_list]
+
+
+class TestSyncChangeDetection:
+    """Test skipping products unchanged since the cached copy."""
+
+    def test_unchanged_product_skipped(self, mock_supabase, sample_store):
+        """A product whose updated_at matches the stored copy is not rewritten."""
+        _configure_sync_supabase(mock_supabase, sample_store, [{
+            "shopify_product_id": "1",
+            "status": "active",
+            "updated_at": "2024-01-15T10:00:00+00:00",
+        }])
+
+        result = _run_sync(mock_supabase, sample_store, [_raw_product(1)])
+
+        assert result["products_unchanged"] == 1
+        assert result["products_synced"] == 0
+        mock_supabase.rpc.assert_not_called()
+
+    def test_edit_between_fetch_and_upsert_is_resynced(self, mock_supabase, sample_store):
+        """An edit made after the last fetch but before its upsert is picked up.
+
+        synced_at (upsert time) is later than the edit, so comparing against
+        it would skip the product forever; the stored updated_at is older.
+        """
+        _configure_sync_supabase(mock_supabase, sample_store, [{
+            "shopify_product_id": "1",
+            "status": "active",
+            "updated_at": "2024-01-15T10:00:00+00:00",  # Fetched copy
+            "synced_at": "2024-01-15T10:10:00+00:00",   # Upserted later
+        }])
+        edited = _raw_product(1, updated_at="2024-01-15T10:05:00+00:00")
+
+        result = _run_sync(mock_supabase, sample_store, [edited])
+
+        assert result["products_unchanged"] == 0
+        assert result["products_synced"] == 1
+        assert _rpc_batches(mock_supabase) == [[edited]]
+
+
+class TestSyncRpc:
+    """Test that products are upserted through the sync_shopify_products RPC."""
+
+    def test_sync_sends_raw_products_to_rpc(self, mock_supabase, sample_store):
+        """Raw Shopify products go to the SQL function untransformed."""
+        tables = _configure_sync_supabase(mock_supabase, sample_store, [])
+        products = [_raw_product(1), _raw_product(2)]
+
+        result = _run_sync(mock_supabase, sample_store, products)
+
+        mock_supabase.rpc.assert_called_once_with(
+            "sync_shopify_products",
+            {"store": sample_store["id"], "shop": sample_store["shop_domain"], "products": products},
+        )
+        tables["shopify_products"].upsert.assert_not_called()
+        assert result["products_synced"] == 2
+
+
+class TestShopifyBulkFetch:
+    """Test the GraphQL bulk operation catalog export."""
+
+    SHOP = "test-brand.myshopify.com"
+    GRAPHQL_URL = f"https://{SHOP}/admin/api/2024-01/graphql.json"
+    RESULT_URL = "https://storage.shopifycloud.com/bulk/result.jsonl"
+
+    def test_count_products(self):
+        """The REST count endpoint's count is returned."""
+        import respx
+        from services.shopify_sync import count_shopify_products
+
+        with respx.mock:
+            respx.get(f"https://{self.SHOP}/admin/api/2024-01/products/count.json").mock(
+                return_value=httpx.Response(200, json={"count": 4321})
+            )
+            assert count_shopify_products(self.SHOP, "shpat_test_token") == 4321
+
+    def test_bulk_reassembles_jsonl_into_rest_shape(self):
+        """Variant lines join their product via __parentId; fields match REST."""
+        import json
+        import respx
+        from services.shopify_sync import fetch_shopify_products_bulk
+
+        lines = [
+            {
+                "id": "gid://shopify/Product/1",
+                "legacyResourceId": "1",
+                "title": "Hoodie",
+                "descriptionHtml": "<p>Warm</p>",
+                "status": "ACTIVE",
+                "updatedAt": "2024-01-15T10:00:00Z",
+                "featuredImage": {"url": "https://cdn.shopify.com/hoodie.jpg"},
+            },
+            {"id": "gid://shopify/ProductVariant/11", "legacyResourceId": "11", "price": "49.00",
+             "__parentId": "gid://shopify/Product/1"},
+            {
+                "id": "gid://shopify/Product/2",
+                "legacyResourceId": "2",
+                "title": "Cap",
+                "descriptionHtml": None,
+                "status": "ACTIVE",
+                "updatedAt": "2024-01-16T10:00:00Z",
+                "featuredImage": None,
+            },
+            {"id": "gid://shopify/ProductVariant/12", "legacyResourceId": "12", "price": "59.00",
+             "__parentId": "gid://shopify/Product/1"},
+            {"id": "gid://shopify/ProductVariant/99", "legacyResourceId": "99", "price": "1.00",
+             "__parentId": "gid://shopify/Product/404"},
+        ]
+        jsonl = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+        with respx.mock:
+            respx.post(self.GRAPHQL_URL).mock(side_effect=[
+                httpx.Response(200, json={"data": {"bulkOperationRunQuery": {
+                    "bulkOperation": {"id": "gid://shopify/BulkOperation/7", "status": "CREATED"},
+                    "userErrors": [],
+                }}}),
+                httpx.Response(200, json={"data": {"node": {
+                    "status": "COMPLETED", "errorCode": None, "url": self.RESULT_URL,
+                }}}),
+            ])
+            respx.get(self.RESULT_URL).mock(return_value=httpx.Response(200, text=jsonl))
+
+            products = fetch_shopify_products_bulk(self.SHOP, "shpat_test_token")
+
+        assert products == [
+            {
+                "id": 1,
+                "title": "Hoodie",
+                "body_html": "<p>Warm</p>",
+                "status": "active",
+                "updated_at": "2024-01-15T10:00:00Z",
+                "variants": [{"id": 11, "price": "49.00"}, {"id": 12, "price": "59.00"}],
+                "images": [{"src": "https://cdn.shopify.com/hoodie.jpg"}],
+            },
+            {
+                "id": 2,
+                "title": "Cap",
+                "body_html": "",
+                "status": "active",
+                "updated_at": "2024-01-16T10:00:00Z",
+                "variants": [],
+                "images": [],
+            },
+        ]
+
+    def test_bulk_rejected_raises(self):
+        """userErrors from bulkOperationRunQuery surface as an exception."""
+        import respx
+        from services.shopify_sync import fetch_shopify_products_bulk
+
+        with respx.mock:
+            respx.post(self.GRAPHQL_URL).mock(return_value=httpx.Response(200, json={"data": {
+                "bulkOperationRunQuery": {
+                    "bulkOperation": None,
+                    "userErrors": [{"field": None, "message": "A bulk operation is already running"}],
+                }
+            }}))
+            with pytest.raises(Exception, match="rejected"):
+                fetch_shopify_products_bulk(self.SHOP, "shpat_test_token")
+
+    @pytest.mark.parametrize("failing", ["count", "bulk"])
+    def test_sync_falls_back_to_rest(self, mock_supabase, sample_store, failing):
+        """A failed count or bulk export falls back to REST pagination."""
+        from services.shopify_sync import sync_store_products
+
+        _configure_sync_supabase(mock_supabase, sample_store, [])
+        products = [_raw_product(1)]
+        count = MagicMock(side_effect=Exception("boom") if failing == "count" else None, return_value=10_000)
+        bulk = MagicMock(side_effect=Exception("boom"))
+
+        with patch("services.shopify_sync.get_supabase", return_value=mock_supabase), \
+             patch("services.shopify_sync.decrypt", return_value="shpat_test_token"), \
+             patch("services.shopify_sync.count_shopify_products", count), \
+             patch("services.shopify_sync.fetch_shopify_products_bulk", bulk), \
+             patch("services.shopify_sync.fetch_shopify_products", return_value=products) as rest:
+            result = sync_store_products(sample_store["id"])
+
+        rest.assert_called_once()
+        assert bulk.called == (failing == "bulk")
+        assert result["products_synced"] == 1
+
+    def test_sync_uses_bulk_above_threshold(self, mock_supabase, sample_store):
+        """Catalogs above the threshold skip REST pagination entirely."""
+        from services.shopify_sync import sync_store_products
+
+        _configure_sync_supabase(mock_supabase, sample_store, [])
+
+        with patch("services.shopify_sync.get_supabase", return_value=mock_supabase), \
+             patch("services.shopify_sync.decrypt", return_value="shpat_test_token"), \
+             patch("services.shopify_sync.count_shopify_products", return_value=10_000), \
+             patch("services.shopify_sync.fetch_shopify_products_bulk", return_value=[_raw_product(1)]), \
+             patch("services.shopify_sync.fetch_shopify_products") as rest:
+            result = sync_store_products(sample_store["id"])
+
+        rest.assert_not_called()
+        assert result["products_synced"] == 1
+
+
+class TestSyncBatching:
+    """Test batched, concurrent product upserts during a sync."""
+
+    def test_products_upserted_in_batches(self, mock_supabase, sample_store):
+        """Changed products are split into SYNC_UPSERT_BATCH_SIZE batches, in order."""
+        _configure_sync_supabase(mock_supabase, sample_store, [])
+        products = [_raw_product(i) for i in range(1, 6)]
+
+        with patch("services.shopify_sync.SYNC_UPSERT_BATCH_SIZE", 2):
+            result = _run_sync(mock_supabase, sample_store, products)
+
+        batches = _rpc_batches(mock_supabase)
+        assert sorted(len(b) for b in batches) == [1, 2, 2]
+        assert sorted(p["id"] for b in batches for p in b) == [1, 2, 3, 4, 5]
+        assert result["products_synced"] == 5
+        assert result["products_failed"] == 0
+
+    def test_failed_batch_counted_not_raised(self, mock_supabase, sample_store):
+        """A failing batch is reported in products_failed; the rest still sync."""
+        _configure_sync_supabase(mock_supabase, sample_store, [])
+        products = [_raw_product(i) for i in range(1, 5)]
+
+        def rpc(name, params):
+            call = MagicMock()
+            if any(p["id"] == 3 for p in params["products"]):
+                call.execute.side_effect = Exception("statement timeout")
+            return call
+
+        mock_supabase.rpc.side_effect = rpc
+
+        with patch("services.shopify_sync.SYNC_UPSERT_BATCH_SIZE", 2):
+            result = _run_sync(mock_supabase, sample_store, products)
+
+        assert result["products_synced"] == 2
+        assert result["products_failed"] == 2
+
+    def test_stale_products_marked_inactive_in_batches(self, mock_supabase, sample_store):
+        """Only cached active products missing from Shopify are deactivated, in batches."""
+        cached = [
+            {"shopify_product_id": str(i), "status": "active", "updated_at": "2024-01-15T10:00:00+00:00"}
+            for i in range(1, 6)
+        ]
+        cached.append({"shopify_product_id": "6", "status": "inactive", "updated_at": None})
+        tables = _configure_sync_supabase(mock_supabase, sample_store, cached)
+
+        with patch("services.shopify_sync.SYNC_UPSERT_BATCH_SIZE", 2):
+            _run_sync(mock_supabase, sample_store, [_raw_product(1)])
+
+        products = tables["shopify_products"]
+        products.update.assert_called_with({"status": "inactive"})
+        in_calls = products.update.return_value.eq.return_value.in_.call_args_list
+        assert [c.args for c in in_calls] == [
+            ("shopify_product_id", ["2", "3"]),
+            ("shopify_product_id", ["4", "5"]),
+        ]
@@ -206,3 +206,58 @@ class TestMusicAnalyze:
         """Test analyzing music for non-existent event."""
         response = client.post("/api/events/nonexistent-id/music/analyze")
         assert response.status_code == 400  # Returns 400 because no music_url
+
+
+class TestMultipartUploadInit:
+    """Test multipart upload initialization."""
+
+    def test_init_multipart_returns_chunk_urls_in_part_order(self, client: TestClient, mock_supabase, sample_event):
+        """Large files get one presigned URL per part, part 1 first."""
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[{"id": sample_event["id"]}]
+        )
+        s3 = MagicMock()
+        s3.create_multipart_upload.return_value = {"UploadId": "upload-123"}
+        s3.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: (
+            f"https://test-bucket.s3.amazonaws.com/{Params['Key']}"
+            f"?uploadId={Params['UploadId']}&partNumber={Params['PartNumber']}"
+        )
+        chunk_size = 10 * 1024 * 1024
+        file_size = 10 * chunk_size + 1  # Above the 100MB threshold: 11 parts
+
+        with patch("services.s3_client.get_s3_client", return_value=s3):
+            response = client.post(
+                f"/api/events/{sample_event['id']}/videos/multipart/init",
+                json={"filename": "game.mp4", "file_size": file_size, "angle_type": "wide"},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["use_multipart"] is True
+        assert data["upload_id"] == "upload-123"
+        assert data["total_chunks"] == 11
+        assert data["chunk_urls"] == [
+            f"https://test-bucket.s3.amazonaws.com/{data['s3_key']}?uploadId=upload-123&partNumber={part}"
+            for part in range(1, 12)
+        ]
+        s3.create_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket", Key=data["s3_key"], ContentType="video/mp4"
+        )
+        assert {c.args[0] for c in s3.generate_presigned_url.call_args_list} == {"upload_part"}
+
+    def test_init_simple_upload_has_no_chunk_urls(self, client: TestClient, mock_supabase, mock_s3, sample_event):
+        """Small files use a single presigned PUT and no part URLs."""
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[{"id": sample_event["id"]}]
+        )
+
+        response = client.post(
+            f"/api/events/{sample_event['id']}/videos/multipart/init",
+            json={"filename": "clip.mp4", "file_size": 5 * 1024 * 1024, "angle_type": "wide"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["use_multipart"] is False
+        assert data["upload_url"].startswith("https://")
+        assert data["chunk_urls"] is None
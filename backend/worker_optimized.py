@@ -43,6 +43,10 @@ def setup_worker_path(sender=None, **kwargs):
     print(f"[Worker]   GCP_PROJECT_ID: {gcp_project}")
     print(f"[Worker]   GCS_BUCKET: {gcs_bucket}")
 
+    # Build this process's shared S3 client up front, not in the first task
+    from services.s3_client import get_s3_client
+    get_s3_client()
+
 VibeType = Literal["high_energy", "emotional", "calm"]
 
 settings = get_settings()
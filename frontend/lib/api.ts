@@ -369,6 +369,7 @@ export interface MultipartUploadInitResponse {
   total_chunks: number
   use_multipart: boolean
   upload_url: string | null
+  chunk_urls?: string[] | null
 }
 
 export interface ChunkUrlResponse {
@@ -549,7 +550,7 @@ export async function uploadVideoV2(
   // Multipart upload for large files
   console.log(`[Video Upload V2] Using multipart upload: ${initResponse.total_chunks} chunks`)
 
-  const { video_id, upload_id, chunk_size, total_chunks } = initResponse
+  const { video_id, upload_id, chunk_size, total_chunks, chunk_urls } = initResponse
   const completedParts: CompletedPart[] = []
 
   try {
@@ -575,20 +576,21 @@ export async function uploadVideoV2(
 
       console.log(`[Chunk ${chunkNumber}/${total_chunks}] Size: ${(chunk.size / (1024 * 1024)).toFixed(1)} MB`)
 
-      // Get presigned URL for this chunk
-      const { upload_url } = await getChunkUploadUrl(eventId, video_id, upload_id, chunkNumber)
-
-      // Upload chunk with retry
-      const etag = await uploadChunkWithRetry(
-        upload_url,
-        chunk,
-        chunkNumber,
-        3,
-        (loaded, total) => {
-          chunkProgress[chunkNumber - 1] = (loaded / total) * 100
-          updateOverallProgress()
-        }
-      )
+      const onChunkProgress = (loaded: number, total: number) => {
+        chunkProgress[chunkNumber - 1] = (loaded / total) * 100
+        updateOverallProgress()
+      }
+
+      // Prefer the URL signed at init; fall back to a fresh one (e.g. expired)
+      const prefetchedUrl = chunk_urls?.[chunkNumber - 1]
+      let etag: string
+      try {
+        if (!prefetchedUrl) throw new Error('No prefetched URL')
+        etag = await uploadChunkWithRetry(prefetchedUrl, chunk, chunkNumber, 3, onChunkProgress)
+      } catch {
+        const { upload_url } = await getChunkUploadUrl(eventId, video_id, upload_id, chunkNumber)
+        etag = await uploadChunkWithRetry(upload_url, chunk, chunkNumber, 3, onChunkProgress)
+      }
 
       completedParts.push({
         PartNumber: chunkNumber,
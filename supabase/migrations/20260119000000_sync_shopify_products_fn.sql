@@ -0,0 +1,43 @@
+-- Migration: Server-side Shopify product upsert
+-- The sync sends raw Shopify products once and Postgres extracts the cached
+-- columns, instead of the backend sending each product's fields alongside
+-- the same data again in raw_data. This is the only copy of the mapping.
+
+CREATE OR REPLACE FUNCTION sync_shopify_products(store UUID, shop TEXT, products JSONB)
+RETURNS INTEGER AS $$
+    WITH upserted AS (
+        INSERT INTO shopify_products (
+            store_id, shopify_product_id, title, description, price, currency,
+            image_url, checkout_url, status, raw_data, synced_at
+        )
+        SELECT
+            store,
+            p->>'id',
+            p->>'title',
+            COALESCE(p->>'body_html', ''),
+            COALESCE((p->'variants'->0->>'price')::DECIMAL, 0),
+            'USD',  -- Shopify doesn't return currency in product endpoint
+            p->'images'->0->>'src',
+            CASE WHEN p->'variants'->0->>'id' IS NOT NULL
+                THEN 'https://' || shop || '/cart/' || (p->'variants'->0->>'id') || ':1'
+            END,
+            CASE WHEN p->>'status' = 'active' THEN 'active' ELSE 'inactive' END,
+            p,
+            NOW()
+        FROM jsonb_array_elements(products) AS p
+        ON CONFLICT (store_id, shopify_product_id) DO UPDATE SET
+            title = EXCLUDED.title,
+            description = EXCLUDED.description,
+            price = EXCLUDED.price,
+            currency = EXCLUDED.currency,
+            image_url = EXCLUDED.image_url,
+            checkout_url = EXCLUDED.checkout_url,
+            status = EXCLUDED.status,
+            raw_data = EXCLUDED.raw_data,
+            synced_at = EXCLUDED.synced_at
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM upserted;
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION sync_shopify_products(UUID, TEXT, JSONB) IS 'Upsert raw Shopify products for a store into shopify_products; returns rows written';